@@ -1,72 +1,252 @@
-from rlbot.agents.base_agent import BaseAgent, SimpleControllerState
-from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
+from rlbot.agents.base_agent import BaseAgent, SimpleControllerState, BOT_CONFIG_AGENT_HEADER
+from rlbot.parsing.custom_config import ConfigObject
 from rlbot.utils.structures.game_data_struct import GameTickPacket
 
-from util.ball_prediction_analysis import find_slice_at_time, predict_future_goal
-from util.boost_pad_tracker import BoostPadTracker
+from util.arena import Arena, load_arena
+from util.boost_pad_tracker import BoostPadTracker, available_on_arrival
+from util.intercept import find_intercept
+from util.maneuvers import ManeuverLibrary, load_maneuvers
+from util.prediction_arrays import BallPredictionArrays, PredictionCache
+from util.prediction_events import prediction_events
+from util.render_policy import RenderPolicy, RENDER_ALWAYS
+from util.scheduler import TaskScheduler
+from util.features import Features, Rule, choose_behavior, feature
+from util.game_events import GameEventStream, KickoffEnded, KickoffStarted
 from util.drive import steer_toward_target, pitch_toward_target, yaw_toward_target
-from util.sequence import Sequence, ControlStep
+from util.sequence import Sequence, ControlStep, Timeline, TimelinePlayback
+from util.tick_profiler import TickProfiler
+from util.tick_state import TickState
 from util.vec import Vec3
 from util.orientation import Orientation, relative_location
 
 import math
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    # Only needed when they're turned on in the config, so they're imported then, not every time the bot starts
+    from util.flight_recorder import FlightRecorder
+    from util.motion_tables import MotionTables
+    from util.packet_log import PacketRecorder
+    from util.planner import PlanningWorker
+
 
 
 class MyBot(BaseAgent):
 
     def __init__(self, name, team, index):
         super().__init__(name, team, index)
-        self.active_sequence: Sequence = None
+        self.active_sequence: Union[Sequence, TimelinePlayback] = None
+        self.arena: Arena = None
         self.boost_pad_tracker = BoostPadTracker()
+        self.flight_directory: str = None
+        self.flight_capacity: int = None
+        self.flight_recorder: 'FlightRecorder' = None
+        self.game_events: GameEventStream = None
+        self.has_first_touch_happened_yet = True
+        self.maneuvers: ManeuverLibrary = None
+        self.motion_tables: 'MotionTables' = None
+        self.use_arrival_times = False
+        self.planner: 'PlanningWorker' = None
+        self.plan_max_age: float = None
+        self.prediction_cache = PredictionCache()
+        self.profiler = TickProfiler()
+        self.profile_reported = False
+        self.record_directory: str = None
+        self.recorder: 'PacketRecorder' = None
+        self.render_policy = RenderPolicy()
+        # Parts of get_output that don't need to run every tick, with how often they do run when multi_rate is on
+        self.scheduler = TaskScheduler()
+        self.scheduler.add('behavior', rate=30, min_rate=15)
+        self.scheduler.add('boost route', rate=30, min_rate=10)
+        self.scheduler.add('opponent analysis', rate=30, min_rate=10)
+        self.scheduler.add('rendering', rate=60, min_rate=10)
+
+    @staticmethod
+    def create_agent_configurations(config: ConfigObject):
+        params = config.get_header(BOT_CONFIG_AGENT_HEADER)
+        params.add_value('profile_ticks', bool, default=False,
+                         description='Time each stage of get_output and log p50/p99/max when the match ends')
+        params.add_value('record_packets', str, default=None,
+                         description='Folder to save a packet log of every match in, for util/replay.py')
+        params.add_value('flight_recorder', str, default=None,
+                         description='Folder to keep the last few minutes of decisions and controls in, for '
+                                     'util/flight_recorder.py')
+        params.add_value('flight_recorder_ticks', int, default=14400,
+                         description='How many ticks the flight recorder keeps')
+        params.add_value('render_mode', str, default=RENDER_ALWAYS,
+                         description='When to draw debug info: always, off, decimate or changes')
+        params.add_value('render_interval', int, default=4,
+                         description='In decimate mode, draw once every this many ticks')
+        params.add_value('render_threshold', float, default=50.0,
+                         description='In changes mode, redraw when a location or speed moves by more than this')
+        params.add_value('background_planning', bool, default=False,
+                         description='Search for the intercept and boost pads on a background thread')
+        params.add_value('plan_max_age', float, default=0.05,
+                         description='Seconds before a background plan is too old to use')
+        params.add_value('arrival_times', bool, default=False,
+                         description='Compare boost pads with the ball by how long the car would take to get to '
+                                     'them, instead of by straight line distance')
+        params.add_value('multi_rate', bool, default=False,
+                         description='Choose behaviors, boost pads and the opponent to watch less often than every '
+                                     'tick, and less often still when ticks run long')
+
+    def load_config(self, config_header):
+        self.profiler.enabled = config_header.getboolean('profile_ticks')
+        if config_header.get('record_packets'):
+            self.record_directory = config_header.getpath('record_packets')
+        if config_header.get('flight_recorder'):
+            self.flight_directory = config_header.getpath('flight_recorder')
+            self.flight_capacity = config_header.getint('flight_recorder_ticks')
+        self.render_policy = RenderPolicy(config_header.get('render_mode'), config_header.getint('render_interval'),
+                                          config_header.getfloat('render_threshold'))
+        self.scheduler.enabled = config_header.getboolean('multi_rate')
+        self.use_arrival_times = config_header.getboolean('arrival_times')
+        if config_header.getboolean('background_planning'):
+            self.plan_max_age = config_header.getfloat('plan_max_age')
 
     def initialize_agent(self):
-        # Set up information about the boost pads now that the game is active and the info is available
-        self.boost_pad_tracker.initialize_boosts(self.get_field_info())
-        
         # blue net: negative y
         self.info = self.get_field_info()
+        # Goals, posts and boost pad locations, worked out once per layout and shared with any other bots
+        self.arena = load_arena(self.info)
         
-        self.my_goal_location = Vec3(self.info.goals[self.team].location)
+        # Flips and kickoffs, checked and compiled once
+        self.maneuvers = load_maneuvers()
         
-        if self.team == 0:
-            self.team_coef = -1
-            self.opp_goal_location = Vec3(self.info.goals[1].location)
-            self.opp_goal_left_post = Vec3(-800, 5120, 0)
-            self.opp_goal_right_post = Vec3(800, 5120, 0)
-            self.my_goal_left_post = Vec3(-800, -5120, 0)
-            self.my_goal_right_post = Vec3(800, -5120, 0)
-        else:
-            self.team_coef = 1
-            self.opp_goal_location = Vec3(self.info.goals[0].location)
-            self.opp_goal_left_post = Vec3(-800, -5120, 0)
-            self.opp_goal_right_post = Vec3(800, -5120, 0)
-            self.my_goal_left_post = Vec3(-800, 5120, 0)
-            self.my_goal_right_post = Vec3(800, 5120, 0)
+        # Turning radii and times to reach, memory mapped from the startup cache
+        if self.use_arrival_times:
+            from util.motion_tables import saved_motion_tables
+            self.motion_tables = saved_motion_tables()
+            if self.motion_tables is None:
+                # Making them takes seconds, which would miss the first kickoff. Straight line distances are used
+                # until they're ready.
+                threading.Thread(target=self.build_motion_tables, name='MotionTables', daemon=True).start()
+        
+        # Set up information about the boost pads now that the game is active and the info is available
+        self.boost_pad_tracker.initialize_boosts(self.info, self.arena.boost_pads)
+        
+        # Touches, pickups, demos, kickoffs etc. are worked out once per tick by comparing packets
+        self.game_events = GameEventStream(self.boost_pad_tracker.table)
+        self.game_events.subscribe(KickoffStarted, self.on_kickoff_started)
+        self.game_events.subscribe(KickoffEnded, self.on_kickoff_ended)
+        
+        opp_team = 1 - self.team
+        self.team_coef = -1 if self.team == 0 else 1
+        self.my_goal_location = self.arena.goal_location(self.team)
+        self.opp_goal_location = self.arena.goal_location(opp_team)
+        self.my_goal_left_post, self.my_goal_right_post = self.arena.goal_posts(self.team)
+        self.opp_goal_left_post, self.opp_goal_right_post = self.arena.goal_posts(opp_team)
+
+        if self.plan_max_age is not None:
+            from util.planner import PlanningWorker
+            self.planner = PlanningWorker(self.make_plan, self.plan_max_age)
+            self.planner.start()
+
+        if self.record_directory:
+            from util.packet_log import PacketRecorder
+            os.makedirs(self.record_directory, exist_ok=True)
+            # The pid and milliseconds keep two bots with the same name, or one restarted within the same second,
+            # from writing over each other's logs.
+            now = time.time()
+            file_name = (f'{self.name}-{self.index}-{time.strftime("%Y%m%d-%H%M%S", time.localtime(now))}'
+                         f'{int(now * 1000) % 1000:03d}-{os.getpid()}.rlblog')
+            self.recorder = PacketRecorder(os.path.join(self.record_directory, file_name),
+                                           self.index, self.team, self.name, self.info)
+
+        if self.flight_directory:
+            from util.flight_recorder import FlightRecorder
+            os.makedirs(self.flight_directory, exist_ok=True)
+            # The same file every time, so the folder doesn't fill up. The last run is kept as .previous.
+            self.flight_recorder = FlightRecorder(os.path.join(self.flight_directory,
+                                                               f'{self.name}-{self.index}.rlbflight'),
+                                                  self.flight_capacity)
 
     def get_output(self, packet: GameTickPacket) -> SimpleControllerState:
         """
         This function will be called by the framework many times per second. This is where you can
         see the motion of the ball, etc. and return controls to drive your car.
         """
-        
+        self.profiler.begin_tick()
+        self.scheduler.begin_tick()
+        controls = self.choose_controls(packet)
+        if self.flight_recorder is not None and controls is not None:
+            self.flight_recorder.controls(controls)
+        self.scheduler.end_tick()
+        self.profiler.end_tick()
+
+        if packet.game_info.is_match_ended and not self.profile_reported:
+            self.report_profile()
+        return controls
+
+    def retire(self):
+        if not self.profile_reported:
+            self.report_profile()
+        if self.planner is not None:
+            self.planner.stop()
+            self.planner = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.flight_recorder is not None:
+            self.flight_recorder.close()
+            self.flight_recorder = None
+
+    def report_profile(self):
+        # Can also be called at any time, e.g. from a debugger, to see where the tick budget is going so far.
+        if self.profiler.enabled:
+            report = self.profiler.report()
+            if self.scheduler.enabled:
+                report += '\n' + self.scheduler.report()
+            if self.planner is not None:
+                report += '\nBackground planning: ' + self.planner.report()
+            self.logger.info('Tick profile:\n' + report)
+            self.profile_reported = True
+
+    def make_plan(self, packet: GameTickPacket, ball_prediction, boost_status):
+        # Runs on the planning thread. It only looks at its own copies of the packet, prediction and boost pad
+        # status, and at things that don't change during a match.
+        state = TickState(packet, self.index)
+        now = packet.game_info.seconds_elapsed
+        intercept = find_intercept(BallPredictionArrays(ball_prediction), state.car_location, state.car_orientation,
+                                   state.car_velocity, state.my_car.boost, now)
+        table = self.boost_pad_tracker.table
+        available = available_on_arrival(table, *boost_status, state.car_location, state.car_speed, now)
+        return intercept, nearest_boost_pads(table, state, available)
+
+    def build_motion_tables(self):
+        # Runs on its own thread, see initialize_agent
+        from util.motion_tables import load_motion_tables
+        self.motion_tables = load_motion_tables()
+
+    def on_kickoff_started(self, event: KickoffStarted):
+        self.has_first_touch_happened_yet = False
+
+    def on_kickoff_ended(self, event: KickoffEnded):
+        self.has_first_touch_happened_yet = True
+
+    def choose_controls(self, packet: GameTickPacket) -> SimpleControllerState:
         # Keep our boost pad info updated with which pads are currently active
+        self.profiler.stage('boost tracker')
         self.boost_pad_tracker.update_boost_status(packet)
 
         # return
             
         ### DECLARATIONS
-        # Gather some information about our car and the ball
-        my_car = packet.game_cars[self.index]
-        car_location = Vec3(my_car.physics.location)
-        car_velocity = Vec3(my_car.physics.velocity)
-        ball_location = Vec3(packet.game_ball.physics.location)
-        ball_rotation = packet.game_ball.physics.rotation
-        ball_orientation = Orientation(ball_rotation)
-        ball_velocity = Vec3(packet.game_ball.physics.velocity)
-        
-        car_rotation = my_car.physics.rotation
-        car_orientation = Orientation(car_rotation)
-        car_to_ball = relative_location(car_location, car_orientation, ball_location)
+        self.profiler.stage('declarations')
+        # Gather some information about our car and the ball. Anything derived from the packet goes through
+        # state so that each distance and angle is only worked out once per tick.
+        state = TickState(packet, self.index)
+        state.set_point('my_goal', self.my_goal_location)
+        state.set_point('opp_goal', self.opp_goal_location)
+        my_car = state.my_car
+        car_location = state.car_location
+        ball_location = state.ball_location
+        
+        car_rotation = state.car_rotation
+        car_to_ball = state.relative('ball')
         
         car_roll = car_rotation.roll
         car_pitch = car_rotation.pitch
@@ -101,56 +281,33 @@ class MyBot(BaseAgent):
         # blue is 0, orange is 1
         color = self.team
         
-        opp_car = None
-        opp_car_location = Vec3(0, 0, 999999)
-        for i in range(packet.num_cars):
-            if i == self.index:
-                continue
-            current_opp = packet.game_cars[i]
-            if current_opp.team == color:
-                continue
-            if Vec3(current_opp.physics.location).dist(ball_location) < opp_car_location.dist(ball_location):
-                opp_car = current_opp
-                opp_car_location = Vec3(opp_car.physics.location)
-        
-
-        if car_location.x > 0:
-            defense_location = Vec3(700, self.team_coef * 5000, 0)
-        else:
-            defense_location = Vec3(-700, self.team_coef * 5000, 0)
-        
-        nearest_big_boost = Vec3(get_nearest_big_boost(info, packet, car_location, car_orientation))
-            
-        nearest_small_boost = Vec3(get_nearest_small_boost(info, packet, car_location, car_orientation))
-
-
         ### BALL PREDICTION
+        self.profiler.stage('prediction fetch')
         ball_prediction = self.get_ball_prediction_struct()  # This can predict bounces, etc
-        if car_velocity.length() == 0:
-            ball_in_future = find_slice_at_time(ball_prediction,
-                                                packet.game_info.seconds_elapsed + car_location.dist(ball_location))
+        if self.recorder is not None:
+            self.recorder.record_tick(packet, ball_prediction)
+        self.profiler.stage('prediction analysis')
+        # numpy view of the prediction, reused (along with anything found in it) until the prediction changes
+        prediction = self.prediction_cache.get(ball_prediction)
+        plan = None
+        if self.planner is not None:
+            self.planner.submit(packet, ball_prediction, self.boost_pad_tracker.status_snapshot())
+            plan = self.planner.latest(packet.game_info.seconds_elapsed)
+        if plan is not None:
+            intercept, planned_boost_pads = plan.value
         else:
-            ball_in_future = find_slice_at_time(ball_prediction,
-                                                packet.game_info.seconds_elapsed + 2)
-        
-        if car_location.dist(ball_location) > 5000:
-            distance = 5000
-        else:
-            distance = car_location.dist(ball_location)
-        if ball_in_future:
-            ball_path = (distance/5000) * Vec3(ball_in_future.physics.location) + (1-distance/5000) * ball_location
+            # No background plan, or it's too old, so work it out here.
+            # Go for the earliest slice we can reach in time, going by our speed, boost and how far we'd have to turn.
+            # If we can't make any of them, the closest we come is still the best bet.
+            intercept = find_intercept(prediction, car_location, state.car_orientation, state.car_velocity,
+                                       my_car.boost, packet.game_info.seconds_elapsed)
+            planned_boost_pads = None
+        if intercept is not None:
+            ball_path = intercept.location
         else:
             ball_path = ball_location
+        state.set_point('ball_path', ball_path)
             
-        potential_goal = False
-        potential_goal_slice = predict_future_goal(ball_prediction)
-        if color == 0:
-            if potential_goal_slice and ball_path.y < 0:
-                potential_goal = True
-        else:
-            if potential_goal_slice and ball_path.y > 0:
-                potential_goal = True
-
         ball_path_grounded = Vec3(ball_path.x, ball_path.y, 0)
         
         # ball_path_to_goal = Vec3(1.5*(ball_path.x - self.opp_goal_location.x), ball_path.y + self.team_coef*abs(1.5*(ball_path.x - self.opp_goal_location.x)), 0)
@@ -158,8 +315,6 @@ class MyBot(BaseAgent):
         # if car_location.dist(ball_path_to_goal) < 100 or car_location.dist(ball_path) < car_location.dist(ball_path_to_goal):
         #     ball_path_to_goal = ball_path_grounded
         
-        car_angle_to_left, car_angle_to_right, get_positioning_on_ball, shooting_angle = triangle(self.opp_goal_location, self.opp_goal_left_post, self.opp_goal_right_post, ball_path, ball_velocity, car_location)
-        car_angle_to_left_own, car_angle_to_right_own, dont_own_goal, own_goal_angle = triangle(self.my_goal_location, self.my_goal_left_post, self.my_goal_right_post, ball_path, ball_velocity, car_location)
         # triangle_length = self.opp_goal_location.y - ball_path.y
         # triangle_width = self.opp_goal_location.x - ball_path.x
         # triangle_hyp = (triangle_length**2 + triangle_width**2)**(1/2)
@@ -188,38 +343,20 @@ class MyBot(BaseAgent):
         
         
         
-        ### SET BEHAVIOR
-        behavior = "Ballchase"
-        
-        if car_location.dist(nearest_big_boost) < car_location.dist(ball_location) and my_car.boost < 50 and car_location.dist(self.my_goal_location) < ball_location.dist(self.my_goal_location) and ball_location.dist(self.my_goal_location) > nearest_big_boost.dist(self.my_goal_location):
-            behavior = "Get big boost"
-            
-        if car_location.dist(nearest_small_boost) < 500 and my_car.boost < 75:
-            behavior = "Get small boost"
-        
-        if opp_car_location.dist(ball_path) < car_location.dist(ball_path) and ball_path.dist(self.my_goal_location) < 2000:
-            behavior = "Defense"
-        
-        if abs(defense_location[1] - ball_path[1]) < abs(defense_location[1] - car_location[1]):
-            behavior = "Reposition"
-        
-        if abs(car_location[1]) > 5120:
-            behavior = "Leave net"
-        
-        if potential_goal == True:
-            behavior = "Save"
+        ### GAME EVENTS
+        # Kickoffs starting and ending (and anything else we've subscribed to) are handled in here
+        self.profiler.stage('game events')
+        self.game_events.update(packet, state.cars, self.boost_pad_tracker.taken)
         
-        self.has_first_touch_happened_yet = True
-        if packet.game_info.is_kickoff_pause:
-            self.has_first_touch_happened_yet = False
-        if not self.has_first_touch_happened_yet:
-            behavior = "Kickoff"
-            # during kickoff, go for the ball
-            target_location = ball_location
-        
-        # Don't chase the ball into offensive corners
-        if behavior == "Ballchase" and abs(ball_location.x) > 900 and abs(ball_path.y) > 4900 and ball_path.dist(self.opp_goal_location) < ball_path.dist(self.my_goal_location):
-            behavior = "Reposition"
+        ### SET BEHAVIOR
+        self.profiler.stage('behavior')
+        # Rules are checked from the most important down, and each feature is only worked out the first time a rule
+        # asks for it. Once a rule matches, nothing it doesn't need gets computed.
+        features = BehaviorFeatures(self, state, prediction, planned_boost_pads)
+        # Picked again at least whenever a kickoff starts or ends, so we never sit out the start of one
+        behavior = self.scheduler.run('behavior', packet.game_info.seconds_elapsed,
+                                      lambda: choose_behavior(BEHAVIOR_RULES, features, default="Ballchase"),
+                                      key=self.has_first_touch_happened_yet)
             
         # if my_car.boost > 10:
         #     behavior = "Kill opp"
@@ -234,19 +371,17 @@ class MyBot(BaseAgent):
         # TODO: Expand save so bot won't own goal (using relative location and angle of car to own net)
         if behavior == "Kickoff":
             target_location = ball_path
-            self.renderer.draw_line_3d(ball_location, target_location, self.renderer.cyan())
         elif behavior == "Leave net":
             target_location = self.leave_net(car_location, color, ball_path)
         elif behavior == "Reposition":
-            target_location = self.reposition(defense_location, car_location)
+            target_location = self.reposition(features.defense_location, car_location)
         elif behavior == "Get big boost":
-            target_location = nearest_big_boost
+            target_location = features.nearest_big_boost
         elif behavior == "Get small boost":
-            target_location = nearest_small_boost
+            target_location = features.nearest_small_boost
         elif behavior == "Ballchase":
-            if shooting_angle: target_location = ball_path_grounded
-            else: target_location = get_positioning_on_ball
-            self.renderer.draw_line_3d(ball_location, target_location, self.renderer.cyan())
+            if features.shooting_angle: target_location = ball_path_grounded
+            else: target_location = features.get_positioning_on_ball
         elif behavior == "Attack":
             target_location = self.attack(ball_location, ball_path, car_location, self.opp_goal_location)
         elif behavior == "Defense":
@@ -265,63 +400,72 @@ class MyBot(BaseAgent):
         #         target_location = Vec3(0, -5120, 1000)
 
         
-        car_to_target = relative_location(car_location, car_orientation, target_location)
-        car_to_target_angle = math.atan2(car_to_target.y, car_to_target.x)*180/math.pi
-        two_d_distance = (car_to_target.x**2 + car_to_target.y**2)**(1/2)
-        car_to_target_verticle_angle = math.atan(abs(car_to_target.z/two_d_distance))*180/math.pi + car_pitch_in_degrees
-        if car_to_target.z < 0:
-            car_to_target_verticle_angle = -car_to_target_verticle_angle
-        
-        
-        car_facing_target = False
-        if abs(car_to_target_angle) <= 10:
-            car_facing_target = True
-        
-        car_facing_aerial = False
-        if abs(car_to_target_verticle_angle - car_pitch_in_degrees) <= 10:
-            car_facing_aerial = True
+        state.set_point('target', target_location)
+        car_to_target = state.relative('target')
+        if self.flight_recorder is not None:
+            # Only the features that were needed anyway, so recording doesn't make the tick any slower
+            self.flight_recorder.decide(packet.game_info.seconds_elapsed, behavior, target_location, my_car.boost,
+                                        features.peek('potential_goal'), features.peek('shooting_angle'))
+        car_to_target_angle = state.angle('target')
         
         ### DEBUG
-        # Draw some things to help understand what the bot is thinking
-        car_debug = f'Speed: {car_velocity.length():.1f}\n'
-        # car_debug += f"Location: {car_location}\n"
-        # car_debug += f"Ball location: {ball_location}\n"
-        car_debug += f"Behavior: {behavior}\n"
-        # car_debug += f"Distance to target: {car_location.dist(target_location):.1f}\n"
-        # car_debug += f"Verticle angle: {car_to_target_verticle_angle:.1f}\n"
-        # car_debug += f"Ball speed: {ball_velocity.length():.1f}"
-        # car_debug += f"Yaw: {car_yaw:.1f}\n"
-        # car_debug += f"Pitch in degrees: {car_pitch_in_degrees:.1f}\n"
-        # car_debug += f"Car grounded: {car_grounded}\n"
-        # car_debug += f"Car facing target: {car_facing_target}\n"
-        # car_debug += f"Car facing aerial: {car_facing_aerial}\n"
-        # car_debug += f"x: {car_to_target.x:.1f}\n"
-        # car_debug += f"y: {car_to_target.y:.1f}\n"
-        # car_debug += f"z: {car_to_target.z:.1f}\n"
-        # car_debug += f"2d: {two_d_distance:.1f}\n"
-        # car_debug += f"Car angle to left post: {(car_angle_to_left)*180/math.pi:.1f}\n"
-        # car_debug += f"Ball path angle to opp goal: {(ball_path_angle_to_net)*180/math.pi:.1f}\n"
-        # car_debug += f"Car angle to right post: {(car_angle_to_right)*180/math.pi:.1f}\n"
-        car_debug += f"Shooting Angle: {shooting_angle}\n"
-        car_debug += f"Own Goal Angle: {own_goal_angle}\n"
-        # car_debug += f"Potential Goal Condeded: {potential_goal}\n"
-        
-        
-        self.renderer.draw_line_3d(car_location, self.opp_goal_left_post, self.renderer.red())
-        self.renderer.draw_line_3d(car_location, self.opp_goal_right_post, self.renderer.red())
-        # self.renderer.draw_line_3d(car_location, self.my_goal_left_post, self.renderer.orange())
-        # self.renderer.draw_line_3d(car_location, self.my_goal_right_post, self.renderer.orange())
-        self.debug(car_location, target_location, car_debug)
+        # Draw some things to help understand what the bot is thinking, on the ticks the render policy allows.
+        # If we skip a tick the debug string isn't even built.
+        self.profiler.stage('rendering')
+        render_due = self.render_policy.enabled and self.scheduler.due('rendering', packet.game_info.seconds_elapsed)
+        if render_due and self.render_policy.should_render(
+                # Only the 'changes' mode looks at the labels, so the shooting triangles aren't worked out for the others
+                lambda: (behavior, features.shooting_angle, features.own_goal_angle),
+                (car_location.x, car_location.y, car_location.z, target_location.x, target_location.y,
+                 target_location.z, state.car_speed)):
+            # Our own render group stays on screen on the ticks we skip, and gets sent as one batch.
+            self.renderer.begin_rendering('debug')
+            car_debug = f'Speed: {state.car_speed:.1f}\n'
+            # car_debug += f"Location: {car_location}\n"
+            # car_debug += f"Ball location: {ball_location}\n"
+            car_debug += f"Behavior: {behavior}\n"
+            # car_debug += f"Distance to target: {car_location.dist(target_location):.1f}\n"
+            # car_debug += f"Verticle angle: {features.car_to_target_verticle_angle:.1f}\n"
+            # car_debug += f"Ball speed: {ball_velocity.length():.1f}"
+            # car_debug += f"Yaw: {car_yaw:.1f}\n"
+            # car_debug += f"Pitch in degrees: {car_pitch_in_degrees:.1f}\n"
+            # car_debug += f"Car grounded: {car_grounded}\n"
+            # car_debug += f"Car facing target: {features.car_facing_target}\n"
+            # car_debug += f"Car facing aerial: {features.car_facing_aerial}\n"
+            # car_debug += f"x: {car_to_target.x:.1f}\n"
+            # car_debug += f"y: {car_to_target.y:.1f}\n"
+            # car_debug += f"z: {car_to_target.z:.1f}\n"
+            # car_debug += f"2d: {two_d_distance:.1f}\n"
+            # car_debug += f"Car angle to left post: {(car_angle_to_left)*180/math.pi:.1f}\n"
+            # car_debug += f"Ball path angle to opp goal: {(ball_path_angle_to_net)*180/math.pi:.1f}\n"
+            # car_debug += f"Car angle to right post: {(car_angle_to_right)*180/math.pi:.1f}\n"
+            car_debug += f"Shooting Angle: {features.shooting_angle}\n"
+            car_debug += f"Own Goal Angle: {features.own_goal_angle}\n"
+            if intercept is not None:
+                car_debug += f"Intercept: {intercept.time - packet.game_info.seconds_elapsed:.2f}s ({intercept.margin:+.2f}s)\n"
+            # car_debug += f"Potential Goal Condeded: {potential_goal}\n"
+        
+        
+            if behavior == "Kickoff" or behavior == "Ballchase":
+                self.renderer.draw_line_3d(ball_location, target_location, self.renderer.cyan())
+            self.renderer.draw_line_3d(car_location, self.opp_goal_left_post, self.renderer.red())
+            self.renderer.draw_line_3d(car_location, self.opp_goal_right_post, self.renderer.red())
+            # self.renderer.draw_line_3d(car_location, self.my_goal_left_post, self.renderer.orange())
+            # self.renderer.draw_line_3d(car_location, self.my_goal_right_post, self.renderer.orange())
+            self.debug(car_location, target_location, car_debug)
+            self.renderer.end_rendering()
         
         
         # This is good to keep at the beginning of get_output. It will allow you to continue
         # any sequences that you may have started during a previous call to get_output.
+        self.profiler.stage('sequence')
         if self.active_sequence is not None and not self.active_sequence.done:
             controls = self.active_sequence.tick(packet)
             if controls is not None:
                 return controls
             
         ### CONTROLS/ACTIONS
+        self.profiler.stage('controls')
         controls = SimpleControllerState()
         controls.steer = steer_toward_target(my_car, target_location)
         # controls.pitch = pitch_toward_target(my_car, target_location)
@@ -329,7 +473,8 @@ class MyBot(BaseAgent):
         controls.throttle = 1.0
         # if not car_grounded or not car_on_wheels:
         #     controls.boost = True
-        if car_location.dist(ball_path) < 1000 and target_location == get_positioning_on_ball:
+        # The target is only get_positioning_on_ball when ball chasing without a shooting angle
+        if state.dist('car', 'ball_path') < 1000 and behavior == "Ballchase" and not features.shooting_angle:
             controls.boost = False
             controls.throttle = 0.5
         
@@ -342,17 +487,17 @@ class MyBot(BaseAgent):
         ### BEHAVIORAL CONTROLS
         # Preset Kickoffs
         if behavior == "Kickoff":
-            op_kickoff = self.op_kickoffs(packet, car_location, (-self.team_coef)*1)
+            op_kickoff = self.op_kickoffs(packet, car_location)
             if op_kickoff:
                 return op_kickoff
-            kickoff_finish = self.kickoff_flip(packet, car_to_target_angle, car_location.dist(ball_location), controls, car_to_ball)
+            kickoff_finish = self.kickoff_flip(packet, car_to_target_angle, state.dist('car', 'ball'), controls, car_to_ball)
             if kickoff_finish:
                 return kickoff_finish
         
         # TODO: Work on this
-        if behavior == "Defense" and car_location.dist(target_location) < 100:
+        if behavior == "Defense" and state.dist('car', 'target') < 100:
             controls.boost = False
-            if car_velocity.length() > 300:
+            if state.car_speed > 300:
                 controls.throttle = -0.3
             else:
                 controls.throttle = 0.3
@@ -361,38 +506,38 @@ class MyBot(BaseAgent):
         if color == 0:
             if behavior == "Reposition" and car_location.y < -5000:
                 controls.boost = False
-                if car_velocity.length() > 300:
+                if state.car_speed > 300:
                     controls.throttle = -0.3
                 else:
                     controls.throttle = 0.3
         else:
             if behavior == "Reposition" and car_location.y > 5000:
                 controls.boost = False
-                if car_velocity.length() > 300:
+                if state.car_speed > 300:
                     controls.throttle = -0.3
                 else:
                     controls.throttle = 0.3
 
         # Flip into ball
         # TODO: Replace distance with relative locations for the if statement
-        if car_location.dist(ball_location) < 300 and ball_grounded and car_grounded and (behavior == "Ball chase" or "Kickoff"):
+        if state.dist('car', 'ball') < 300 and ball_grounded and car_grounded and (behavior == "Ball chase" or "Kickoff"):
             return self.begin_smart_flip(packet, car_to_ball)
         
         # Flip for speed
-        if (1400 < car_velocity.length() < 1450) and car_grounded and not car_steering and car_location.dist(target_location) > 2750 and (behavior == "Reposition" or "Kickoff"):
+        if (1400 < state.car_speed < 1450) and car_grounded and not car_steering and state.dist('car', 'target') > 2750 and (behavior == "Reposition" or "Kickoff"):
         #     # We'll do a front flip if the car is moving at a certain speed.
               return self.begin_front_flip(packet)
         
         # Half flip
-        if car_velocity.length() < 1000 and car_grounded and car_to_target.x < -500 and car_location.dist(target_location) > 1500 and abs(car_to_target_angle) < 60:
+        if state.car_speed < 1000 and car_grounded and car_to_target.x < -500 and state.dist('car', 'target') > 1500 and abs(car_to_target_angle) < 60:
             return self.begin_half_flip(packet, car_location, car_yaw)
         
         # Boost to gain speed
-        if car_velocity.length() != 2300 and car_on_wheels and not car_steering:
+        if state.car_speed != 2300 and car_on_wheels and not car_steering:
             controls.boost = True
         
         # Powerslide to turn quicker
-        if abs(controls.steer) >= 1 and car_grounded and car_velocity.length() >= 1000 and car_location.dist(target_location) < 1500:
+        if abs(controls.steer) >= 1 and car_grounded and state.car_speed >= 1000 and state.dist('car', 'target') < 1500:
             controls.throttle = 0.5
             controls.handbrake = True
             # return self.powerslide(packet, controls.steer)
@@ -407,20 +552,20 @@ class MyBot(BaseAgent):
             # return self.clean_land(packet, car_roll, car_pitch, car_to_target_angle)
         
         # Slow down if ball is high up
-        if not ball_grounded and car_location.dist(ball_location) < 1000 and (behavior == "Ball chase" or "Kickoff"):
+        if not ball_grounded and state.dist('car', 'ball') < 1000 and (behavior == "Ball chase" or "Kickoff"):
             controls.throttle = 0.5
         
         # TESTING: speedflip
-        # if car_grounded and car_on_wheels and car_facing_target and not car_steering:
+        # if car_grounded and car_on_wheels and features.car_facing_target and not car_steering:
         #     self.begin_speed_flip_smart(packet, car_to_target)
         
         # TESTING: jump for aerial
-        # if car_grounded and my_car.boost > 50 and car_facing_target and target_location[2] > 900 and not car_steering:
+        # if car_grounded and my_car.boost > 50 and features.car_facing_target and target_location[2] > 900 and not car_steering:
         #     return self.begin_aerial(packet, car_roll, car_pitch, ball_path)
         
         # TESTING: go for aerial in air (note: this doesn't work very well)
         # if not car_grounded and not car_on_wheels:
-        #     return self.continue_aerial(packet, car_roll, car_pitch, ball_path, car_to_target, car_to_target_angle, car_to_target_verticle_angle)
+        #     return self.continue_aerial(packet, car_roll, car_pitch, ball_path, car_to_target, car_to_target_angle, features.car_to_target_verticle_angle)
         
         return controls
     
@@ -443,7 +588,8 @@ class MyBot(BaseAgent):
     #     return self.begin_front_flip(packet)
     
     def begin_smart_flip(self, packet, car_to_ball):
-        # find angle to ball
+        # find angle to ball. car_to_ball is the Vec3 TickState caches, so nudge a copy of it, not it.
+        car_to_ball = Vec3(car_to_ball)
         if car_to_ball.x == 0: car_to_ball.x = 0.01
         if car_to_ball.y == 0: car_to_ball.y = 0.01
         yw = car_to_ball.y/(abs(car_to_ball.x) + abs(car_to_ball.y))
@@ -452,12 +598,13 @@ class MyBot(BaseAgent):
         #     yw = 0
         # if abs(ptch) < 0.1:
         #     ptch = 0
-        self.active_sequence = Sequence([
+        # The flip direction is different every time, so this one can't be compiled ahead of time.
+        self.active_sequence = Timeline([
             ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
             ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
             ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch = ptch, yaw = yw)),
             ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        ]).play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
@@ -468,81 +615,47 @@ class MyBot(BaseAgent):
         
     def begin_front_flip(self, packet):
         # Send some quickchat just for fun
+        # from rlbot.messages.flat.QuickChatSelection import QuickChatSelection
         # self.send_quick_chat(team_only=False, quick_chat=QuickChatSelection.Information_IGotIt)
         # Do a front flip. We will be committed to this for a few seconds and the bot will ignore other
         # logic during that time because we are setting the active_sequence.
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['front flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_back_flip(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['back flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_left_flip(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, yaw=-1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['left flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_right_flip(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, yaw=1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['right flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_diag_left_flip(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1, yaw=-1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['diagonal left flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_diag_right_flip(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1, yaw=1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['diagonal right flip'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_double_jump(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.30, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
+        self.active_sequence = self.maneuvers['double jump'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
@@ -556,12 +669,7 @@ class MyBot(BaseAgent):
             y = 1
         else:
             y = -1
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(jump=False)),
-            ControlStep(duration=0.3, controls=SimpleControllerState(jump=True, pitch=1)),
-            ControlStep(duration=0.5, controls=SimpleControllerState(pitch = -1, roll = x * y)),
-        ])
+        self.active_sequence = self.maneuvers['half flip roll right' if x * y > 0 else 'half flip roll left'].play()
         return self.active_sequence.tick(packet)
     
     # Speed Flips
@@ -573,36 +681,16 @@ class MyBot(BaseAgent):
     
     
     def begin_speed_flip_left(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.02, controls=SimpleControllerState(throttle = 1)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=-1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = -1, yaw = -0.5)),
-            ControlStep(duration=0.25, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-        ])
+        self.active_sequence = self.maneuvers['speed flip left'].play()
         
     def begin_speed_flip_right(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.02, controls=SimpleControllerState(throttle = 1)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = 1, yaw = 0.5)),
-            ControlStep(duration=0.25, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-        ])
+        self.active_sequence = self.maneuvers['speed flip right'].play()
 
         # Return the controls associated with the beginning of the sequence so we can start right away.
         return self.active_sequence.tick(packet)
     
     def begin_aerial(self, packet, car_roll, car_pitch, ball_path):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.02, controls=SimpleControllerState()),
-            ControlStep(duration=0.01, controls=SimpleControllerState(jump=True)),
-            ControlStep(duration=0.14, controls=SimpleControllerState(jump=True, pitch = 1)),
-            ControlStep(duration=0.15, controls=SimpleControllerState(jump=False, pitch = 0.75, boost = True)),
-            ControlStep(duration=0.20, controls=SimpleControllerState(jump=True, boost = True)),
-        ])
+        self.active_sequence = self.maneuvers['aerial'].play()
         return self.active_sequence.tick(packet)
     
     # def continue_aerial(self, packet, car_roll, car_pitch, ball_path, car_to_target, car_to_target_angle, car_to_target_verticle_angle):
@@ -624,75 +712,6 @@ class MyBot(BaseAgent):
     #     ])
     #     return self.active_sequence.tick(packet)
     
-    ### OP KICKOFFS    
-    def back_center_kickoff(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.3, controls=SimpleControllerState(throttle = 1, boost = True)),
-            ControlStep(duration=0.26, controls=SimpleControllerState(throttle = 1, boost = True, steer = -0.30)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = 1, yaw = 0.5)),
-            ControlStep(duration=0.25, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True, steer = 0.25)),
-        ])
-        return self.active_sequence.tick(packet)
-
-    def back_right_kickoff(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.49, controls=SimpleControllerState(throttle = 1, boost = True, steer = -0.3)),
-            ControlStep(duration=0.02, controls=SimpleControllerState(throttle = 1)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = 1, yaw = 1)),
-            ControlStep(duration=0.20, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True, steer = 0.05)),
-            # ControlStep(duration=0.27, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-            # ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            # ControlStep(duration=0.01, controls=SimpleControllerState(jump=False)),
-            # ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1)),
-            # ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
-        return self.active_sequence.tick(packet)
-    
-    def back_left_kickoff(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.49, controls=SimpleControllerState(throttle = 1, boost = True, steer = 0.3)),
-            ControlStep(duration=0.02, controls=SimpleControllerState(throttle = 1)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=-1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = -1, yaw = -1)),
-            ControlStep(duration=0.20, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True, steer = -0.05)),
-            # ControlStep(duration=0.27, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-            # ControlStep(duration=0.10, controls=SimpleControllerState(jump=True)),
-            # ControlStep(duration=0.01, controls=SimpleControllerState(jump=False)),
-            # ControlStep(duration=0.2, controls=SimpleControllerState(jump=True, pitch=-1)),
-            # ControlStep(duration=0.5, controls=SimpleControllerState()),
-        ])
-        return self.active_sequence.tick(packet)
-    
-    def diag_right_kickoff(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.42, controls=SimpleControllerState(throttle = 1, boost = True, steer = 0.35)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=-1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = -1, yaw = -0.5)),
-            ControlStep(duration=0.10, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-        ])
-        return self.active_sequence.tick(packet)
-    
-    def diag_left_kickoff(self, packet):
-        self.active_sequence = Sequence([
-            ControlStep(duration=0.42, controls=SimpleControllerState(throttle = 1, boost = True, steer = -0.35)),
-            ControlStep(duration=0.05, controls=SimpleControllerState(throttle = 1, jump=True, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=False, boost = True)),
-            ControlStep(duration=0.01, controls=SimpleControllerState(throttle = 1, jump=True, boost = True, pitch=-1, yaw=1)),
-            ControlStep(duration=0.79, controls=SimpleControllerState(throttle = 1, jump=False, boost = True, pitch=1, roll = 1, yaw = 0.5)),
-            ControlStep(duration=0.10, controls=SimpleControllerState(throttle = 1, handbrake = True, boost = True)),
-        ])
-        return self.active_sequence.tick(packet)
-    
     # TODO: It might be useful to add custom kickoff flip logic based on where opponent is
     def kickoff_flip(self, packet, y, dist, controls, car_to_ball):
         controls.handbrake = True
@@ -703,23 +722,12 @@ class MyBot(BaseAgent):
     
     
     ### BEHAVIORS
-    # from blue's then orange's perspective
-    # back center: (0.00, -4608.00) (0.00, 4608.00)
-    # back right: (-256.00, -3840.00) (256.00, 3840.00)
-    # back left: (256.00, -3840.00) (-256.00, 3840.00)
-    # diag right: (-2048.00, -2560.00) (2048.00, 2560.00)
-    # diag left: (2048.00, -2560.00) (-2048.00, 2560.00)
-    def op_kickoffs(self, packet, car_location, coef):
-        if round(car_location.x) == 0 and abs(round(car_location.y)) == 4608:
-            return self.back_center_kickoff(packet)
-        elif round(car_location.x) == (-coef)*256 and round(car_location.y) == (-coef)*3840:
-            return self.back_right_kickoff(packet)
-        elif round(car_location.x) == (coef)*256 and round(car_location.y) == (-coef)*3840:
-            return self.back_left_kickoff(packet)
-        elif round(car_location.x) == (-coef)*2048:
-            return self.diag_right_kickoff(packet)
-        elif round(car_location.x) == (coef)*2048:
-            return self.diag_left_kickoff(packet) 
+    def op_kickoffs(self, packet, car_location):
+        # Preset kickoffs are in util/maneuvers.json, looked up by spawn and team
+        kickoff = self.maneuvers.kickoff_for(self.team, car_location)
+        if kickoff is not None:
+            self.active_sequence = kickoff.play()
+            return self.active_sequence.tick(packet)
     
     def ball_chase(self, ball_location, ball_path, car_location):
         # distance = car_location.dist(ball_location)
@@ -772,42 +780,17 @@ class MyBot(BaseAgent):
         self.renderer.draw_rect_3d(target_location, 8, 8, True, self.renderer.cyan(), centered=True)
     
     
-### IMPORTANT LOCATIONS
-def get_nearest_big_boost(info, packet, car_location, car_orientation):
-    nearest_boost_loc = Vec3(0, 0, 999999)
-    # loop over all the boosts
-    for i, boost in enumerate(info.boost_pads):
-        car_to_big = relative_location(car_location, car_orientation, Vec3(boost.location))
-        trig = math.atan(car_to_big.y/car_to_big.x)*180/math.pi
-        # only want large boosts that haven't been taken
-        if boost.is_full_boost and packet.game_boosts[i].is_active:
-            # if this boost is closer, save that
-            if car_location.dist(Vec3(boost.location)) < car_location.dist(Vec3(nearest_boost_loc)) and 0 < car_to_big.x and abs(trig) < 60:
-                nearest_boost_loc = boost.location
-    return(nearest_boost_loc)
-
-def get_nearest_small_boost(info, packet, car_location, car_orientation):
-    nearest_boost_loc = Vec3(0, 0, 999999)
-    # loop over all the boosts
-    for i, boost in enumerate(info.boost_pads):
-        car_to_small = relative_location(car_location, car_orientation, Vec3(boost.location))
-        if car_to_small.x == 0: car_to_small.x = 0.01
-        trig = math.atan(car_to_small.y/car_to_small.x)*180/math.pi
-        # only want large boosts that haven't been taken
-        if not boost.is_full_boost and packet.game_boosts[i].is_active:
-            # if this boost is closer, save that
-            if car_location.dist(Vec3(boost.location)) < car_location.dist(Vec3(nearest_boost_loc)) and 0 < car_to_small.x and abs(trig) < 30:
-                nearest_boost_loc = boost.location
-    return(nearest_boost_loc)
-
 # TODO: Fix false positives with angle
 # It would probably be easier to figure out the x coordinates the ball needs to be within given its y
-def triangle(goal_location, left_post, right_post, ball_path, ball_velocity, car_location):
+def triangle(state, goal, left_post, right_post):
+    goal_location = state.points[goal]
+    ball_path = state.points['ball_path']
+    car_location = state.car_location
     triangle_length = goal_location.y - ball_path.y
     triangle_width = goal_location.x - ball_path.x
     triangle_hyp = (triangle_length**2 + triangle_width**2)**(1/2)
     ball_path_angle_to_net = math.atan2(triangle_length, triangle_width)
-    new_hyp = triangle_hyp*(1 + ball_velocity.length()/15000)
+    new_hyp = triangle_hyp*(1 + state.ball_speed/15000)
     new_y = new_hyp * math.sin(ball_path_angle_to_net)
     new_x = new_hyp * math.cos(ball_path_angle_to_net)
     
@@ -834,7 +817,141 @@ def triangle(goal_location, left_post, right_post, ball_path, ball_velocity, car
     
     
     angle = False
-    if ball_path.dist(goal_location) < car_location.dist(goal_location) and (car_angle_to_left < car_to_ball_angle < car_angle_to_right or car_angle_to_right < car_to_ball_angle < car_angle_to_left):
+    if state.dist('ball_path', goal) < state.dist('car', goal) and (car_angle_to_left < car_to_ball_angle < car_angle_to_right or car_angle_to_right < car_to_ball_angle < car_angle_to_left):
         angle = True
         
-    return (car_angle_to_left, car_angle_to_right, get_positioning_on_ball, angle)
\ No newline at end of file
+    return (car_angle_to_left, car_angle_to_right, get_positioning_on_ball, angle)
+
+def nearest_boost_pads(table, state, available):
+    # Nearest big pad within 60 degrees of our nose and small pad within 30, both from one pass
+    return table.nearest_in_cones(state.car_location, state.car_orientation, available, big_cone=60, small_cone=30)
+
+
+class BehaviorFeatures(Features):
+    """Everything the behavior rules, the debug drawing and the controls might want to know about one tick."""
+    points = {
+        'opp_car': 'opp_car_location',
+        'big_boost': 'nearest_big_boost',
+        'small_boost': 'nearest_small_boost',
+    }
+
+    def __init__(self, bot: MyBot, state: TickState, prediction: BallPredictionArrays, planned_boost_pads=None):
+        super().__init__(state)
+        self.bot = bot
+        self.prediction = prediction
+        self.planned_boost_pads = planned_boost_pads
+
+    @feature
+    def opp_car_location(self) -> Vec3:
+        return self.bot.scheduler.run('opponent analysis', self.state.packet.game_info.seconds_elapsed,
+                                      self._find_opp_car)
+
+    def _find_opp_car(self) -> Vec3:
+        # The opponent closest to the ball, or somewhere far away if there isn't one
+        opp_index = self.state.cars.nearest_opponent(self.bot.team, self.state.ball_location)
+        if opp_index is None:
+            return Vec3(0, 0, 999999)
+        return self.state.cars.location(opp_index)
+
+    @feature
+    def defense_location(self) -> Vec3:
+        if self.state.car_location.x > 0:
+            return Vec3(700, self.bot.team_coef * 5000, 0)
+        return Vec3(-700, self.bot.team_coef * 5000, 0)
+
+    @feature
+    def boost_pad_indices(self):
+        if self.planned_boost_pads is not None:
+            return self.planned_boost_pads
+        return self.bot.scheduler.run('boost route', self.state.packet.game_info.seconds_elapsed,
+                                      self._find_boost_pads)
+
+    def _find_boost_pads(self):
+        # Pads that are empty now but will have respawned by the time we get there count too.
+        state = self.state
+        tracker = self.bot.boost_pad_tracker
+        available = tracker.available_on_arrival(state.car_location, state.car_speed,
+                                                 state.packet.game_info.seconds_elapsed)
+        return nearest_boost_pads(tracker.table, state, available)
+
+    @feature
+    def nearest_big_boost(self) -> Vec3:
+        return self.bot.boost_pad_tracker.table.location(self.boost_pad_indices[0])
+
+    @feature
+    def nearest_small_boost(self) -> Vec3:
+        return self.bot.boost_pad_tracker.table.location(self.boost_pad_indices[1])
+
+    def arrival_time(self, name: str) -> float:
+        """Seconds for our car to get to the named point the way it's facing and moving now, see MotionTables."""
+        self.point(name)
+        state = self.state
+        local = state.relative(name)
+        return self.bot.motion_tables.time_to_reach(local.x, local.y, state.car_speed, boost=state.my_car.boost > 0)
+
+    def closer(self, a: str, b: str) -> bool:
+        """Whether our car would get to a before b. By arrival time if the motion tables are loaded, else distance."""
+        if self.bot.motion_tables is not None:
+            return self.arrival_time(a) < self.arrival_time(b)
+        return self.dist('car', a) < self.dist('car', b)
+
+    @feature
+    def potential_goal(self) -> bool:
+        # Bounces, wall hits and goal crossings are only worked out once per prediction, then looked up
+        color = self.bot.team
+        ball_path = self.point('ball_path')
+        if not prediction_events(self.prediction).goal_into(color):
+            return False
+        return ball_path.y < 0 if color == 0 else ball_path.y > 0
+
+    @feature
+    def opp_goal_triangle(self):
+        bot = self.bot
+        return triangle(self.state, 'opp_goal', bot.opp_goal_left_post, bot.opp_goal_right_post)
+
+    @feature
+    def shooting_angle(self) -> bool:
+        return self.opp_goal_triangle[3]
+
+    @feature
+    def get_positioning_on_ball(self) -> Vec3:
+        return self.opp_goal_triangle[2]
+
+    @feature
+    def own_goal_angle(self) -> bool:
+        bot = self.bot
+        return triangle(self.state, 'my_goal', bot.my_goal_left_post, bot.my_goal_right_post)[3]
+
+    @feature
+    def car_to_target_verticle_angle(self) -> float:
+        # Only once the target has been set
+        car_to_target = self.state.relative('target')
+        car_pitch_in_degrees = self.state.car_rotation.pitch * 90
+        two_d_distance = (car_to_target.x**2 + car_to_target.y**2)**(1/2)
+        car_to_target_verticle_angle = math.atan(abs(car_to_target.z/two_d_distance))*180/math.pi + car_pitch_in_degrees
+        if car_to_target.z < 0:
+            car_to_target_verticle_angle = -car_to_target_verticle_angle
+        return car_to_target_verticle_angle
+
+    @feature
+    def car_facing_target(self) -> bool:
+        return abs(self.state.angle('target')) <= 10
+
+    @feature
+    def car_facing_aerial(self) -> bool:
+        return abs(self.car_to_target_verticle_angle - self.state.car_rotation.pitch * 90) <= 10
+
+
+# Most important first. Later rules are only checked when every rule above them doesn't apply.
+BEHAVIOR_RULES = [
+    # During kickoff, go for the ball
+    Rule("Kickoff", lambda f: not f.bot.has_first_touch_happened_yet),
+    Rule("Save", lambda f: f.potential_goal),
+    Rule("Leave net", lambda f: abs(f.state.car_location[1]) > 5120),
+    Rule("Reposition", lambda f: abs(f.defense_location[1] - f.point('ball_path')[1]) < abs(f.defense_location[1] - f.state.car_location[1])),
+    Rule("Defense", lambda f: f.dist('opp_car', 'ball_path') < f.dist('car', 'ball_path') and f.dist('ball_path', 'my_goal') < 2000),
+    Rule("Get small boost", lambda f: f.dist('car', 'small_boost') < 500 and f.state.my_car.boost < 75),
+    Rule("Get big boost", lambda f: f.closer('big_boost', 'ball') and f.state.my_car.boost < 50 and f.dist('car', 'my_goal') < f.dist('ball', 'my_goal') and f.dist('ball', 'my_goal') > f.dist('big_boost', 'my_goal')),
+    # Don't chase the ball into offensive corners
+    Rule("Reposition", lambda f: abs(f.state.ball_location.x) > 900 and abs(f.point('ball_path').y) > 4900 and f.dist('ball_path', 'opp_goal') < f.dist('ball_path', 'my_goal')),
+]
@@ -0,0 +1,50 @@
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.boost_pad_tracker import BIG_PAD_RESPAWN_TIME, BoostPadTracker
+from util.headless import standard_field_info
+from util.vec import Vec3
+
+
+def make_packet(time: float, empty_pad: int = None, timer: float = 0.0) -> GameTickPacket:
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = time
+    packet.num_boost = standard_field_info().num_boosts
+    for i in range(packet.num_boost):
+        packet.game_boosts[i].is_active = i != empty_pad
+        packet.game_boosts[i].timer = timer if i == empty_pad else 0.0
+    return packet
+
+
+def test_taken_pad_is_available_if_it_respawns_before_we_arrive():
+    tracker = BoostPadTracker()
+    tracker.initialize_boosts(standard_field_info())
+    big = int(tracker.is_full.nonzero()[0][0])
+    tracker.update_boost_status(make_packet(10.0))
+    tracker.update_boost_status(make_packet(10.5, empty_pad=big))
+    assert list(tracker.taken) == [big]
+    assert tracker.respawn_times[big] == 10.5 + BIG_PAD_RESPAWN_TIME
+
+    pad = Vec3(*tracker.locations[big])
+    assert not tracker.available_on_arrival(pad + Vec3(1000, 0, 0), 1000, 11.0)[big]
+    assert tracker.available_on_arrival(pad + Vec3(12000, 0, 0), 1000, 11.0)[big]
+
+
+def test_pad_already_empty_on_the_first_packet_uses_its_timer():
+    tracker = BoostPadTracker()
+    tracker.initialize_boosts(standard_field_info())
+    big = int(tracker.is_full.nonzero()[0][0])
+    tracker.update_boost_status(make_packet(20.0, empty_pad=big, timer=4.0))
+    assert tracker.respawn_times[big] == 20.0 + BIG_PAD_RESPAWN_TIME - 4.0
+
+
+def test_empty_packet_before_the_first_full_one_is_ignored():
+    tracker = BoostPadTracker()
+    tracker.initialize_boosts(standard_field_info())
+    big = int(tracker.is_full.nonzero()[0][0])
+    empty = make_packet(5.0)
+    empty.num_boost = 0
+    tracker.update_boost_status(empty)
+    tracker.update_boost_status(make_packet(5.5, empty_pad=big, timer=2.0))
+    assert len(tracker.respawned) == 0
+    assert tracker.respawn_times[big] == 5.5 + BIG_PAD_RESPAWN_TIME - 2.0
+    assert not tracker.available_on_arrival(Vec3(*tracker.locations[big]), 1000, 5.5)[big]
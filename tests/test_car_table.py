@@ -0,0 +1,54 @@
+from rlbot.utils.structures.game_data_struct import GameTickPacket, Vector3
+
+from util.car_table import CarTable
+from util.vec import Vec3
+
+
+def make_packet(*cars) -> GameTickPacket:
+    """cars are (team, (x, y, z)) pairs."""
+    packet = GameTickPacket()
+    packet.num_cars = len(cars)
+    for i, (team, location) in enumerate(cars):
+        packet.game_cars[i].team = team
+        packet.game_cars[i].boost = 10 * i
+        packet.game_cars[i].physics.location = Vector3(*location)
+    return packet
+
+
+def test_reads_every_car_the_same_as_the_packet():
+    packet = make_packet((0, (100, 200, 17)), (1, (-300, 400, 17)), (1, (0, -5000, 300)))
+    cars = CarTable(packet)
+    assert len(cars) == 3
+    for i in range(3):
+        car = packet.game_cars[i]
+        assert (cars.teams[i], cars.boosts[i]) == (car.team, car.boost)
+        location = cars.location(i)
+        assert (location.x, location.y, location.z) == (car.physics.location.x, car.physics.location.y,
+                                                         car.physics.location.z)
+    assert cars.distances_to(Vec3(100, 200, 17))[0] == 0
+
+
+def test_table_is_a_copy_of_the_packet():
+    packet = make_packet((0, (100, 200, 17)))
+    cars = CarTable(packet)
+    packet.game_cars[0].physics.location.x = 999
+    assert cars.location(0).x == 100
+
+
+def test_nearest_opponent_and_teammates():
+    packet = make_packet((0, (0, 0, 17)), (1, (0, 3000, 17)), (0, (0, 1000, 17)), (1, (0, 500, 17)),
+                         (0, (0, -2000, 17)))
+    cars = CarTable(packet)
+    assert cars.nearest_opponent(0, Vec3(0, 0, 0)) == 3
+    assert cars.nearest_opponent(1, Vec3(0, 0, 0)) == 0
+    assert list(cars.teammates_by_distance(0)) == [2, 4]
+    assert list(cars.teammates_by_distance(0, Vec3(0, -3000, 17))) == [4, 2]
+    assert cars.nearest_within(Vec3(0, 450, 17), 100) == 3
+    assert cars.nearest_within(Vec3(0, 750, 17), 100) is None
+
+
+def test_no_cars():
+    cars = CarTable(make_packet())
+    assert cars.nearest_opponent(0, Vec3()) is None
+    assert cars.nearest_within(Vec3(), 1000) is None
+    assert len(CarTable(make_packet((0, (0, 0, 17)))).teammates_by_distance(0)) == 0
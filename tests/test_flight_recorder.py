@@ -0,0 +1,70 @@
+import os
+
+import pytest
+from rlbot.agents.base_agent import SimpleControllerState
+
+from util.flight_recorder import FlightRecorder, format_table, read_flight_records
+from util.vec import Vec3
+
+
+def record(recorder: FlightRecorder, ticks, behavior: str = 'Chase'):
+    for tick in ticks:
+        recorder.decide(tick / 8, behavior, Vec3(tick, -tick, 17), tick % 100,
+                        potential_goal=tick % 2 == 0 if tick % 3 else None)
+        recorder.controls(SimpleControllerState(throttle=1, steer=-0.5, jump=tick % 2 == 1))
+
+
+def test_records_read_back_oldest_first(tmp_path):
+    path = str(tmp_path / 'bot.rlbflight')
+    recorder = FlightRecorder(path, capacity=8)
+    record(recorder, range(5))
+    recorder.close()
+
+    records = read_flight_records(path)
+    assert [r.time for r in records] == [0, 0.125, 0.25, 0.375, 0.5]
+    last = records[-1]
+    assert (last.behavior, last.boost, last.target.x, last.target.y) == ('Chase', 4, 4, -4)
+    assert (last.throttle, last.steer, last.jump, last.boost_button) == (1, -0.5, False, False)
+    assert [r.potential_goal for r in records] == [None, False, True, None, True]
+    assert [r.shooting_angle for r in records] == [None] * 5
+    assert len(format_table(records).splitlines()) == 6
+
+
+def test_ring_keeps_only_the_newest_records(tmp_path):
+    path = str(tmp_path / 'bot.rlbflight')
+    recorder = FlightRecorder(path, capacity=8)
+    record(recorder, range(20), 'Chase')
+    record(recorder, range(20, 23), 'Shoot')
+    recorder.close()
+
+    records = read_flight_records(path)
+    assert [r.time * 8 for r in records] == list(range(15, 23))
+    assert [r.sequence for r in records] == list(range(16, 24))
+    assert [r.behavior for r in records] == ['Chase'] * 5 + ['Shoot'] * 3
+
+
+def test_a_record_that_was_never_finished_is_skipped(tmp_path):
+    path = str(tmp_path / 'bot.rlbflight')
+    recorder = FlightRecorder(path, capacity=4)
+    record(recorder, range(6))
+    # The bot died between deciding and returning its controls, over the oldest record
+    recorder.decide(6 / 8, 'Chase', Vec3(), 0)
+    recorder.close()
+    assert [r.time * 8 for r in read_flight_records(path)] == [3, 4, 5]
+
+
+def test_the_last_run_is_kept(tmp_path):
+    path = str(tmp_path / 'bot.rlbflight')
+    recorder = FlightRecorder(path, capacity=4)
+    record(recorder, range(2))
+    recorder.close()
+    FlightRecorder(path, capacity=4).close()
+    assert read_flight_records(path) == []
+    assert len(read_flight_records(path + '.previous')) == 2
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / 'not-a-recording'
+    path.write_bytes(os.urandom(1024))
+    with pytest.raises(ValueError, match='not a flight recorder file'):
+        read_flight_records(str(path))
@@ -0,0 +1,54 @@
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.game_events import BallTouched, GameEvent, GameEventStream, GoalScored, KickoffEnded, KickoffStarted
+
+
+def make_packet(time: float, kickoff: bool = False, blue_score: int = 0, orange_score: int = 0) -> GameTickPacket:
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = time
+    packet.game_info.is_kickoff_pause = kickoff
+    packet.num_teams = 2
+    packet.teams[0].score, packet.teams[1].score = blue_score, orange_score
+    packet.game_ball.latest_touch.player_index = -1
+    return packet
+
+
+def test_kickoff_started_and_ended():
+    stream = GameEventStream()
+    assert stream.update(make_packet(10.0)) == []
+    assert stream.update(make_packet(10.125, kickoff=True)) == [KickoffStarted(10.125)]
+    assert stream.update(make_packet(10.25, kickoff=True)) == []
+    assert stream.update(make_packet(13.0)) == [KickoffEnded(13.0)]
+
+
+def test_kickoff_already_under_way_on_the_first_packet():
+    assert GameEventStream().update(make_packet(10.0, kickoff=True)) == [KickoffStarted(10.0)]
+
+
+def test_goal_comes_before_the_kickoff_after_it():
+    stream = GameEventStream()
+    stream.update(make_packet(10.0, blue_score=1))
+    assert stream.update(make_packet(10.125, blue_score=1, orange_score=1)) == [GoalScored(10.125, 1)]
+    assert stream.update(make_packet(15.0, kickoff=True, blue_score=2, orange_score=1)) == \
+        [KickoffStarted(15.0), GoalScored(15.0, 0)]
+
+
+def test_clock_going_backwards_starts_over_without_reporting_goals():
+    stream = GameEventStream()
+    stream.update(make_packet(100.0, blue_score=3))
+    assert stream.update(make_packet(1.0)) == []
+    assert stream.update(make_packet(1.125, orange_score=1)) == [GoalScored(1.125, 1)]
+
+
+def test_subscribers_get_their_events_and_subclasses():
+    stream = GameEventStream()
+    kickoffs, everything = [], []
+    stream.subscribe(KickoffStarted, kickoffs.append)
+    stream.subscribe(GameEvent, everything.append)
+    stream.update(make_packet(10.0))
+    packet = make_packet(10.125, kickoff=True)
+    packet.game_ball.latest_touch.player_index = 0
+    packet.game_ball.latest_touch.time_seconds = 10.125
+    stream.update(packet)
+    assert kickoffs == [KickoffStarted(10.125)]
+    assert [type(event) for event in everything] == [KickoffStarted, BallTouched]
@@ -0,0 +1,28 @@
+import os
+import random
+
+import pytest
+
+from bot import MyBot
+from util.headless import HeadlessMatch
+from util.replay import control_values, replay
+from util.scenarios import all_scenarios
+
+SCENARIOS = all_scenarios(random.Random(0))
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS, ids=[scenario.name for scenario in SCENARIOS])
+def test_replaying_a_recorded_match_gives_the_same_controls(scenario, tmp_path):
+    class RecordingBot(MyBot):
+        # The same as turning on record_packets in bot.cfg
+        def __init__(self, name, team, index):
+            super().__init__(name, team, index)
+            self.record_directory = str(tmp_path)
+
+    match = HeadlessMatch(RecordingBot)
+    match.load(scenario)
+    controls = [control_values(match.tick()) for _ in range(240)]
+    match.close()
+
+    log, = os.listdir(tmp_path)
+    assert replay(os.path.join(tmp_path, log)).controls == controls
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from rlbot.utils.structures.game_data_struct import Physics, Rotator, Vector3
+
+from util.headless import simple_prediction
+from util.intercept import HIT_DISTANCE, estimate_travel_times, find_intercept
+from util.orientation import Orientation
+from util.physics import BALL_RADIUS
+from util.prediction_arrays import BallPredictionArrays
+from util.vec import Vec3
+
+# A car at the middle of the field, facing positive y
+CAR = Vec3(0, 0, 17)
+FACING_Y = Orientation(Rotator(0, np.pi / 2, 0))
+
+
+def predict(location: Vector3, velocity: Vector3) -> BallPredictionArrays:
+    ball = Physics()
+    ball.location, ball.velocity = location, velocity
+    return BallPredictionArrays(simple_prediction(ball, 10.0))
+
+
+def travel_times(targets, velocity: Vec3 = Vec3(), boost: float = 0) -> np.ndarray:
+    return estimate_travel_times(np.array(targets, dtype=float), CAR, FACING_Y, velocity, boost)
+
+
+def test_travel_times():
+    near, ahead, behind, far = travel_times([[0, HIT_DISTANCE / 2, 17], [0, 2000, 17], [0, -2000, 17],
+                                             [0, 4000, 17]])
+    assert near == pytest.approx(0, abs=1e-6)
+    assert 0 < ahead < far
+    assert behind > ahead
+    assert travel_times([[0, 4000, 17]], boost=100)[0] < far
+    assert travel_times([[0, 4000, 17]], velocity=Vec3(0, 1000, 0))[0] < far
+
+
+def test_intercepts_the_earliest_slice_it_can_reach():
+    prediction = predict(Vector3(0, 3000, BALL_RADIUS), Vector3(0, -500, 0))
+    intercept = find_intercept(prediction, CAR, FACING_Y, Vec3(), 0, 10.0)
+    assert intercept.feasible
+    assert intercept.time == prediction.times[intercept.index]
+    assert intercept.margin == pytest.approx(intercept.time - 10.0 - intercept.travel_time)
+    # Every earlier slice was out of reach
+    margins = prediction.times[:intercept.index] - 10.0 - travel_times(prediction.positions[:intercept.index])
+    assert (margins < 0).all()
+
+
+def test_ball_out_of_reach_gives_the_closest_miss():
+    prediction = predict(Vector3(0, 3000, BALL_RADIUS), Vector3(0, 3000, 0))
+    intercept = find_intercept(prediction, CAR, FACING_Y, Vec3(), 0, 10.0)
+    assert not intercept.feasible
+    margins = prediction.times - 10.0 - travel_times(prediction.positions)
+    assert intercept.margin == pytest.approx(margins.max())
+
+
+def test_ball_too_high_to_hit():
+    prediction = predict(Vector3(0, 1000, 1500), Vector3(0, 0, 0))
+    intercept = find_intercept(prediction, CAR, FACING_Y, Vec3(), 0, 10.0)
+    assert intercept.location.z < 300
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from util.maneuvers import DEFAULT_PATH, ManeuverError, load_maneuvers, parse_maneuvers
+
+
+def test_default_maneuvers_load():
+    assert 'front flip' in load_maneuvers(DEFAULT_PATH)
+
+
+def test_steps_are_compiled_in_order():
+    library = parse_maneuvers({'maneuvers': {'hop': [{'duration': 0.1, 'jump': True}, {'duration': 0.25}]}})
+    assert [controls.jump for controls in library['hop'].controls] == [True, False]
+
+
+@pytest.mark.parametrize('step', [{'jump': True}, 3, 'jump', None, [0.1]])
+def test_malformed_step_is_a_maneuver_error(step):
+    with pytest.raises(ManeuverError, match='step 1 of hop'):
+        parse_maneuvers({'maneuvers': {'hop': [step]}})
+
+
+@pytest.mark.parametrize('document', [[], {'maneuvers': {'hop': [{'duration': 0.1}]}, 'kickoffs': []}])
+def test_wrong_shaped_file_is_a_maneuver_error_naming_it(document, tmp_path):
+    path = tmp_path / 'maneuvers.json'
+    path.write_text(json.dumps(document))
+    with pytest.raises(ManeuverError, match='maneuvers.json'):
+        load_maneuvers(str(path))
+
+
+def test_missing_file_is_a_maneuver_error_naming_it(tmp_path):
+    with pytest.raises(ManeuverError, match='missing.json'):
+        load_maneuvers(str(tmp_path / 'missing.json'))
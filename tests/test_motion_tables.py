@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from util.motion_tables import MAX_TIME, generate_motion_tables, saved_motion_tables
+
+
+@pytest.fixture(scope='module')
+def tables():
+    return generate_motion_tables()
+
+
+def test_nothing_near_the_car_is_out_of_reach(tables):
+    # A few car lengths all round, at every starting speed, with and without boost
+    xs, ys = np.meshgrid(tables.xs, tables.ys, indexing='ij')
+    near = np.hypot(xs, ys) < 1500
+    assert near.sum() > 50
+    assert (tables.times[:, :, near] < MAX_TIME).all()
+
+
+def test_every_point_on_the_grid_is_reached(tables):
+    assert (tables.times < MAX_TIME).all()
+
+
+@pytest.mark.parametrize('speed', [0, 1000, 2300])
+def test_point_beside_the_car_is_quicker_than_turning_around(tables, speed):
+    assert tables.time_to_reach(0, 500, speed) < tables.time_to_reach(-2000, 0, speed)
+
+
+def test_lookup_matches_the_batch_version(tables):
+    rng = np.random.default_rng(0)
+    xs, ys = rng.uniform(-15000, 15000, 200), rng.uniform(-15000, 15000, 200)
+    for speed in (0, 137.5, 2300, 3000):
+        for boost in (False, True):
+            batch = tables.times_to_reach(xs, ys, speed, boost)
+            single = [tables.time_to_reach(x, y, speed, boost) for x, y in zip(xs, ys)]
+            assert np.allclose(batch, single, atol=1e-4)
+
+
+def test_saved_tables_are_never_built(tmp_path):
+    assert saved_motion_tables(str(tmp_path)) is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,55 @@
+import ctypes
+
+from rlbot.utils.structures.ball_prediction_struct import Slice
+from rlbot.utils.structures.game_data_struct import BoostPadState
+
+from util.headless import HeadlessMatch
+from util.packet_log import PacketLogReader, PacketRecorder, encode_ball, encode_car
+from util.scenarios import kickoff_scenarios
+
+
+def snapshot(packet, prediction) -> tuple:
+    return (packet.game_info.seconds_elapsed, packet.game_info.frame_num, packet.num_cars, encode_ball(packet.game_ball),
+            [encode_car(packet.game_cars[i]) for i in range(packet.num_cars)],
+            ctypes.string_at(ctypes.addressof(packet.game_boosts), packet.num_boost * ctypes.sizeof(BoostPadState)),
+            prediction.num_slices,
+            ctypes.string_at(ctypes.addressof(prediction.slices), prediction.num_slices * ctypes.sizeof(Slice)))
+
+
+def test_ticks_read_back_as_they_were_recorded(tmp_path):
+    match = HeadlessMatch()
+    match.load(kickoff_scenarios()[0])
+    path = str(tmp_path / 'match.rlblog')
+    recorder = PacketRecorder(path, 0, 0, 'Headless', match.field_info)
+    recorded = []
+    for _ in range(150):
+        match.tick()
+        recorder.record_tick(match.packet, match.ball_prediction)
+        recorded.append(snapshot(match.packet, match.ball_prediction))
+    recorder.close()
+    match.close()
+
+    reader = PacketLogReader(path)
+    assert (reader.index, reader.team, reader.name) == (0, 0, 'Headless')
+    assert reader.field_info.num_boosts == match.field_info.num_boosts
+    assert [snapshot(packet, reader.ball_prediction) for packet in reader] == recorded
+    reader.close()
+
+
+def test_log_cut_off_mid_tick_stops_at_the_last_whole_tick(tmp_path):
+    match = HeadlessMatch()
+    match.load(kickoff_scenarios()[0])
+    path = str(tmp_path / 'match.rlblog')
+    recorder = PacketRecorder(path, 0, 0, 'Headless', match.field_info)
+    for _ in range(10):
+        match.tick()
+        recorder.record_tick(match.packet, match.ball_prediction)
+    recorder.close()
+    match.close()
+    # The way a bot that crashed while writing leaves it
+    with open(path, 'r+b') as file:
+        file.truncate(file.seek(0, 2) - 100)
+
+    reader = PacketLogReader(path)
+    assert 0 < sum(1 for _ in reader) < 10
+    reader.close()
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.planner import PlanningWorker
+
+
+def make_packet(game_time: float) -> GameTickPacket:
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = game_time
+    return packet
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'the worker never got there'
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def started():
+    workers = []
+
+    def start(plan, max_age: float = 0.05) -> PlanningWorker:
+        worker = PlanningWorker(plan, max_age)
+        worker.start()
+        workers.append(worker)
+        return worker
+
+    yield start
+    for worker in workers:
+        worker.stop()
+
+
+def test_plan_is_made_from_a_copy_of_the_packet(started):
+    worker = started(lambda packet, prediction, context: (packet.game_info.seconds_elapsed, context))
+    assert worker.latest(10.0) is None
+    packet = make_packet(10.0)
+    worker.submit(packet, BallPrediction(), 'context')
+    packet.game_info.seconds_elapsed = 99.0
+    wait_for(lambda: worker.plans_made == 1)
+    plan = worker.latest(10.0)
+    assert plan.time == 10.0 and plan.value == (10.0, 'context')
+
+
+def test_old_plans_are_not_used(started):
+    worker = started(lambda packet, prediction, context: 'plan', max_age=0.05)
+    worker.submit(make_packet(10.0), BallPrediction())
+    wait_for(lambda: worker.plans_made == 1)
+    assert worker.latest(10.0 + 1 / 60) is not None
+    assert worker.latest(10.25) is None
+    # A new match, with the clock gone back to the start
+    assert worker.latest(5.0) is None
+    assert (worker.fresh_reads, worker.stale_reads) == (1, 2)
+
+
+def test_a_busy_worker_skips_to_the_newest_tick(started):
+    busy = threading.Event()
+    release = threading.Event()
+    planned = []
+
+    def plan(packet, prediction, context):
+        planned.append(packet.game_info.seconds_elapsed)
+        busy.set()
+        release.wait(5.0)
+        return packet.game_info.seconds_elapsed
+
+    worker = started(plan)
+    worker.submit(make_packet(10.0), BallPrediction())
+    busy.wait(5.0)
+    for tick in range(1, 4):
+        worker.submit(make_packet(10.0 + tick / 8), BallPrediction())
+    release.set()
+    wait_for(lambda: worker.plans_made == 2)
+    assert planned == [10.0, 10.375]
+    assert worker.latest(10.375).value == 10.375
+
+
+def test_errors_are_counted_and_the_worker_keeps_going(started):
+    def plan(packet, prediction, context):
+        if context == 'fail':
+            raise RuntimeError('no plan')
+        return 'plan'
+
+    worker = started(plan)
+    worker.submit(make_packet(10.0), BallPrediction(), 'fail')
+    wait_for(lambda: worker.errors == 1)
+    worker.submit(make_packet(10.125), BallPrediction())
+    wait_for(lambda: worker.plans_made == 1)
+    assert isinstance(worker.last_error, RuntimeError)
+    assert worker.latest(10.125).value == 'plan'
@@ -0,0 +1,56 @@
+import math
+
+import pytest
+from rlbot.utils.structures.game_data_struct import Physics, Vector3
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD
+from util.headless import simple_prediction
+from util.physics import BALL_RADIUS, GRAVITY, SIDE_WALL_X
+from util.prediction_arrays import BallPredictionArrays
+from util.prediction_events import CONTACT_MARGIN, prediction_events
+
+SLICE_TIME = 1 / 60
+
+
+def predict(location: Vector3, velocity: Vector3) -> BallPredictionArrays:
+    ball = Physics()
+    ball.location, ball.velocity = location, velocity
+    return BallPredictionArrays(simple_prediction(ball, 10.0))
+
+
+def test_dropped_ball_bounces_in_time_order():
+    events = prediction_events(predict(Vector3(0, 0, 1000), Vector3(0, 0, 0)))
+    first = events.bounces[0]
+    assert first.time == pytest.approx(10.0 + math.sqrt(2 * (1000 - BALL_RADIUS) / GRAVITY), abs=2 * SLICE_TIME)
+    assert first.z < BALL_RADIUS + CONTACT_MARGIN
+    assert len(events.bounces) > 1
+    assert [bounce.time for bounce in events.bounces] == sorted(bounce.time for bounce in events.bounces)
+    assert events.next_bounce(first.time) is events.bounces[1]
+    assert events.next_bounce(first.time - 0.1) is first
+    assert events.wall_hits == [] and events.goal_crossings == []
+
+
+def test_ball_rolling_into_the_blue_goal():
+    prediction = predict(Vector3(100, -4000, BALL_RADIUS), Vector3(0, -2000, 0))
+    events = prediction_events(prediction)
+    goal = events.first_goal
+    assert goal.team == 0 and events.goal_into(0) is goal and events.goal_into(1) is None
+    # Interpolated between slices, so it's closer than one slice's worth of time
+    assert goal.time == pytest.approx(10.0 + (GOAL_THRESHOLD - 4000) / 2000, abs=SLICE_TIME)
+    assert goal.x == pytest.approx(100)
+    assert events.bounces == []
+    # Rolling along the ground, a grounded car can reach it the whole time
+    assert events.reachable_windows == [(0, len(prediction))]
+
+
+def test_ball_rolling_into_the_side_wall():
+    events = prediction_events(predict(Vector3(3000, 0, BALL_RADIUS), Vector3(2000, 0, 0)))
+    hit = events.wall_hits[0]
+    assert hit.time == pytest.approx(10.0 + (SIDE_WALL_X - BALL_RADIUS - 3000) / 2000, abs=2 * SLICE_TIME)
+    assert hit.x > SIDE_WALL_X - BALL_RADIUS - CONTACT_MARGIN
+    assert events.first_goal is None
+
+
+def test_events_are_only_found_once_per_prediction():
+    prediction = predict(Vector3(0, 0, 1000), Vector3(0, 0, 0))
+    assert prediction_events(prediction) is prediction_events(prediction)
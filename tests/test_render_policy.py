@@ -0,0 +1,43 @@
+import pytest
+
+from util.render_policy import RENDER_ALWAYS, RENDER_CHANGES, RENDER_DECIMATE, RENDER_OFF, RenderPolicy
+
+
+def renders(policy: RenderPolicy, ticks) -> list:
+    return [policy.should_render(labels, values) for labels, values in ticks]
+
+
+def test_always_and_off():
+    assert renders(RenderPolicy(RENDER_ALWAYS), [((), ())] * 3) == [True, True, True]
+    policy = RenderPolicy(RENDER_OFF)
+    assert not policy.enabled
+    assert renders(policy, [((), ())] * 3) == [False, False, False]
+
+
+def test_decimate_renders_the_first_tick_then_every_interval():
+    assert renders(RenderPolicy(RENDER_DECIMATE, interval=3), [((), ())] * 7) == \
+        [True, False, False, True, False, False, True]
+
+
+def test_changes_renders_when_a_label_changes_or_a_value_moves_past_the_threshold():
+    policy = RenderPolicy(RENDER_CHANGES, threshold=50)
+    assert renders(policy, [
+        (('Chase',), (0.0, 0.0)),
+        (('Chase',), (40.0, 0.0)),
+        (('Chase',), (60.0, 0.0)),
+        (('Chase',), (60.0, 0.0)),
+        (('Shoot',), (60.0, 0.0)),
+    ]) == [True, False, True, False, True]
+
+
+def test_label_and_value_functions_only_run_in_changes_mode():
+    def fail():
+        raise AssertionError('should not be called')
+
+    assert RenderPolicy(RENDER_DECIMATE).should_render(fail, fail)
+    assert RenderPolicy(RENDER_CHANGES).should_render(lambda: ('Chase',), lambda: (1.0,))
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match='Unknown render mode'):
+        RenderPolicy('sometimes')
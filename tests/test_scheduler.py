@@ -0,0 +1,54 @@
+import numpy as np
+
+import util.scheduler
+from util.scheduler import MAX_LEVEL, SLOW_DOWN_DELAY, SPEED_UP_DELAY, TaskScheduler
+
+# Game clock readings for a second of ticks at 120 Hz, rounded the way the packet's float32 rounds them
+TICKS = [float(np.float32(100 + tick / 120)) for tick in range(120)]
+
+
+def runs(scheduler: TaskScheduler, name: str, times=TICKS) -> int:
+    return sum(scheduler.due(name, now) for now in times)
+
+
+def test_tasks_run_at_their_rate():
+    scheduler = TaskScheduler(enabled=True)
+    scheduler.add('fast', 120)
+    scheduler.add('slow', 30)
+    assert runs(scheduler, 'fast') == 120
+    assert runs(scheduler, 'slow') == 30
+
+
+def test_disabled_scheduler_runs_everything_every_tick():
+    scheduler = TaskScheduler(enabled=False)
+    scheduler.add('slow', 10)
+    assert runs(scheduler, 'slow') == 120
+
+
+def test_new_key_or_clock_going_backwards_runs_early():
+    scheduler = TaskScheduler(enabled=True)
+    scheduler.add('slow', 10)
+    assert scheduler.run('slow', 100.0, lambda: 'first') == 'first'
+    assert scheduler.run('slow', 100.01, lambda: 'second') == 'first'
+    assert scheduler.run('slow', 100.02, lambda: 'third', key='kickoff') == 'third'
+    assert scheduler.run('slow', 50.0, lambda: 'fourth', key='kickoff') == 'fourth'
+
+
+def test_long_ticks_slow_tasks_down_to_their_min_rate_and_short_ones_speed_them_up(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(util.scheduler, 'perf_counter', lambda: clock[0])
+    scheduler = TaskScheduler(enabled=True, tick_budget=0.001)
+    scheduler.add('slow', 60, min_rate=20)
+
+    def ticks(count: int, seconds: float):
+        for _ in range(count):
+            scheduler.begin_tick()
+            clock[0] += seconds
+            scheduler.end_tick()
+
+    ticks(SLOW_DOWN_DELAY * (MAX_LEVEL + 2), 0.002)
+    assert scheduler.level == MAX_LEVEL
+    assert scheduler.rate('slow') == 20
+    ticks(SPEED_UP_DELAY * (MAX_LEVEL + 1), 0.0001)
+    assert scheduler.level == 0
+    assert scheduler.rate('slow') == 60
@@ -0,0 +1,46 @@
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.sequence import ControlStep, Timeline
+
+JUMP = SimpleControllerState(jump=True)
+RELEASE = SimpleControllerState(jump=False)
+FLIP = SimpleControllerState(jump=True, pitch=-1)
+# Like a front flip, with a release only one tick long
+FRONT_FLIP = Timeline([ControlStep(0.05, JUMP), ControlStep(0.005, RELEASE), ControlStep(0.1, FLIP)])
+
+
+def play(timeline: Timeline, times) -> list:
+    packet = GameTickPacket()
+    playback = timeline.play()
+    played = []
+    for time in times:
+        packet.game_info.seconds_elapsed = time
+        played.append((playback.tick(packet), playback.done))
+        if playback.done:
+            break
+    return played
+
+
+def test_each_step_gets_its_ticks_plus_one():
+    assert len(FRONT_FLIP) == 7 + 2 + 13
+    played = play(FRONT_FLIP, [10 + tick / 120 for tick in range(30)])
+    assert [controls for controls, _ in played] == [JUMP] * 7 + [RELEASE] * 2 + [FLIP] * 13
+    assert [done for _, done in played] == [False] * 21 + [True]
+
+
+def test_dropped_frames_never_skip_a_step():
+    # Six ticks in, the clock jumps past the whole release
+    times = [10 + tick / 120 for tick in range(6)] + [10 + tick / 120 for tick in range(10, 40)]
+    played = [controls for controls, _ in play(FRONT_FLIP, times)]
+    assert played == [JUMP] * 6 + [RELEASE] * 2 + [FLIP] * 13
+
+
+def test_dropped_frames_at_the_end_still_play_the_last_step():
+    played = play(FRONT_FLIP, [10.0, 10 + 1 / 120, 12.0, 12 + 1 / 120])
+    assert [controls for controls, _ in played] == [JUMP, JUMP, RELEASE, RELEASE]
+
+
+def test_a_timeline_can_be_played_again():
+    first = play(FRONT_FLIP, [10 + tick / 120 for tick in range(30)])
+    assert play(FRONT_FLIP, [50 + tick / 120 for tick in range(30)]) == first
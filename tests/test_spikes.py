@@ -0,0 +1,32 @@
+from rlbot.utils.structures.game_data_struct import GameTickPacket, Vector3
+
+from util.spikes import MAX_DISTANCE_WHEN_SPIKED, SpikeWatcher
+
+
+def make_packet(time: float, ball_y: float) -> GameTickPacket:
+    """Two cars, at y=0 and y=1000, with the ball somewhere along the line between them."""
+    packet = GameTickPacket()
+    packet.game_info.seconds_elapsed = time
+    packet.num_cars = 2
+    packet.game_cars[1].physics.location = Vector3(0, 1000, 17)
+    packet.game_ball.physics.location = Vector3(0, ball_y, 17)
+    return packet
+
+
+def test_carry_time_counts_from_when_the_ball_was_spiked():
+    watcher = SpikeWatcher()
+    watcher.read_packet(make_packet(10.0, 500))
+    assert watcher.carrying_index is None and watcher.carrying_car is None
+
+    watcher.read_packet(make_packet(11.0, MAX_DISTANCE_WHEN_SPIKED - 10))
+    watcher.read_packet(make_packet(12.5, MAX_DISTANCE_WHEN_SPIKED - 10))
+    assert watcher.carrying_index == 0
+    assert watcher.carry_duration == 1.5
+
+    # Passed to the other car, whose carry time starts over
+    watcher.read_packet(make_packet(13.0, 1000 - MAX_DISTANCE_WHEN_SPIKED + 10))
+    assert watcher.carrying_index == 1
+    assert watcher.carry_duration == 0
+
+    watcher.read_packet(make_packet(14.0, 500))
+    assert watcher.carrying_index is None and watcher.carrying_car is None
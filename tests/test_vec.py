@@ -0,0 +1,51 @@
+import math
+
+import pytest
+from rlbot.utils.structures.game_data_struct import GameTickPacket, PlayerInfo, Physics, Vector3
+
+from util.vec import Vec3, Vec3Array
+
+VECTORS = [Vec3(1, 2, 3), Vec3(-4096, 5120, 17), Vec3(0.5, -0.25, 2044), Vec3(300, 0, 0)]
+OTHERS = [Vec3(3, -1, 2), Vec3(0, -4240, 70), Vec3(-3072, -4096, 73), Vec3(0, 250, 0)]
+
+
+def assert_rows_match(array: Vec3Array, vectors):
+    assert len(array) == len(vectors)
+    for row, vector in zip(array, vectors):
+        assert (row.x, row.y, row.z) == pytest.approx((vector.x, vector.y, vector.z))
+
+
+@pytest.mark.parametrize('other', [Vec3Array.from_vec3s(OTHERS), Vec3(7, -8, 9)])
+def test_arithmetic_matches_vec3(other):
+    array = Vec3Array.from_vec3s(VECTORS)
+    others = OTHERS if isinstance(other, Vec3Array) else [other] * len(VECTORS)
+    assert_rows_match(array + other, [a + b for a, b in zip(VECTORS, others)])
+    assert_rows_match(array - other, [a - b for a, b in zip(VECTORS, others)])
+    assert_rows_match(array * 0.5, [a * 0.5 for a in VECTORS])
+    assert_rows_match(2 * array / 4, [2 * a / 4 for a in VECTORS])
+    assert_rows_match(array.cross(other), [a.cross(b) for a, b in zip(VECTORS, others)])
+    assert list(array.dot(other)) == pytest.approx([a.dot(b) for a, b in zip(VECTORS, others)])
+    assert list(array.dist(other)) == pytest.approx([a.dist(b) for a, b in zip(VECTORS, others)])
+    assert list(array.ang_to(other)) == pytest.approx([a.ang_to(b) for a, b in zip(VECTORS, others)])
+
+
+def test_ang_to_itself_is_zero_not_nan():
+    array = Vec3Array.from_vec3s(VECTORS)
+    assert not any(math.isnan(angle) for angle in array.ang_to(array))
+
+
+def test_from_ctypes_reads_car_locations_in_place():
+    packet = GameTickPacket()
+    packet.num_cars = 3
+    for i, vector in enumerate(VECTORS[:3]):
+        packet.game_cars[i].physics.location = Vector3(vector.x, vector.y, vector.z)
+    array = Vec3Array.from_ctypes(packet.game_cars, packet.num_cars,
+                                  PlayerInfo.physics.offset + Physics.location.offset)
+    assert_rows_match(array, [Vec3(car.physics.location) for car in packet.game_cars[:3]])
+
+
+def test_to_ctypes_round_trip():
+    array = Vec3Array.from_vec3s(VECTORS)
+    vectors = array.to_ctypes()
+    assert_rows_match(array, [Vec3(vector) for vector in vectors])
+    assert_rows_match(Vec3Array.from_ctypes(vectors), [Vec3(vector) for vector in vectors])
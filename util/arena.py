@@ -0,0 +1,58 @@
+import ctypes
+import hashlib
+import math
+from typing import Dict, Tuple
+
+from rlbot.utils.structures.game_data_struct import BoostPad, FieldInfoPacket, GoalInfo
+
+from util.boost_pad_table import BoostPadTable
+from util.vec import Vec3
+
+# Where the goal lines and the inside of the posts are, near enough, on standard arenas
+GOAL_LINE_Y = 5120
+GOAL_POST_X = 800
+
+
+def arena_key(field_info: FieldInfoPacket) -> str:
+    """A short hash of the boost pads and goals, which is the same for every match on the same layout."""
+    digest = hashlib.sha1()
+    digest.update(ctypes.string_at(ctypes.addressof(field_info.boost_pads),
+                                   field_info.num_boosts * ctypes.sizeof(BoostPad)))
+    digest.update(ctypes.string_at(ctypes.addressof(field_info.goals),
+                                   field_info.num_goals * ctypes.sizeof(GoalInfo)))
+    return digest.hexdigest()[:16]
+
+
+class Arena:
+    """
+    The parts of the field that don't change during a match, worked out once from the field info. Get it from
+    load_arena rather than making one, so a bot that is retired and started again in the same process (or a
+    benchmark building several) doesn't work it out again. Each bot normally runs in its own process, so nothing
+    is shared between bots. The pads and goals are small enough that they aren't kept on disk; key is there for
+    anything bigger kept in the startup cache (see util/startup_cache.py) that depends on the layout.
+    """
+
+    def __init__(self, field_info: FieldInfoPacket, key: str = None):
+        self.key = arena_key(field_info) if key is None else key
+        self.boost_pads = BoostPadTable(field_info)
+        self.goal_locations = [Vec3(goal.location) for goal in field_info.goals[:field_info.num_goals]]
+
+    def goal_location(self, team: int) -> Vec3:
+        return Vec3(self.goal_locations[team])
+
+    def goal_posts(self, team: int) -> Tuple[Vec3, Vec3]:
+        """The left (negative x) and right post of the team's goal."""
+        y = math.copysign(GOAL_LINE_Y, self.goal_locations[team].y)
+        return Vec3(-GOAL_POST_X, y, 0), Vec3(GOAL_POST_X, y, 0)
+
+
+_loaded: Dict[str, Arena] = {}
+
+
+def load_arena(field_info: FieldInfoPacket) -> Arena:
+    """Returns the Arena for this field info. Each layout is only worked out once per process."""
+    key = arena_key(field_info)
+    arena = _loaded.get(key)
+    if arena is None:
+        arena = _loaded[key] = Arena(field_info, key)
+    return arena
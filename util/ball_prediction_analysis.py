@@ -1,21 +1,127 @@
-from typing import Callable
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
 
+from util.prediction_arrays import BallPredictionArrays
+
 # field length(5120) + ball radius(93) = 5213 however that results in false positives
 GOAL_THRESHOLD = 5235
 
 # We will jump this number of frames when looking for a moment where the ball is inside the goal.
 # Big number for efficiency, but not so big that the ball could go in and then back out during that
 # time span. Unit is the number of frames in the ball prediction, and the prediction is at 60 frames per second.
+# Only used when predict_future_goal is given a plain BallPrediction; with BallPredictionArrays every slice is checked.
 GOAL_SEARCH_INCREMENT = 20
 
+# All of these take either a BallPrediction or a BallPredictionArrays. The arrays are faster, and anything
+# expensive gets remembered in their memo, so pass them in when you have them.
+Prediction = Union[BallPrediction, BallPredictionArrays]
+
+
+def as_arrays(ball_prediction: Prediction) -> BallPredictionArrays:
+    if isinstance(ball_prediction, BallPredictionArrays):
+        return ball_prediction
+    return BallPredictionArrays(ball_prediction)
+
+
+class SlicePredicate:
+    """
+    A condition on ball prediction slices that gets checked on every slice at once. mask returns one bool per
+    slice. Predicates can be combined with & (and), | (or) and ~ (not), e.g.
+
+    height_below(200) & inside_box((-900, 4000, 0), (900, 5300, 700))
+    """
+
+    def mask(self, prediction: BallPredictionArrays) -> np.ndarray:
+        raise NotImplementedError
+
+    def __and__(self, other: 'SlicePredicate') -> 'SlicePredicate':
+        return CustomPredicate(lambda p: self.mask(p) & other.mask(p))
+
+    def __or__(self, other: 'SlicePredicate') -> 'SlicePredicate':
+        return CustomPredicate(lambda p: self.mask(p) | other.mask(p))
+
+    def __invert__(self) -> 'SlicePredicate':
+        return CustomPredicate(lambda p: ~self.mask(p))
+
+
+class CustomPredicate(SlicePredicate):
+    """Wraps a function that takes BallPredictionArrays and returns a bool mask with one entry per slice."""
+
+    def __init__(self, function: Callable[[BallPredictionArrays], np.ndarray]):
+        self.function = function
+
+    def mask(self, prediction: BallPredictionArrays) -> np.ndarray:
+        return self.function(prediction)
+
+
+def height_below(z: float) -> SlicePredicate:
+    return CustomPredicate(lambda p: p.positions[:, 2] < z)
+
+
+def height_above(z: float) -> SlicePredicate:
+    return CustomPredicate(lambda p: p.positions[:, 2] > z)
+
+
+def beyond_y(y: float) -> SlicePredicate:
+    """The ball is at least this far from the middle of the field, towards either goal."""
+    return CustomPredicate(lambda p: np.abs(p.positions[:, 1]) >= y)
 
-def find_slice_at_time(ball_prediction: BallPrediction, game_time: float):
+
+def inside_box(low: Sequence[float], high: Sequence[float]) -> SlicePredicate:
+    """The ball's center is inside the box with corners low = (x, y, z) and high = (x, y, z), edges included."""
+    def mask(p: BallPredictionArrays) -> np.ndarray:
+        result = (p.positions[:, 0] >= low[0]) & (p.positions[:, 0] <= high[0])
+        result &= (p.positions[:, 1] >= low[1]) & (p.positions[:, 1] <= high[1])
+        result &= (p.positions[:, 2] >= low[2]) & (p.positions[:, 2] <= high[2])
+        return result
+    return CustomPredicate(mask)
+
+
+def speed_below(speed: float) -> SlicePredicate:
+    return CustomPredicate(lambda p: np.einsum('ij,ij->i', p.velocities, p.velocities) < speed * speed)
+
+
+def speed_above(speed: float) -> SlicePredicate:
+    return CustomPredicate(lambda p: np.einsum('ij,ij->i', p.velocities, p.velocities) > speed * speed)
+
+
+def time_between(start: float, end: float) -> SlicePredicate:
+    """The slice's game time is from start up to and including end."""
+    return CustomPredicate(lambda p: (p.times >= start) & (p.times <= end))
+
+
+def first_index(ball_prediction: Prediction, predicate: SlicePredicate, start_index: int = 0) -> Optional[int]:
+    """Returns the index of the first slice at or after start_index that matches, or None. Every slice is checked."""
+    mask = predicate.mask(as_arrays(ball_prediction))[start_index:]
+    if not mask.any():
+        return None
+    return start_index + int(np.argmax(mask))
+
+
+def matching_windows(ball_prediction: Prediction, predicate: SlicePredicate) -> List[Tuple[int, int]]:
+    """
+    Returns every run of consecutive matching slices as (first index, index after the last), so
+    range(*window) goes over the slices in it.
+    """
+    mask = predicate.mask(as_arrays(ball_prediction))
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+
+GOAL_PREDICATE = beyond_y(GOAL_THRESHOLD)
+
+
+def find_slice_at_time(ball_prediction: Prediction, game_time: float):
     """
     This will find the future position of the ball at the specified time. The returned
     Slice object will also include the ball's velocity, etc.
     """
+    if isinstance(ball_prediction, BallPredictionArrays):
+        index = ball_prediction.index_at_time(game_time)
+        return ball_prediction.slice(index) if index is not None else None
+
     start_time = ball_prediction.slices[0].game_seconds
     approx_index = int((game_time - start_time) * 60)  # We know that there are 60 slices per second.
     if 0 <= approx_index < ball_prediction.num_slices:
@@ -23,22 +129,38 @@ def find_slice_at_time(ball_prediction: BallPrediction, game_time: float):
     return None
 
 
-def predict_future_goal(ball_prediction: BallPrediction):
+def predict_future_goal(ball_prediction: Prediction):
     """
     Analyzes the ball prediction to see if the ball will enter one of the goals. Only works on standard arenas.
     Will return the first ball slice which appears to be inside the goal, or None if it does not enter a goal.
     """
+    if isinstance(ball_prediction, BallPredictionArrays):
+        if 'goal_index' not in ball_prediction.memo:
+            ball_prediction.memo['goal_index'] = first_index(ball_prediction, GOAL_PREDICATE)
+        index = ball_prediction.memo['goal_index']
+        return ball_prediction.slice(index) if index is not None else None
+
     return find_matching_slice(ball_prediction, 0, lambda s: abs(s.physics.location.y) >= GOAL_THRESHOLD,
-                               search_increment=20)
+                               search_increment=GOAL_SEARCH_INCREMENT)
 
 
-def find_matching_slice(ball_prediction: BallPrediction, start_index: int, predicate: Callable[[Slice], bool],
-                        search_increment=1):
+def find_matching_slice(ball_prediction: Prediction, start_index: int,
+                        predicate: Union[SlicePredicate, Callable[[Slice], bool]], search_increment=1):
     """
     Tries to find the first slice in the ball prediction which satisfies the given predicate. For example,
     you could find the first slice below a certain height. Will skip ahead through the packet by search_increment
     for better efficiency, then backtrack to find the exact first slice.
+
+    If the predicate is a SlicePredicate, every slice is checked at once instead and search_increment is ignored.
     """
+    if isinstance(predicate, SlicePredicate):
+        arrays = as_arrays(ball_prediction)
+        index = first_index(arrays, predicate, start_index)
+        return arrays.slice(index) if index is not None else None
+
+    if isinstance(ball_prediction, BallPredictionArrays):
+        ball_prediction = ball_prediction.ball_prediction
+
     for coarse_index in range(start_index, ball_prediction.num_slices, search_increment):
         if predicate(ball_prediction.slices[coarse_index]):
             for j in range(max(start_index, coarse_index - search_increment), coarse_index):
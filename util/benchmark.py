@@ -0,0 +1,297 @@
+"""
+Times the helpers in util/ and a full MyBot.get_output on made-up packets, with no game running. Run it from the
+bot's folder:
+
+    python -m util.benchmark --save before.json
+    (make a change)
+    python -m util.benchmark --baseline before.json
+
+Each benchmark is run in batches big enough to take a measurable amount of time, several times over, with the
+garbage collector off. The fastest batch is what gets compared, since anything slower than that was the machine
+doing something else. With --baseline, anything that got more than --threshold slower is flagged and the exit
+code is 1, so it can be used in a script.
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import timeit
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.ball_prediction_analysis import find_matching_slice, height_below, predict_future_goal
+from util.boost_pad_tracker import BoostPadTracker
+from util.car_table import CarTable
+from util.headless import STANDARD_BOOST_PADS, simple_prediction, standard_field_info
+from util.intercept import find_intercept
+from util.motion_tables import load_motion_tables
+from util.orientation import Orientation, orientation_of, relative_location, relative_locations
+from util.prediction_arrays import BallPredictionArrays
+from util.replay import NullRenderer
+from util.sequence import ControlStep, Sequence, Timeline
+from util.spikes import SpikeWatcher
+from util.tick_state import TickState
+from util.vec import Vec3
+
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 0.15
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    loops: int  # Calls per timed batch
+    best: float  # Seconds per call in the fastest batch
+    median: float  # Seconds per call in the median batch
+
+
+def random_packet(rng: random.Random, game_time: float, num_cars: int = 2) -> GameTickPacket:
+    """A packet with the cars (1v1 by default), ball and boost pads in random places."""
+    packet = GameTickPacket()
+    packet.num_cars = num_cars
+    for i in range(num_cars):
+        car = packet.game_cars[i]
+        car.team = i % 2
+        car.physics.location.x, car.physics.location.y, car.physics.location.z = \
+            rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), 17
+        car.physics.velocity.x, car.physics.velocity.y = rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)
+        car.physics.rotation.yaw = rng.uniform(-math.pi, math.pi)
+        car.has_wheel_contact = True
+        car.boost = rng.randint(0, 100)
+    ball = packet.game_ball.physics
+    ball.location.x, ball.location.y, ball.location.z = rng.uniform(-4000, 4000), rng.uniform(-5000, 5000), 93
+    ball.velocity.x, ball.velocity.y, ball.velocity.z = \
+        rng.uniform(-2000, 2000), rng.uniform(-3000, 3000), rng.uniform(0, 800)
+    packet.num_boost = len(STANDARD_BOOST_PADS)
+    for i in range(packet.num_boost):
+        packet.game_boosts[i].is_active = rng.random() < 0.7
+        packet.game_boosts[i].timer = 0 if packet.game_boosts[i].is_active else rng.uniform(0, 4)
+    packet.game_info.seconds_elapsed = game_time
+    packet.game_info.is_round_active = True
+    return packet
+
+
+def _cycle(items: list) -> Callable[[], object]:
+    # Hands out the items in order, over and over, so repeated calls don't all see the same input.
+    state = {'i': 0}
+
+    def next_item():
+        i = state['i']
+        state['i'] = (i + 1) % len(items)
+        return items[i]
+    return next_item
+
+
+def build_benchmarks(seed: int = 0) -> Dict[str, Callable[[], object]]:
+    """Returns benchmark name -> a function to time. Everything they need is set up here, outside the timing."""
+    rng = random.Random(seed)
+    field_info = standard_field_info()
+    packets = [random_packet(rng, 10 + i / 120) for i in range(120)]
+    predictions = [simple_prediction(p.game_ball.physics, p.game_info.seconds_elapsed) for p in packets]
+    packet, prediction = packets[0], predictions[0]
+    arrays = BallPredictionArrays(prediction)
+
+    a, b = Vec3(packet.game_cars[0].physics.location), Vec3(packet.game_ball.physics.location)
+    rotation = packet.game_cars[0].physics.rotation
+    ori = Orientation(rotation)
+    targets = np.array([(x, y, z) for x, y, z, _ in STANDARD_BOOST_PADS], dtype=np.float64)
+
+    tracker = BoostPadTracker()
+    tracker.initialize_boosts(field_info)
+    tracker.update_boost_status(packet)
+    next_packet = _cycle(packets)
+
+    def boost_search():
+        p = next_packet()
+        tracker.update_boost_status(p)
+        state = TickState(p, 0)
+        available = tracker.available_on_arrival(state.car_location, state.car_speed, p.game_info.seconds_elapsed)
+        return tracker.table.nearest_in_cones(state.car_location, state.car_orientation, available)
+
+    from bot import MyBot, triangle
+    goal, left_post, right_post = Vec3(0, 5120, 321.3), Vec3(-800, 5120, 0), Vec3(800, 5120, 0)
+
+    def tick_state_triangle():
+        state = TickState(packet, 0)
+        state.set_point('opp_goal', goal)
+        state.set_point('ball_path', b)
+        return triangle(state, 'opp_goal', left_post, right_post)
+
+    sequence_packets = [random_packet(rng, 10 + i / 120) for i in range(40)]
+    controls = SimpleControllerState()
+
+    def play_sequence():
+        # A typical flip: three short steps, played out until the sequence says it's done.
+        sequence = Sequence([ControlStep(0.05, controls), ControlStep(0.05, controls), ControlStep(0.1, controls)])
+        for p in sequence_packets:
+            sequence.tick(p)
+            if sequence.done:
+                break
+        return sequence
+
+    flip = Timeline([ControlStep(0.05, controls), ControlStep(0.05, controls), ControlStep(0.1, controls)])
+
+    def play_timeline():
+        playback = flip.play()
+        for p in sequence_packets:
+            playback.tick(p)
+            if playback.done:
+                break
+        return playback
+
+    # A 4v4 lobby, where looping over the cars in Python starts to add up
+    lobby = random_packet(rng, 10, num_cars=8)
+    lobby_ball = Vec3(lobby.game_ball.physics.location)
+    spike_watcher = SpikeWatcher()
+
+    def nearest_opponent():
+        cars = CarTable(lobby)
+        return cars.location(cars.nearest_opponent(0, lobby_ball))
+
+    def spike_check():
+        cars = CarTable(lobby)
+        spike_watcher.read_packet(lobby, cars)
+        return cars.teammates_by_distance(0)
+
+    # The tables are only loaded (or built, the first time) by the benchmarks that use them, on their untimed
+    # first call. After that load_motion_tables is a dictionary lookup.
+    local = relative_location(a, ori, b)
+    local_targets = relative_locations(a, ori, targets)
+    speed = Vec3(packet.game_cars[0].physics.velocity).length()
+
+    bot = MyBot('Benchmark', 0, 0)
+    bot_inputs = {'prediction': predictions[0]}
+    bot._register_field_info(lambda: field_info)
+    bot._register_ball_prediction_struct(lambda: bot_inputs['prediction'])
+    bot._set_renderer(NullRenderer())
+    bot.initialize_agent()
+    next_tick = _cycle(list(zip(packets, predictions)))
+
+    def get_output():
+        p, bot_inputs['prediction'] = next_tick()
+        return bot.get_output(p)
+
+    return {
+        'Vec3 add/sub/scale': lambda: (a + b - a) * 0.5,
+        'Vec3.dist': lambda: a.dist(b),
+        'Vec3.dot/cross': lambda: (a.dot(b), a.cross(b)),
+        'Vec3.normalized': lambda: a.normalized(),
+        'Orientation()': lambda: Orientation(rotation),
+        'orientation_of (cached)': lambda: orientation_of(rotation),
+        'relative_location': lambda: relative_location(a, ori, b),
+        'relative_locations x34': lambda: relative_locations(a, ori, targets),
+        'BallPredictionArrays()': lambda: BallPredictionArrays(prediction),
+        'find_matching_slice (lambda)': lambda: find_matching_slice(prediction, 0, lambda s: s.physics.location.z < 100),
+        'find_matching_slice (predicate)': lambda: find_matching_slice(arrays, 0, height_below(100)),
+        'predict_future_goal (struct)': lambda: predict_future_goal(prediction),
+        'predict_future_goal (new arrays)': lambda: predict_future_goal(BallPredictionArrays(prediction)),
+        'find_intercept': lambda: find_intercept(arrays, a, ori, Vec3(packet.game_cars[0].physics.velocity), 50,
+                                                 packet.game_info.seconds_elapsed),
+        'MotionTables.time_to_reach': lambda: load_motion_tables().time_to_reach(local.x, local.y, speed),
+        'MotionTables.times_to_reach x34': lambda: load_motion_tables().times_to_reach(local_targets[:, 0],
+                                                                                      local_targets[:, 1], speed),
+        'TickState': lambda: TickState(packet, 0),
+        'TickState + triangle': tick_state_triangle,
+        'boost search': boost_search,
+        'CarTable + nearest opponent (8 cars)': nearest_opponent,
+        'CarTable + spikes + teammates (8 cars)': spike_check,
+        'Sequence.tick (3 step flip)': play_sequence,
+        'Timeline playback (3 step flip)': play_timeline,
+        'MyBot.get_output': get_output,
+    }
+
+
+def time_benchmark(name: str, function: Callable[[], object], repeat: int = DEFAULT_REPEAT) -> BenchmarkResult:
+    # Once untimed first, so anything the benchmark sets up on its first call isn't counted
+    function()
+    timer = timeit.Timer(function)
+    # Enough calls per batch for the batch to take at least 0.2 seconds, so timer resolution doesn't matter.
+    loops, _ = timer.autorange()
+    per_call = [total / loops for total in timer.repeat(repeat=repeat, number=loops)]
+    return BenchmarkResult(name, loops, min(per_call), statistics.median(per_call))
+
+
+def run_benchmarks(name_filter: str = None, repeat: int = DEFAULT_REPEAT) -> List[BenchmarkResult]:
+    results = []
+    for name, function in build_benchmarks().items():
+        if name_filter and name_filter.lower() not in name.lower():
+            continue
+        results.append(time_benchmark(name, function, repeat))
+    return results
+
+
+def save_results(path: str, results: List[BenchmarkResult]):
+    document = {
+        'version': RESULTS_VERSION,
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'results': {result.name: asdict(result) for result in results},
+    }
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=2)
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    with open(path) as file:
+        document = json.load(file)
+    if document.get('version') != RESULTS_VERSION:
+        raise ValueError(f'{path} has benchmark results version {document.get("version")}, '
+                         f'expected {RESULTS_VERSION}')
+    return {name: BenchmarkResult(**result) for name, result in document['results'].items()}
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.3f} ms'
+    return f'{seconds * 1e6:.2f} us'
+
+
+def report(results: List[BenchmarkResult], baseline: Optional[Dict[str, BenchmarkResult]] = None,
+           threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Prints a table of the results, and returns the names of the benchmarks that regressed against baseline."""
+    regressions = []
+    width = max(len(result.name) for result in results) if results else 0
+    for result in results:
+        line = f'{result.name:<{width}}  best {_format_time(result.best):>11}  median {_format_time(result.median):>11}'
+        old = baseline.get(result.name) if baseline else None
+        if old is not None:
+            change = result.best / old.best - 1
+            line += f'  {change:+7.1%} vs baseline'
+            if change > threshold:
+                line += '  REGRESSION'
+                regressions.append(result.name)
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark util/ and MyBot.get_output with no game running.')
+    parser.add_argument('--filter', help='Only run benchmarks with this in their name')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed batches per benchmark')
+    parser.add_argument('--save', help='Write the results to this json file')
+    parser.add_argument('--baseline', help='Compare against results saved earlier with --save')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Flag benchmarks that got more than this much slower, e.g. 0.15 for 15%%')
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline) if args.baseline else None
+    results = run_benchmarks(args.filter, args.repeat)
+    regressions = report(results, baseline, args.threshold)
+    if args.save:
+        save_results(args.save, results)
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
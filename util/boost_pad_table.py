@@ -0,0 +1,79 @@
+import ctypes
+from typing import Optional, Tuple
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import FieldInfoPacket, GameTickPacket, BoostPadState
+
+from util.orientation import Orientation, relative_locations
+from util.vec import Vec3
+
+# What the nearest boost is when there isn't one. It's so far away that it never wins a distance check.
+NO_PAD_LOCATION = Vec3(0, 0, 999999)
+
+# Lets numpy read packet.game_boosts in place, without copying it into Python objects first.
+BOOST_STATE_DTYPE = np.dtype({'names': ['is_active', 'timer'], 'formats': ['?', '<f4'],
+                              'offsets': [BoostPadState.is_active.offset, BoostPadState.timer.offset],
+                              'itemsize': ctypes.sizeof(BoostPadState)})
+
+
+def boost_states(packet: GameTickPacket) -> np.ndarray:
+    """Returns a structured array with is_active and timer fields that looks straight at the packet's memory."""
+    return np.frombuffer(packet.game_boosts, dtype=BOOST_STATE_DTYPE, count=packet.num_boost)
+
+
+class BoostPadTable:
+    """
+    The location and size of every boost pad, kept in arrays so that questions about all of the pads can be
+    answered with a few numpy operations instead of a Python loop. Build it once in initialize_agent.
+    """
+
+    def __init__(self, field_info: FieldInfoPacket):
+        count = field_info.num_boosts
+        self.locations = np.array([(pad.location.x, pad.location.y, pad.location.z)
+                                   for pad in field_info.boost_pads[:count]], dtype=np.float64).reshape(count, 3)
+        self.is_full = np.array([pad.is_full_boost for pad in field_info.boost_pads[:count]], dtype=bool)
+
+    def __len__(self):
+        return len(self.is_full)
+
+    def location(self, index: Optional[int]) -> Vec3:
+        """Returns the location of the pad at index, or NO_PAD_LOCATION if index is None."""
+        if index is None:
+            return Vec3(NO_PAD_LOCATION)
+        return Vec3(*self.locations[index])
+
+    def nearest_in_cones(self, car_location: Vec3, car_orientation: Orientation, is_active: np.ndarray,
+                         big_cone: float = 60, small_cone: float = 30) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Finds the index of the nearest active big pad within big_cone degrees of the car's nose, and the nearest
+        active small pad within small_cone degrees. Pads behind the car never count. Either can be None.
+        All the pads are moved into the car's frame in one go, and then each size is a masked argmin.
+        """
+        count = len(self.is_full)
+        if count == 0:
+            return None, None
+        locations = self.locations
+        # Same operations, in the same order, as Vec3.dist and relative_location, so the results match exactly.
+        dx = car_location.x - locations[:, 0]
+        dy = car_location.y - locations[:, 1]
+        dz = car_location.z - locations[:, 2]
+        distances = np.sqrt(dx * dx + dy * dy + dz * dz)
+
+        relative = relative_locations(car_location, car_orientation, locations)
+        forward_amount = relative[:, 0]
+        right_amount = relative[:, 1]
+        in_front = forward_amount > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            angles = np.abs(np.arctan(right_amount / forward_amount) * 180 / np.pi)
+
+        candidates = in_front & is_active[:count] & (distances < car_location.dist(NO_PAD_LOCATION))
+        big = candidates & self.is_full & (angles < big_cone)
+        small = candidates & ~self.is_full & (angles < small_cone)
+        return self._nearest(big, distances), self._nearest(small, distances)
+
+    @staticmethod
+    def _nearest(mask: np.ndarray, distances: np.ndarray) -> Optional[int]:
+        if not mask.any():
+            return None
+        # argmin picks the first of equal distances, which is what the old loop did too.
+        return int(np.argmin(np.where(mask, distances, np.inf)))
@@ -1,10 +1,22 @@
 from dataclasses import dataclass
-from typing import List
+from typing import List, Tuple
 
+import numpy as np
 from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket
 
+from util.boost_pad_table import BoostPadTable, boost_states
 from util.vec import Vec3
 
+NO_PADS = np.zeros(0, dtype=np.intp)
+NO_PADS.flags.writeable = False
+
+# How many seconds a pad stays empty after it's picked up, on standard arenas.
+BIG_PAD_RESPAWN_TIME = 10
+SMALL_PAD_RESPAWN_TIME = 4
+
+# Used when guessing when we'll reach a pad, so that a car that's standing still doesn't think it will take forever.
+MIN_ARRIVAL_SPEED = 1000
+
 
 @dataclass
 class BoostPad:
@@ -14,30 +26,128 @@ class BoostPad:
     timer: float  # Counts the number of seconds that the pad has been *inactive*
 
 
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
 class BoostPadTracker:
     """
     This class merges together the boost pad location info with the is_active info so you can access it
-    in one convenient list. For it to function correctly, you need to call initialize_boosts once when the
+    in one convenient place. For it to function correctly, you need to call initialize_boosts once when the
     game has started, and then update_boost_status every frame so that it knows which pads are active.
+
+    Everything is kept in arrays indexed by pad: locations, is_full, is_active and timer. They are read-only
+    views that get updated in place, so it's fine to hang on to them. After each update, taken and respawned
+    hold the indices of the pads that changed state since the previous frame.
+
+    When a pad is taken, the game time it will come back is worked out from its respawn time and its timer, so
+    respawn_times always says when each pad will be active again without rescanning the timers.
     """
 
     def __init__(self):
-        self.boost_pads: List[BoostPad] = []
+        self.table: BoostPadTable = None
+        self._is_active = np.zeros(0, dtype=bool)
+        self._timer = np.zeros(0, dtype=np.float32)
+        self.locations = _read_only(np.zeros((0, 3)))
+        self.is_full = _read_only(np.zeros(0, dtype=bool))
+        self.is_active = _read_only(self._is_active)
+        self.timer = _read_only(self._timer)
+        self.taken = NO_PADS
+        self.respawned = NO_PADS
+        self._has_status = False
+        self._respawn_durations = np.zeros(0)
+        self._respawn_times = np.zeros(0)
+        self.respawn_times = _read_only(self._respawn_times)
+        self._boost_pads: List[BoostPad] = []
         self._full_boosts_only: List[BoostPad] = []
+        self._full_boost_indices: List[int] = []
 
-    def initialize_boosts(self, game_info: FieldInfoPacket):
-        raw_boosts = [game_info.boost_pads[i] for i in range(game_info.num_boosts)]
-        self.boost_pads: List[BoostPad] = [BoostPad(Vec3(rb.location), rb.is_full_boost, False, 0) for rb in raw_boosts]
+    def initialize_boosts(self, game_info: FieldInfoPacket, table: BoostPadTable = None):
+        """Pass in table if there's already one for this field info, e.g. Arena.boost_pads, to share it."""
+        self.table = BoostPadTable(game_info) if table is None else table
+        count = len(self.table)
+        self._is_active = np.zeros(count, dtype=bool)
+        self._timer = np.zeros(count, dtype=np.float32)
+        self.locations = _read_only(self.table.locations)
+        self.is_full = _read_only(self.table.is_full)
+        self.is_active = _read_only(self._is_active)
+        self.timer = _read_only(self._timer)
+        self.taken = NO_PADS
+        self.respawned = NO_PADS
+        self._has_status = False
+        self._respawn_durations = np.where(self.table.is_full, BIG_PAD_RESPAWN_TIME, SMALL_PAD_RESPAWN_TIME)
+        self._respawn_times = np.zeros(count)
+        self.respawn_times = _read_only(self._respawn_times)
+        self._boost_pads = [BoostPad(Vec3(*location), bool(is_full), False, 0)
+                            for location, is_full in zip(self.table.locations, self.table.is_full)]
         # Cache the list of full boosts since they're commonly requested.
         # They reference the same objects in the boost_pads list.
-        self._full_boosts_only: List[BoostPad] = [bp for bp in self.boost_pads if bp.is_full_boost]
+        self._full_boost_indices = [i for i, bp in enumerate(self._boost_pads) if bp.is_full_boost]
+        self._full_boosts_only = [self._boost_pads[i] for i in self._full_boost_indices]
 
     def update_boost_status(self, packet: GameTickPacket):
-        for i in range(packet.num_boost):
-            our_pad = self.boost_pads[i]
-            packet_pad = packet.game_boosts[i]
-            our_pad.is_active = packet_pad.is_active
-            our_pad.timer = packet_pad.timer
+        count = min(len(self._is_active), packet.num_boost)
+        states = boost_states(packet)[:count]
+        new_active = states['is_active']
+        changed = new_active != self._is_active[:count]
+        if self._has_status and changed.any():
+            self.taken = np.flatnonzero(changed & ~new_active)
+            self.respawned = np.flatnonzero(changed & new_active)
+        else:
+            # On the first frame every active pad would look like it just respawned, so report nothing.
+            self.taken = NO_PADS
+            self.respawned = NO_PADS
+        self._is_active[:count] = new_active
+        self._timer[:count] = states['timer']
+
+        now = packet.game_info.seconds_elapsed
+        # Pads that are already empty the first time we look are scheduled the same way as pads taken later.
+        newly_empty = self.taken if self._has_status else np.flatnonzero(~new_active)
+        for i in newly_empty:
+            self._respawn_times[i] = now + self._respawn_durations[i] - self._timer[i]
+        if len(self.respawned):
+            self._respawn_times[self.respawned] = now
+        # A packet without every pad (e.g. num_boost is still 0 while the match loads) doesn't count, so the first
+        # full one still schedules the pads that are empty and doesn't report the rest as respawned.
+        self._has_status = self._has_status or count == len(self._is_active)
+
+    def available_on_arrival(self, car_location: Vec3, speed: float, now: float) -> np.ndarray:
+        """
+        Returns a mask of the pads that will be active by the time we get there, driving straight at them at
+        the given speed. Active pads count even though somebody else might grab them first.
+        """
+        return available_on_arrival(self.table, self._is_active, self._respawn_times, car_location, speed, now)
+
+    def status_snapshot(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copies of (is_active, respawn_times), for code running on another thread while this keeps being updated.
+        Hand them to available_on_arrival along with the table.
+        """
+        return self._is_active.copy(), self._respawn_times.copy()
+
+    @property
+    def boost_pads(self) -> List[BoostPad]:
+        """The pads as BoostPad objects, for code that prefers them over the arrays. Slower than the arrays."""
+        self._copy_status(range(len(self._boost_pads)))
+        return self._boost_pads
 
     def get_full_boosts(self) -> List[BoostPad]:
+        self._copy_status(self._full_boost_indices)
         return self._full_boosts_only
+
+    def _copy_status(self, indices):
+        # The BoostPad objects only get brought up to date when somebody asks for them.
+        for i in indices:
+            pad = self._boost_pads[i]
+            pad.is_active = bool(self._is_active[i])
+            pad.timer = float(self._timer[i])
+
+
+def available_on_arrival(table: BoostPadTable, is_active: np.ndarray, respawn_times: np.ndarray,
+                         car_location: Vec3, speed: float, now: float) -> np.ndarray:
+    """BoostPadTracker.available_on_arrival, for a status_snapshot."""
+    arrival_times = now + np.linalg.norm(table.locations - (car_location.x, car_location.y, car_location.z),
+                                         axis=1) / max(speed, MIN_ARRIVAL_SPEED)
+    return is_active | (respawn_times <= arrival_times)
@@ -0,0 +1,85 @@
+import ctypes
+import math
+from typing import Optional
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket, Physics, PlayerInfo
+
+from util.vec import Vec3
+
+# Lets numpy read packet.game_cars in place, without going through a PlayerInfo object per car.
+CAR_STATE_DTYPE = np.dtype({
+    'names': ['location', 'velocity', 'is_demolished', 'has_wheel_contact', 'team', 'boost'],
+    'formats': [('<f4', 3), ('<f4', 3), '?', '?', 'u1', '<i4'],
+    'offsets': [PlayerInfo.physics.offset + Physics.location.offset,
+                PlayerInfo.physics.offset + Physics.velocity.offset,
+                PlayerInfo.is_demolished.offset, PlayerInfo.has_wheel_contact.offset,
+                PlayerInfo.team.offset, PlayerInfo.boost.offset],
+    'itemsize': ctypes.sizeof(PlayerInfo)})
+
+
+def car_states(packet: GameTickPacket) -> np.ndarray:
+    """Returns a structured array of CAR_STATE_DTYPE that looks straight at the packet's memory."""
+    return np.frombuffer(packet.game_cars, dtype=CAR_STATE_DTYPE, count=packet.num_cars)
+
+
+class CarTable:
+    """
+    Every car in one packet as arrays, indexed the same way as packet.game_cars, so questions about all of the
+    cars (who's closest to the ball, which teammates are near us, ...) are a few numpy operations instead of a
+    Python loop. The packet is copied, so the table stays the same even after the framework reuses the packet.
+    Make a new one every tick, or get it from TickState.cars.
+    """
+
+    def __init__(self, packet: GameTickPacket):
+        states = car_states(packet)
+        self.count = len(states)
+        self.locations = states['location'].astype(np.float64)
+        self.velocities = states['velocity'].astype(np.float64)
+        self.teams = states['team'].copy()
+        self.boosts = states['boost'].copy()
+        self.has_wheel_contact = states['has_wheel_contact'].copy()
+        self.is_demolished = states['is_demolished'].copy()
+
+    def __len__(self):
+        return self.count
+
+    def location(self, index: int) -> Vec3:
+        return Vec3(*self.locations[index].tolist())
+
+    def distances_to(self, point: Vec3) -> np.ndarray:
+        """The distance from every car to the point."""
+        return np.sqrt(self._squared_distances_to(point))
+
+    def _squared_distances_to(self, point: Vec3) -> np.ndarray:
+        # Good enough for finding the closest car, and skips a square root per car.
+        offsets = self.locations - (point.x, point.y, point.z)
+        return (offsets * offsets).sum(axis=1)
+
+    def nearest_opponent(self, team: int, point: Vec3) -> Optional[int]:
+        """The index of the car not on the given team that's closest to the point, or None if there isn't one."""
+        if self.count == 0:
+            return None
+        squared_distances = self._squared_distances_to(point)
+        squared_distances[self.teams == team] = np.inf
+        nearest = int(squared_distances.argmin())
+        return nearest if squared_distances[nearest] != np.inf else None
+
+    def teammates_by_distance(self, index: int, point: Vec3 = None) -> np.ndarray:
+        """
+        The indices of the other cars on the same team as the car at index, closest to the point first. The point
+        is that car's location if it isn't given.
+        """
+        teammates = np.flatnonzero(self.teams == self.teams[index])
+        teammates = teammates[teammates != index]
+        if point is None:
+            point = self.location(index)
+        return teammates[np.argsort(self._squared_distances_to(point)[teammates], kind='stable')]
+
+    def nearest_within(self, point: Vec3, max_distance: float) -> Optional[int]:
+        """The index of the car closest to the point, if it's closer than max_distance. Otherwise None."""
+        if self.count == 0:
+            return None
+        squared_distances = self._squared_distances_to(point)
+        nearest = int(squared_distances.argmin())
+        return nearest if math.sqrt(squared_distances[nearest]) < max_distance else None
@@ -2,7 +2,7 @@ import math
 
 from rlbot.utils.structures.game_data_struct import PlayerInfo
 
-from util.orientation import Orientation, relative_location
+from util.orientation import orientation_of, relative_location
 from util.vec import Vec3
 
 
@@ -46,17 +46,17 @@ def limit_to_safe_range_yaw(value: float) -> float:
 
 
 def steer_toward_target(car: PlayerInfo, target: Vec3) -> float:
-    relative = relative_location(Vec3(car.physics.location), Orientation(car.physics.rotation), target)
+    relative = relative_location(Vec3(car.physics.location), orientation_of(car.physics.rotation), target)
     angle = math.atan2(relative.y, relative.x)
     return limit_to_safe_range(angle * 5)
 
 # I added these
 def pitch_toward_target(car: PlayerInfo, target: Vec3) -> float:
-    relative = relative_location(Vec3(car.physics.location), Orientation(car.physics.rotation), target)
+    relative = relative_location(Vec3(car.physics.location), orientation_of(car.physics.rotation), target)
     angle = math.atan2(relative.z, relative.y)
     return limit_to_safe_range_pitch(angle * 5)
 
 def yaw_toward_target(car: PlayerInfo, target: Vec3) -> float:
-    relative = relative_location(Vec3(car.physics.location), Orientation(car.physics.rotation), target)
+    relative = relative_location(Vec3(car.physics.location), orientation_of(car.physics.rotation), target)
     angle = math.atan2(relative.y, relative.x)
     return limit_to_safe_range_yaw(angle * 5)
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Picking a behavior takes a lot of information (the nearest boost pads, the opponent closest to the ball, the
+shooting triangles, ...), but whichever rule wins only needs a little of it. Features are worked out the first
+time a rule asks for them and kept for the rest of the tick, and the rules are checked from most to least
+important, so once one matches nothing below it is looked at.
+
+    class MyFeatures(Features):
+        points = {'big_boost': 'nearest_big_boost'}
+
+        @feature
+        def nearest_big_boost(self) -> Vec3:
+            ...
+
+    rules = [Rule('Get big boost', lambda f: f.dist('car', 'big_boost') < 1000)]
+    behavior = choose_behavior(rules, MyFeatures(state), default='Ballchase')
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from util.tick_state import TickState
+from util.vec import Vec3
+
+
+class feature:
+    """
+    Like @property, except the function only runs the first time. After that the value is stored on the
+    instance, so later lookups are as cheap as reading any other attribute.
+    """
+
+    def __init__(self, function: Callable):
+        self.function = function
+        self.name = function.__name__
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.function(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+class Features:
+    """
+    The features for one tick. Subclasses add them as @feature methods, and make a new instance every tick.
+
+    points maps a TickState point name to the feature that provides its location. dist() adds those points to
+    the state the first time they're needed, so a rule can compare distances to a point nobody has worked out yet.
+    """
+    points: Dict[str, str] = {}
+
+    def __init__(self, state: TickState):
+        self.state = state
+
+    def point(self, name: str) -> Vec3:
+        location = self.state.points.get(name)
+        if location is None:
+            location = getattr(self, self.points[name])
+            self.state.set_point(name, location)
+        return location
+
+    def dist(self, a: str, b: str) -> float:
+        """Returns the distance between two named points, see TickState.dist."""
+        self.point(a)
+        self.point(b)
+        return self.state.dist(a, b)
+
+    def peek(self, name: str):
+        """The feature's value if it's been worked out this tick, otherwise None. Never works it out."""
+        return self.__dict__.get(name)
+
+    def computed(self) -> List[str]:
+        """The names of the features that have been worked out so far this tick."""
+        return [name for name in self.__dict__ if isinstance(getattr(type(self), name, None), feature)]
+
+
+@dataclass
+class Rule:
+    behavior: str
+    applies: Callable[[Features], bool]
+
+
+def choose_behavior(rules: List[Rule], features: Features, default: str) -> str:
+    """Returns the behavior of the first rule that applies, or default if none of them do."""
+    for rule in rules:
+        if rule.applies(features):
+            return rule.behavior
+    return default
@@ -0,0 +1,210 @@
+"""
+A flight recorder for the bot: the last few minutes of what it decided each tick, kept in a fixed-size file so
+there's something to look at after it does something strange in a live match. Turn it on with flight_recorder in
+bot.cfg, then read the file with:
+
+    python -m util.flight_recorder recordings/Bot1000-0.rlbflight --last 200
+
+The file is a ring buffer of fixed-width records, memory mapped. Each tick's record is packed straight into the
+map with struct.pack_into, so writing one doesn't build any bytes objects or touch the disk. The operating system
+writes the pages back on its own, which means everything up to the last finished record is still in the file if
+the bot crashes or is killed.
+
+Records carry their own sequence numbers, and the reader puts them back in order from those. A record that was
+being overwritten when the bot died can't be mistaken for an older one, because the old sequence number is cleared
+first and the new one is written last. The previous run's file is kept next to the new one with .previous on the
+end, so restarting the bot after a crash doesn't overwrite the evidence.
+"""
+import argparse
+import mmap
+import os
+import struct
+from typing import Dict, List, NamedTuple, Optional
+
+from rlbot.agents.base_agent import SimpleControllerState
+
+from util.vec import Vec3
+
+FLIGHT_MAGIC = b'RLBFLT'
+FLIGHT_VERSION = 1
+
+# magic, version, record size, capacity, number of behavior names
+HEADER_FORMAT = struct.Struct('<6sHIII')
+# Behavior names are stored once in the header and each record refers to one by its index.
+MAX_BEHAVIORS = 32
+NAME_BYTES = 24
+NAMES_OFFSET = HEADER_FORMAT.size
+RECORDS_OFFSET = NAMES_OFFSET + MAX_BEHAVIORS * NAME_BYTES
+
+# game time, behavior, boost, feature flags, target x y z, throttle, steer, pitch, yaw, roll, buttons, sequence
+# number. The sequence number goes last so it's written last, see the module docstring.
+DECISION_FORMAT = struct.Struct('<fBBB3f')
+CONTROLS_FORMAT = struct.Struct('<5fB')
+SEQUENCE_FORMAT = struct.Struct('<Q')
+RECORD_SIZE = DECISION_FORMAT.size + CONTROLS_FORMAT.size + SEQUENCE_FORMAT.size
+CONTROLS_OFFSET = DECISION_FORMAT.size
+SEQUENCE_OFFSET = CONTROLS_OFFSET + CONTROLS_FORMAT.size
+
+# Two bits per feature in the flags byte: whether it was worked out this tick, and if so its value. Features are
+# only recorded if the bot needed them anyway, so the recorder never makes a tick slower by asking for one.
+POTENTIAL_GOAL_KNOWN, POTENTIAL_GOAL = 1, 2
+SHOOTING_ANGLE_KNOWN, SHOOTING_ANGLE = 4, 8
+
+JUMP, BOOST, HANDBRAKE, USE_ITEM = 1, 2, 4, 8
+
+# Two minutes at 120 ticks per second
+DEFAULT_CAPACITY = 14400
+UNKNOWN_BEHAVIOR = 255
+# Sequence numbers start at 1, so an all-zero slot that was never written is never read as a record.
+FIRST_SEQUENCE = 1
+
+
+class FlightRecorder:
+    """
+    Writes one record per tick into a ring buffer of capacity records at path. Call decide once the behavior
+    and target are known, and then controls with what get_output returns, which finishes the record. A tick that
+    never gets to decide (an exception, say) doesn't get a record. Call close when the bot retires.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        if os.path.exists(path):
+            os.replace(path, path + '.previous')
+        self.path = path
+        self.capacity = capacity
+        self.sequence = FIRST_SEQUENCE
+        self._behaviors: Dict[str, int] = {}
+        size = RECORDS_OFFSET + capacity * RECORD_SIZE
+        with open(path, 'w+b') as file:
+            file.truncate(size)
+            self._map = mmap.mmap(file.fileno(), size)
+        HEADER_FORMAT.pack_into(self._map, 0, FLIGHT_MAGIC, FLIGHT_VERSION, RECORD_SIZE, capacity, 0)
+        self._offset = RECORDS_OFFSET
+
+    def _behavior_index(self, behavior: str) -> int:
+        index = self._behaviors.get(behavior)
+        if index is None:
+            # Only the first time each behavior shows up
+            index = len(self._behaviors)
+            if index >= MAX_BEHAVIORS:
+                return UNKNOWN_BEHAVIOR
+            self._behaviors[behavior] = index
+            struct.pack_into(f'{NAME_BYTES}s', self._map, NAMES_OFFSET + index * NAME_BYTES,
+                             behavior.encode('utf-8')[:NAME_BYTES])
+            HEADER_FORMAT.pack_into(self._map, 0, FLIGHT_MAGIC, FLIGHT_VERSION, RECORD_SIZE, self.capacity,
+                                    len(self._behaviors))
+        return index
+
+    def decide(self, time: float, behavior: str, target: Vec3, boost: int, potential_goal: Optional[bool] = None,
+               shooting_angle: Optional[bool] = None):
+        """The first half of this tick's record. Leave the features as None if they weren't worked out this tick."""
+        flags = 0
+        if potential_goal is not None:
+            flags |= POTENTIAL_GOAL_KNOWN | (POTENTIAL_GOAL if potential_goal else 0)
+        if shooting_angle is not None:
+            flags |= SHOOTING_ANGLE_KNOWN | (SHOOTING_ANGLE if shooting_angle else 0)
+        # Clear the old record's sequence number first, so until controls finishes this one the slot is skipped
+        SEQUENCE_FORMAT.pack_into(self._map, self._offset + SEQUENCE_OFFSET, 0)
+        DECISION_FORMAT.pack_into(self._map, self._offset, time, self._behavior_index(behavior), boost, flags,
+                                  target.x, target.y, target.z)
+
+    def controls(self, controls: SimpleControllerState):
+        """The rest of this tick's record, after which it counts as written."""
+        buttons = ((JUMP if controls.jump else 0) | (BOOST if controls.boost else 0) |
+                   (HANDBRAKE if controls.handbrake else 0) | (USE_ITEM if controls.use_item else 0))
+        CONTROLS_FORMAT.pack_into(self._map, self._offset + CONTROLS_OFFSET, controls.throttle, controls.steer,
+                                  controls.pitch, controls.yaw, controls.roll, buttons)
+        SEQUENCE_FORMAT.pack_into(self._map, self._offset + SEQUENCE_OFFSET, self.sequence)
+        self.sequence += 1
+        self._offset += RECORD_SIZE
+        if self._offset >= RECORDS_OFFSET + self.capacity * RECORD_SIZE:
+            self._offset = RECORDS_OFFSET
+
+    def close(self):
+        self._map.flush()
+        self._map.close()
+
+
+class FlightRecord(NamedTuple):
+    sequence: int
+    time: float
+    behavior: str
+    boost: int
+    potential_goal: Optional[bool]
+    shooting_angle: Optional[bool]
+    target: Vec3
+    throttle: float
+    steer: float
+    pitch: float
+    yaw: float
+    roll: float
+    jump: bool
+    boost_button: bool
+    handbrake: bool
+    use_item: bool
+
+
+def _flag(flags: int, known: int, value: int) -> Optional[bool]:
+    return bool(flags & value) if flags & known else None
+
+
+def read_flight_records(path: str) -> List[FlightRecord]:
+    """Reads every finished record in a flight recorder file, oldest first."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, record_size, capacity, num_behaviors = HEADER_FORMAT.unpack_from(data, 0)
+    if magic != FLIGHT_MAGIC:
+        raise ValueError(f'{path} is not a flight recorder file')
+    if version != FLIGHT_VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f'{path} was written by flight recorder version {version}, this is {FLIGHT_VERSION}')
+    behaviors = [struct.unpack_from(f'{NAME_BYTES}s', data, NAMES_OFFSET + i * NAME_BYTES)[0]
+                 .rstrip(b'\0').decode('utf-8', 'replace') for i in range(num_behaviors)]
+
+    records = []
+    for slot in range(capacity):
+        offset = RECORDS_OFFSET + slot * RECORD_SIZE
+        if offset + RECORD_SIZE > len(data):
+            break
+        sequence, = SEQUENCE_FORMAT.unpack_from(data, offset + SEQUENCE_OFFSET)
+        if sequence < FIRST_SEQUENCE:
+            continue
+        time, behavior, boost, flags, x, y, z = DECISION_FORMAT.unpack_from(data, offset)
+        throttle, steer, pitch, yaw, roll, buttons = CONTROLS_FORMAT.unpack_from(data, offset + CONTROLS_OFFSET)
+        records.append(FlightRecord(
+            sequence, time, behaviors[behavior] if behavior < len(behaviors) else '?', boost,
+            _flag(flags, POTENTIAL_GOAL_KNOWN, POTENTIAL_GOAL), _flag(flags, SHOOTING_ANGLE_KNOWN, SHOOTING_ANGLE),
+            Vec3(x, y, z), throttle, steer, pitch, yaw, roll,
+            bool(buttons & JUMP), bool(buttons & BOOST), bool(buttons & HANDBRAKE), bool(buttons & USE_ITEM)))
+    records.sort(key=lambda record: record.sequence)
+    return records
+
+
+def _format_flag(value: Optional[bool]) -> str:
+    return '-' if value is None else 'yes' if value else 'no'
+
+
+def format_table(records: List[FlightRecord]) -> str:
+    lines = [f'{"seq":>7} {"time":>9} {"behavior":<16}{"boost":>5} {"goal?":>5} {"shot?":>5} '
+             f'{"target":>23}  {"thr":>5} {"steer":>5} {"pitch":>5} {"yaw":>5} {"roll":>5} buttons']
+    for r in records:
+        buttons = ' '.join(name for name, pressed in (('jump', r.jump), ('boost', r.boost_button),
+                                                      ('handbrake', r.handbrake), ('item', r.use_item)) if pressed)
+        lines.append(f'{r.sequence:>7} {r.time:>9.3f} {r.behavior:<16}{r.boost:>5} '
+                     f'{_format_flag(r.potential_goal):>5} {_format_flag(r.shooting_angle):>5} '
+                     f'{r.target.x:>7.0f} {r.target.y:>7.0f} {r.target.z:>7.0f}  {r.throttle:>5.2f} {r.steer:>5.2f} '
+                     f'{r.pitch:>5.2f} {r.yaw:>5.2f} {r.roll:>5.2f} {buttons}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the decisions in a flight recorder file as a table.')
+    parser.add_argument('path', help='A .rlbflight file written with flight_recorder turned on')
+    parser.add_argument('--last', type=int, help='Only print this many of the newest records')
+    args = parser.parse_args()
+    records = read_flight_records(args.path)
+    if args.last is not None:
+        records = records[-args.last:]
+    print(format_table(records))
+
+
+if __name__ == '__main__':
+    main()
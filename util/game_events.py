@@ -0,0 +1,178 @@
+"""
+Things that happen in a match (touches, pickups, demos, goals, kickoffs, ...) worked out once per tick by comparing
+each packet with the one before, instead of every piece of the bot looking through the whole packet for them.
+
+    events = GameEventStream()
+    events.subscribe(KickoffStarted, lambda event: print('kickoff at', event.time))
+
+    # every tick
+    for event in events.update(packet):
+        ...
+
+A subscriber gets every event of the type it subscribed to, including subclasses, so subscribing to GameEvent
+gets everything. Within a tick, kickoff and goal events come first, then touches, spikes, boost pickups, demos and
+wheel contact changes.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Type
+
+import numpy as np
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.boost_pad_table import BoostPadTable, boost_states
+from util.car_table import CarTable
+from util.spikes import SpikeWatcher
+from util.vec import Vec3
+
+
+@dataclass
+class GameEvent:
+    time: float  # Game time of the packet the event showed up in
+
+
+@dataclass
+class KickoffStarted(GameEvent):
+    pass
+
+
+@dataclass
+class KickoffEnded(GameEvent):
+    pass
+
+
+@dataclass
+class GoalScored(GameEvent):
+    team: int  # The team that scored
+
+
+@dataclass
+class BallTouched(GameEvent):
+    player_index: int
+    team: int
+    location: Vec3
+
+
+@dataclass
+class SpikeStarted(GameEvent):
+    player_index: int
+
+
+@dataclass
+class SpikeEnded(GameEvent):
+    player_index: int
+    duration: float  # How long the ball was carried
+
+
+@dataclass
+class BoostPickedUp(GameEvent):
+    pad_index: int
+    player_index: Optional[int]  # The car closest to the pad, since the packet doesn't say who took it
+
+
+@dataclass
+class CarDemolished(GameEvent):
+    player_index: int
+
+
+@dataclass
+class WheelContactChanged(GameEvent):
+    player_index: int
+    has_wheel_contact: bool
+
+
+class GameEventStream:
+    """
+    Compares each packet with the last one and turns the differences into events. Only a handful of numbers are
+    kept between ticks, and the comparisons are a few numpy operations, so a tick where nothing happened costs
+    next to nothing. The first packet sets the starting point and only reports a kickoff that's already under way.
+    If the game clock goes backwards (a new match, or a replay starting over) it starts over the same way.
+    """
+
+    def __init__(self, boost_pads: BoostPadTable = None):
+        # Without the pad locations a pickup can't be pinned on a car, so BoostPickedUp.player_index is None.
+        self.boost_pads = boost_pads
+        self.subscribers: Dict[Type[GameEvent], List[Callable[[GameEvent], None]]] = {}
+        self.spike_watcher = SpikeWatcher()
+        self.events: List[GameEvent] = []
+        self._time: float = None
+        self._kickoff_pause = False
+        self._scores: Dict[int, int] = {}
+        self._touch = None
+        self._carry_duration = 0.0
+        self._is_demolished = np.zeros(0, dtype=bool)
+        self._has_wheel_contact = np.zeros(0, dtype=bool)
+        self._pad_active = np.zeros(0, dtype=bool)
+
+    def subscribe(self, event_type: Type[GameEvent], callback: Callable[[GameEvent], None]):
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def update(self, packet: GameTickPacket, cars: CarTable = None, taken_pads: np.ndarray = None) -> List[GameEvent]:
+        """
+        Call this once per tick. Pass in this tick's CarTable (e.g. TickState.cars) and BoostPadTracker.taken if
+        they're already around, so they aren't worked out twice. Returns this tick's events, after every
+        subscriber has been called with them.
+        """
+        now = packet.game_info.seconds_elapsed
+        first = self._time is None or now < self._time
+        self._time = now
+        if first:
+            self.spike_watcher = SpikeWatcher()
+        if cars is None:
+            cars = CarTable(packet)
+        events = []
+
+        kickoff_pause = bool(packet.game_info.is_kickoff_pause)
+        # Compared even on the first packet, so nobody is left thinking a kickoff from before a restart is still on.
+        if kickoff_pause != self._kickoff_pause:
+            events.append(KickoffStarted(now) if kickoff_pause else KickoffEnded(now))
+        self._kickoff_pause = kickoff_pause
+
+        # packet.teams is indexed by team, the same as PlayerInfo.team
+        for team in range(packet.num_teams):
+            score = packet.teams[team].score
+            if not first and score > self._scores.get(team, score):
+                events.append(GoalScored(now, team))
+            self._scores[team] = score
+
+        touch = packet.game_ball.latest_touch
+        touch_key = (touch.time_seconds, touch.player_index)
+        if not first and touch_key != self._touch and touch.player_index >= 0:
+            events.append(BallTouched(now, touch.player_index, touch.team, Vec3(touch.hit_location)))
+        self._touch = touch_key
+
+        watcher = self.spike_watcher
+        carrying_index = watcher.carrying_index
+        watcher.read_packet(packet, cars)
+        if watcher.carrying_index != carrying_index and not first:
+            if carrying_index is not None:
+                events.append(SpikeEnded(now, carrying_index, self._carry_duration))
+            if watcher.carrying_index is not None:
+                events.append(SpikeStarted(now, watcher.carrying_index))
+        self._carry_duration = watcher.carry_duration
+
+        if taken_pads is None:
+            pad_active = boost_states(packet)['is_active']
+            if not first and len(pad_active) == len(self._pad_active):
+                taken_pads = np.flatnonzero(self._pad_active & ~pad_active)
+            self._pad_active = pad_active.copy()
+        if taken_pads is not None and not first:
+            for pad in taken_pads.tolist():
+                taker = None
+                if self.boost_pads is not None:
+                    taker = cars.nearest_within(self.boost_pads.location(pad), np.inf)
+                events.append(BoostPickedUp(now, pad, taker))
+
+        if not first and len(cars) == len(self._is_demolished):
+            for index in np.flatnonzero(cars.is_demolished & ~self._is_demolished).tolist():
+                events.append(CarDemolished(now, index))
+            for index in np.flatnonzero(cars.has_wheel_contact != self._has_wheel_contact).tolist():
+                events.append(WheelContactChanged(now, index, bool(cars.has_wheel_contact[index])))
+        self._is_demolished = cars.is_demolished
+        self._has_wheel_contact = cars.has_wheel_contact
+
+        self.events = events
+        for event in events:
+            for event_type in type(event).__mro__:
+                for callback in self.subscribers.get(event_type, ()):
+                    callback(event)
+        return events
@@ -0,0 +1,377 @@
+"""
+Runs MyBot against a tiny stand-in for the game, so it can be driven at full speed with no Rocket League or RLBot
+dll running. Run it from the bot's folder:
+
+    python -m util.headless --ticks 2000
+    python -m util.headless --scenario kickoff --profile
+
+The packets, field info and ball prediction are rlbot's own ctypes structures, so the bot reads exactly the same
+memory layout it gets in a real match. Only the renderer (NullRenderer) and the physics are stand-ins. The physics
+are deliberately crude: cars drive flat on the ground with a speed-dependent turning radius, boost and simple
+jumps, the ball has gravity and bounces off the floor, walls and ceiling, and a car that gets close enough to the
+ball knocks it away. That's plenty to send the bot through all of its behaviors, but don't tune anything on it.
+
+The scenarios come from util/scenarios.py.
+"""
+import argparse
+import math
+import random
+from time import perf_counter
+from typing import Callable, List
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import FieldInfoPacket, GameTickPacket, PlayerInfo
+
+from util.drive import steer_toward_target
+from util.physics import (BACK_WALL_Y, BALL_RADIUS, BALL_RESTITUTION, BOOST_ACCELERATION, BOOST_CONSUMPTION,
+                          BRAKE_DECELERATION, CAR_HEIGHT, CEILING_Z, COAST_DECELERATION, CURVATURES, CURVATURE_SPEEDS,
+                          DODGE_SPEED, GOAL_HALF_WIDTH, GOAL_HEIGHT, GRAVITY, JUMP_SPEED, MAX_CAR_SPEED,
+                          MAX_THROTTLE_SPEED, PAD_BOOST_AMOUNT, PAD_PICKUP_DISTANCE, PAD_RESPAWN_TIME, SIDE_WALL_X,
+                          THROTTLE_ACCELERATION, curvature)
+from util.replay import NullRenderer, ReplayResult, control_values
+from util.vec import Vec3
+
+TICK_RATE = 120
+PREDICTION_RATE = 60
+PREDICTION_SLICES = 360
+
+# Standard arena boost pads as (x, y, z, is_full_boost), in the order the game lists them.
+STANDARD_BOOST_PADS = [
+    (0, -4240, 70, False), (-1792, -4184, 70, False), (1792, -4184, 70, False), (-3072, -4096, 73, True),
+    (3072, -4096, 73, True), (-940, -3308, 70, False), (940, -3308, 70, False), (0, -2816, 70, False),
+    (-3584, -2484, 70, False), (3584, -2484, 70, False), (-1788, -2300, 70, False), (1788, -2300, 70, False),
+    (-2048, -1036, 70, False), (0, -1024, 70, False), (2048, -1036, 70, False), (-3584, 0, 73, True),
+    (-1024, 0, 70, False), (1024, 0, 70, False), (3584, 0, 73, True), (-2048, 1036, 70, False),
+    (0, 1024, 70, False), (2048, 1036, 70, False), (-1788, 2300, 70, False), (1788, 2300, 70, False),
+    (-3584, 2484, 70, False), (3584, 2484, 70, False), (0, 2816, 70, False), (-940, 3310, 70, False),
+    (940, 3308, 70, False), (-3072, 4096, 73, True), (3072, 4096, 73, True), (-1792, 4184, 70, False),
+    (1792, 4184, 70, False), (0, 4240, 70, False),
+]
+# How far the ball's center can be from a car's center and still get hit. Roughly an octane plus the ball radius.
+TOUCH_DISTANCE = 165
+
+
+def standard_field_info() -> FieldInfoPacket:
+    info = FieldInfoPacket()
+    for i, (x, y, z, is_full) in enumerate(STANDARD_BOOST_PADS):
+        pad = info.boost_pads[i]
+        pad.location.x, pad.location.y, pad.location.z = x, y, z
+        pad.is_full_boost = is_full
+    info.num_boosts = len(STANDARD_BOOST_PADS)
+    for team, y in ((0, -BACK_WALL_Y), (1, BACK_WALL_Y)):
+        goal = info.goals[team]
+        goal.team_num = team
+        goal.location.y, goal.location.z = y, 321.3
+        goal.direction.y = 1 if team == 0 else -1
+        goal.width, goal.height = 2 * GOAL_HALF_WIDTH, GOAL_HEIGHT
+    info.num_goals = 2
+    return info
+
+
+def step_ball(location: List[float], velocity: List[float], dt: float) -> bool:
+    """
+    Moves the ball forward by dt, in place. Returns True if it bounced off something, which is when a ball
+    prediction made before this step stops being right about where the ball goes.
+    """
+    velocity[2] -= GRAVITY * dt
+    for axis in range(3):
+        location[axis] += velocity[axis] * dt
+    bounced = False
+    if location[2] < BALL_RADIUS:
+        location[2] = BALL_RADIUS
+        velocity[2] = -velocity[2] * BALL_RESTITUTION
+        # Let it settle instead of bouncing forever in ever smaller hops. Rolling along isn't a bounce.
+        if velocity[2] < 10:
+            velocity[2] = 0
+        else:
+            bounced = True
+    elif location[2] > CEILING_Z - BALL_RADIUS:
+        location[2] = CEILING_Z - BALL_RADIUS
+        velocity[2] = -velocity[2] * BALL_RESTITUTION
+        bounced = True
+    if abs(location[0]) > SIDE_WALL_X - BALL_RADIUS:
+        location[0] = math.copysign(SIDE_WALL_X - BALL_RADIUS, location[0])
+        velocity[0] = -velocity[0] * BALL_RESTITUTION
+        bounced = True
+    in_goal_mouth = abs(location[0]) < GOAL_HALF_WIDTH - BALL_RADIUS and location[2] < GOAL_HEIGHT - BALL_RADIUS
+    if abs(location[1]) > BACK_WALL_Y - BALL_RADIUS and not in_goal_mouth:
+        location[1] = math.copysign(BACK_WALL_Y - BALL_RADIUS, location[1])
+        velocity[1] = -velocity[1] * BALL_RESTITUTION
+        bounced = True
+    return bounced
+
+
+def simple_prediction(ball, start_time: float, prediction: BallPrediction = None) -> BallPrediction:
+    """
+    A ball prediction for the stand-in physics, so it's exactly right until somebody touches the ball. ball is
+    anything with physics-like location and velocity. Fills in prediction if it's given, else makes a new one.
+    """
+    if prediction is None:
+        prediction = BallPrediction()
+    location = [ball.location.x, ball.location.y, ball.location.z]
+    velocity = [ball.velocity.x, ball.velocity.y, ball.velocity.z]
+    dt = 1 / PREDICTION_RATE
+    for i in range(PREDICTION_SLICES):
+        step_ball(location, velocity, dt)
+        ball_slice = prediction.slices[i]
+        ball_slice.game_seconds = start_time + (i + 1) * dt
+        physics = ball_slice.physics
+        physics.location.x, physics.location.y, physics.location.z = location
+        physics.velocity.x, physics.velocity.y, physics.velocity.z = velocity
+    prediction.num_slices = PREDICTION_SLICES
+    return prediction
+
+
+def chase_ball(packet: GameTickPacket, index: int) -> SimpleControllerState:
+    """The default opponent: drives straight at the ball, boosting when it's pointed the right way."""
+    car = packet.game_cars[index]
+    steer = steer_toward_target(car, Vec3(packet.game_ball.physics.location))
+    return SimpleControllerState(throttle=1, steer=steer, boost=abs(steer) < 0.2)
+
+
+class HeadlessMatch:
+    """
+    Holds a GameTickPacket, the field info and ball prediction, and a MyBot hooked up to them through the same
+    providers the framework uses. Call load with a scenario, then tick to run one frame: the bot picks its
+    controls, the opponents pick theirs, and the stand-in physics moves everything on by 1/120 of a second.
+
+    A goal resets the scenario, so a long run keeps going. goals counts them by the team that scored.
+    """
+
+    def __init__(self, bot_class=None, team: int = 0,
+                 opponent: Callable[[GameTickPacket, int], SimpleControllerState] = chase_ball):
+        if bot_class is None:
+            from bot import MyBot
+            bot_class = MyBot
+        self.bot_class = bot_class
+        self.team = team
+        self.opponent = opponent
+        self.field_info = standard_field_info()
+        self.packet = GameTickPacket()
+        self.ball_prediction = BallPrediction()
+        self.renderer = NullRenderer()
+        self.bot = None
+        self.scenario = None
+        self.goals = [0, 0]
+        self.seconds_in_get_output = 0.0
+        self._prediction_stale = True
+        self._jump_held: List[bool] = []
+
+    def load(self, scenario):
+        """Puts everything where the scenario says and starts a fresh bot."""
+        self.close()
+        self.scenario = scenario
+        self._reset()
+        self.bot = self.bot_class('Headless', self.team, 0)
+        self.bot._register_field_info(lambda: self.field_info)
+        self.bot._register_ball_prediction_struct(lambda: self.ball_prediction)
+        self.bot._set_renderer(self.renderer)
+        self.bot.initialize_agent()
+
+    def _reset(self):
+        seconds_elapsed = self.packet.game_info.seconds_elapsed
+        frame_num = self.packet.game_info.frame_num
+        self.scenario.apply(self.packet, self.team)
+        self.packet.game_info.seconds_elapsed = seconds_elapsed
+        self.packet.game_info.frame_num = frame_num
+        self.packet.game_info.is_round_active = True
+        self.packet.num_teams = 2
+        self._jump_held = [False] * self.packet.num_cars
+        self._prediction_stale = True
+
+    def tick(self) -> SimpleControllerState:
+        packet = self.packet
+        if self._prediction_stale:
+            simple_prediction(packet.game_ball.physics, packet.game_info.seconds_elapsed, self.ball_prediction)
+            self._prediction_stale = False
+        self.renderer.begin_rendering()
+        start = perf_counter()
+        controls = self.bot.get_output(packet)
+        self.seconds_in_get_output += perf_counter() - start
+        self.renderer.end_rendering()
+
+        dt = 1 / TICK_RATE
+        for i in range(packet.num_cars):
+            if i == 0:
+                car_controls = controls
+            elif self.opponent is not None:
+                car_controls = self.opponent(packet, i)
+            else:
+                car_controls = SimpleControllerState()
+            self._step_car(i, car_controls or SimpleControllerState(), dt)
+        self._step_boost_pads(dt)
+        self._step_ball(dt)
+        packet.game_info.seconds_elapsed += dt
+        packet.game_info.frame_num += 1
+        # The real prediction is redone every frame. Ours only needs it when the ball was pushed off its path,
+        # and otherwise every half second, so the bot still sees it move on.
+        start = self.ball_prediction.slices[0].game_seconds
+        if packet.game_info.seconds_elapsed - start > 0.5:
+            self._prediction_stale = True
+        return controls
+
+    def _step_car(self, index: int, controls: SimpleControllerState, dt: float):
+        car: PlayerInfo = self.packet.game_cars[index]
+        physics = car.physics
+        yaw = physics.rotation.yaw
+        forward_x, forward_y = math.cos(yaw), math.sin(yaw)
+        speed = physics.velocity.x * forward_x + physics.velocity.y * forward_y
+
+        throttle = controls.throttle
+        if controls.boost and car.boost > 0:
+            speed += BOOST_ACCELERATION * dt
+            car.boost = max(int(car.boost - BOOST_CONSUMPTION * dt + 0.99), 0)
+            throttle = 1
+        if car.has_wheel_contact:
+            if throttle * speed < 0:
+                speed += math.copysign(BRAKE_DECELERATION * dt, throttle)
+            elif throttle != 0 and abs(speed) < MAX_THROTTLE_SPEED:
+                acceleration = THROTTLE_ACCELERATION * (1 - abs(speed) / MAX_THROTTLE_SPEED)
+                speed += throttle * acceleration * dt
+            elif throttle == 0:
+                speed -= math.copysign(min(COAST_DECELERATION * dt, abs(speed)), speed)
+            turn_rate = controls.steer * speed * curvature(abs(speed))
+            if controls.handbrake:
+                turn_rate *= 1.5
+            physics.rotation.yaw = (yaw + turn_rate * dt + math.pi) % (2 * math.pi) - math.pi
+        speed = max(min(speed, MAX_CAR_SPEED), -MAX_CAR_SPEED)
+
+        yaw = physics.rotation.yaw
+        physics.velocity.x, physics.velocity.y = speed * math.cos(yaw), speed * math.sin(yaw)
+        jump_pressed = controls.jump and not self._jump_held[index]
+        self._jump_held[index] = controls.jump
+        if jump_pressed and car.has_wheel_contact:
+            car.has_wheel_contact = False
+            car.jumped = True
+            physics.velocity.z = JUMP_SPEED
+        elif jump_pressed and not car.double_jumped:
+            car.double_jumped = True
+            if controls.pitch or controls.yaw:
+                # A dodge: a burst of speed in the direction of the stick.
+                dodge_angle = yaw + math.atan2(controls.yaw, -controls.pitch)
+                physics.velocity.x += DODGE_SPEED * math.cos(dodge_angle)
+                physics.velocity.y += DODGE_SPEED * math.sin(dodge_angle)
+            else:
+                physics.velocity.z += JUMP_SPEED
+        if not car.has_wheel_contact:
+            physics.velocity.z -= GRAVITY * dt
+
+        physics.location.x += physics.velocity.x * dt
+        physics.location.y += physics.velocity.y * dt
+        physics.location.z += physics.velocity.z * dt
+        if physics.location.z <= CAR_HEIGHT:
+            physics.location.z = CAR_HEIGHT
+            physics.velocity.z = 0
+            car.has_wheel_contact = True
+            car.jumped = car.double_jumped = False
+        for axis, limit in (('x', SIDE_WALL_X), ('y', BACK_WALL_Y)):
+            value = getattr(physics.location, axis)
+            if abs(value) > limit - 50:
+                setattr(physics.location, axis, math.copysign(limit - 50, value))
+                setattr(physics.velocity, axis, 0)
+
+        ball = self.packet.game_ball
+        dx = ball.physics.location.x - physics.location.x
+        dy = ball.physics.location.y - physics.location.y
+        dz = ball.physics.location.z - physics.location.z
+        distance = math.sqrt(dx * dx + dy * dy + dz * dz)
+        if distance < TOUCH_DISTANCE:
+            car_speed = math.sqrt(physics.velocity.x ** 2 + physics.velocity.y ** 2)
+            hit_speed = max(car_speed * 1.4, 600) / max(distance, 1)
+            ball.physics.velocity.x = dx * hit_speed
+            ball.physics.velocity.y = dy * hit_speed
+            ball.physics.velocity.z = max(dz * hit_speed, 200)
+            ball.latest_touch.player_index = index
+            ball.latest_touch.team = car.team
+            ball.latest_touch.time_seconds = self.packet.game_info.seconds_elapsed
+            self.packet.game_info.is_kickoff_pause = False
+            self._prediction_stale = True
+
+    def _step_boost_pads(self, dt: float):
+        packet = self.packet
+        for i in range(packet.num_boost):
+            pad = packet.game_boosts[i]
+            x, y, z, is_full = STANDARD_BOOST_PADS[i]
+            if not pad.is_active:
+                pad.timer += dt
+                if pad.timer >= PAD_RESPAWN_TIME[is_full]:
+                    pad.is_active = True
+                    pad.timer = 0
+                continue
+            for c in range(packet.num_cars):
+                car = packet.game_cars[c]
+                location = car.physics.location
+                if car.boost < 100 and abs(location.x - x) < PAD_PICKUP_DISTANCE[is_full] and \
+                        abs(location.y - y) < PAD_PICKUP_DISTANCE[is_full]:
+                    car.boost = min(car.boost + PAD_BOOST_AMOUNT[is_full], 100)
+                    pad.is_active = False
+                    pad.timer = 0
+                    break
+
+    def _step_ball(self, dt: float):
+        physics = self.packet.game_ball.physics
+        location = [physics.location.x, physics.location.y, physics.location.z]
+        velocity = [physics.velocity.x, physics.velocity.y, physics.velocity.z]
+        if step_ball(location, velocity, dt):
+            # The prediction already knows about bounces, but not exactly when they land between our ticks.
+            self._prediction_stale = True
+        physics.location.x, physics.location.y, physics.location.z = location
+        physics.velocity.x, physics.velocity.y, physics.velocity.z = velocity
+        if abs(location[1]) > BACK_WALL_Y + BALL_RADIUS:
+            # Into the negative y goal is a goal for orange.
+            scorer = 1 if location[1] < 0 else 0
+            self.goals[scorer] += 1
+            self.packet.teams[scorer].score += 1
+            self._reset()
+
+    def run(self, ticks: int, keep_controls: bool = False) -> ReplayResult:
+        """Runs the loaded scenario for the given number of ticks. Only the time spent in get_output is counted."""
+        controls = []
+        seconds_before = self.seconds_in_get_output
+        draw_calls = self.renderer.draw_calls
+        for _ in range(ticks):
+            output = self.tick()
+            if keep_controls:
+                controls.append(control_values(output))
+        return ReplayResult(ticks, self.seconds_in_get_output - seconds_before, self.renderer.draw_calls - draw_calls,
+                            controls)
+
+    def close(self):
+        if self.bot is not None and hasattr(self.bot, 'retire'):
+            self.bot.retire()
+        self.bot = None
+
+
+def main():
+    from util.scenarios import all_scenarios
+
+    parser = argparse.ArgumentParser(description='Run MyBot against stand-in physics with no game running.')
+    parser.add_argument('--ticks', type=int, default=1200, help='Ticks to run each scenario for')
+    parser.add_argument('--scenario', help='Only run scenarios with this in their name')
+    parser.add_argument('--team', type=int, default=0, choices=[0, 1])
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the randomly placed scenarios')
+    parser.add_argument('--profile', action='store_true', help="Turn on the bot's tick profiler, which it logs at the end of each scenario")
+    args = parser.parse_args()
+
+    match = HeadlessMatch(team=args.team)
+    total_ticks, total_seconds = 0, 0.0
+    for scenario in all_scenarios(random.Random(args.seed)):
+        if args.scenario and args.scenario.lower() not in scenario.name.lower():
+            continue
+        match.goals = [0, 0]
+        match.load(scenario)
+        match.bot.profiler.enabled = args.profile
+        result = match.run(args.ticks)
+        total_ticks += result.ticks
+        total_seconds += result.seconds_in_get_output
+        print(f'{scenario.name:<28} {result.ticks} ticks, {result.ticks_per_second:.0f} ticks/s, '
+              f'goals {match.goals[0]}-{match.goals[1]}')
+        # With the profiler on, the bot logs its report when it's retired.
+        match.close()
+    if total_seconds > 0:
+        print(f'overall: {total_ticks} ticks, {total_ticks / total_seconds:.0f} ticks/s in get_output')
+
+
+if __name__ == '__main__':
+    main()
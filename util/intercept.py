@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from util.orientation import Orientation
+from util.physics import BOOST_CONSUMPTION, MAX_CAR_SPEED, MAX_THROTTLE_SPEED
+from util.prediction_arrays import BallPredictionArrays
+from util.vec import Vec3
+
+# Throttle plus boost, averaged over the speeds we usually accelerate through. Not the game's numbers, which are
+# in util.physics: these are tuned so a straight line estimate comes out about right.
+AVERAGE_BOOST_ACCELERATION = 1600
+# Throttle alone, averaged the same way. It drops off to nothing at MAX_THROTTLE_SPEED.
+AVERAGE_THROTTLE_ACCELERATION = 700
+# Extra seconds it takes to turn one radian before we're driving at the target
+TURN_TIME_PER_RADIAN = 0.4
+# The ball can be hit when its center is this far from the car's center
+HIT_DISTANCE = 150
+# The highest we'll go for the ball without an aerial
+DEFAULT_MAX_HEIGHT = 300
+
+
+@dataclass
+class Intercept:
+    index: int  # The slice we're going for
+    time: float  # Game time of that slice
+    location: Vec3
+    travel_time: float  # How long we think it takes to get there
+    margin: float  # Seconds to spare when we arrive. Negative means we won't make it.
+
+    @property
+    def feasible(self) -> bool:
+        return self.margin >= 0
+
+
+def estimate_travel_times(targets: np.ndarray, car_location: Vec3, car_orientation: Orientation,
+                          car_velocity: Vec3, boost: float) -> np.ndarray:
+    """
+    Estimates how many seconds it takes to drive to each of the (N, 3) targets. Speeds up from the current forward
+    speed, with boost while there is some, and adds a penalty for how far we have to turn first.
+    """
+    forward, right = car_orientation.forward, car_orientation.right
+    offsets = targets - np.array([car_location.x, car_location.y, car_location.z])
+    ahead = offsets @ np.array([forward.x, forward.y, forward.z])
+    beside = offsets @ np.array([right.x, right.y, right.z])
+    distances = np.maximum(np.hypot(offsets[:, 0], offsets[:, 1]) - HIT_DISTANCE, 0)
+    turn_times = np.abs(np.arctan2(beside, ahead)) * TURN_TIME_PER_RADIAN
+
+    start_speed = max(car_velocity.dot(forward), 0.0)
+    if boost > 0:
+        acceleration = AVERAGE_BOOST_ACCELERATION
+        # We can only keep accelerating for as long as the boost lasts.
+        top_speed = min(MAX_CAR_SPEED, start_speed + acceleration * boost / BOOST_CONSUMPTION)
+    else:
+        acceleration = AVERAGE_THROTTLE_ACCELERATION
+        top_speed = max(MAX_THROTTLE_SPEED, start_speed)
+    top_speed = max(top_speed, start_speed)
+
+    # Accelerate until top speed, then hold it.
+    accelerating_time = (top_speed - start_speed) / acceleration
+    accelerating_distance = start_speed * accelerating_time + 0.5 * acceleration * accelerating_time ** 2
+    still_accelerating = distances <= accelerating_distance
+    drive_times = np.where(
+        still_accelerating,
+        (np.sqrt(start_speed ** 2 + 2 * acceleration * distances) - start_speed) / acceleration,
+        accelerating_time + (distances - accelerating_distance) / max(top_speed, 1.0))
+    return drive_times + turn_times
+
+
+def find_intercept(prediction: BallPredictionArrays, car_location: Vec3, car_orientation: Orientation,
+                   car_velocity: Vec3, boost: float, now: float,
+                   max_height: float = DEFAULT_MAX_HEIGHT) -> Optional[Intercept]:
+    """
+    Works out how long it takes to reach the ball at every slice of the prediction, all at once, and returns the
+    earliest slice we can get to in time with the ball low enough to hit. If there isn't one, returns the slice
+    we come closest to making (the largest margin), which will have a negative margin. None if the prediction
+    is empty.
+    """
+    if len(prediction) == 0:
+        return None
+    travel_times = estimate_travel_times(prediction.positions, car_location, car_orientation, car_velocity, boost)
+    margins = (prediction.times - now) - travel_times
+    low_enough = prediction.positions[:, 2] < max_height
+    reachable = low_enough & (margins >= 0)
+    if reachable.any():
+        index = int(np.argmax(reachable))
+    elif low_enough.any():
+        index = int(np.argmax(np.where(low_enough, margins, -np.inf)))
+    else:
+        index = int(np.argmax(margins))
+    return Intercept(index, float(prediction.times[index]), Vec3(*prediction.positions[index].tolist()),
+                     float(travel_times[index]), float(margins[index]))
@@ -0,0 +1,144 @@
+"""
+Flips, kickoffs and anything else that's a fixed list of controls live in maneuvers.json instead of in code.
+Each maneuver is a list of steps, and each step is a duration plus the controls to hold for it. Controls that
+are left out are off (0 or false), the same as a fresh SimpleControllerState:
+
+    "front flip": [
+      {"duration": 0.1, "jump": true},
+      {"duration": 0.05, "jump": false},
+      {"duration": 0.2, "jump": true, "pitch": -1},
+      {"duration": 0.5}
+    ]
+
+kickoffs says which maneuver to use from which spawn. Spawns are written from blue's side of the field, and the
+same kickoff is used from the mirrored spot when playing orange.
+
+The file is read, checked and compiled into Timelines once, so a mistake in it shows up as a ManeuverError when
+the bot starts instead of in the middle of a match.
+"""
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+from rlbot.agents.base_agent import SimpleControllerState
+
+from util.sequence import ControlStep, Timeline
+from util.vec import Vec3
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'maneuvers.json')
+
+ANALOG_CONTROLS = {'throttle', 'steer', 'pitch', 'yaw', 'roll'}
+BUTTON_CONTROLS = {'jump', 'boost', 'handbrake', 'use_item'}
+
+# Kickoff spawns are matched after rounding to this many uu, so a car a hair off its spawn still counts.
+SPAWN_GRID = 8
+
+SpawnKey = Tuple[int, int, int]
+
+
+class ManeuverError(ValueError):
+    pass
+
+
+def spawn_key(team: int, x: float, y: float) -> SpawnKey:
+    return team, round(x / SPAWN_GRID), round(y / SPAWN_GRID)
+
+
+class ManeuverLibrary:
+    """
+    Every maneuver from maneuvers.json, compiled into a Timeline and looked up by name, e.g.
+    library['front flip'].play(). kickoff_for finds the kickoff for a spawn with one dictionary lookup.
+    """
+
+    def __init__(self, timelines: Dict[str, Timeline], kickoffs: Dict[SpawnKey, str]):
+        self.timelines = timelines
+        self.kickoffs = kickoffs
+
+    def __getitem__(self, name: str) -> Timeline:
+        return self.timelines[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.timelines
+
+    def kickoff_for(self, team: int, location: Vec3) -> Optional[Timeline]:
+        """The kickoff to do from this spot, or None if it isn't a spawn we have a kickoff for."""
+        name = self.kickoffs.get(spawn_key(team, location.x, location.y))
+        return self.timelines[name] if name is not None else None
+
+
+def _step(name: str, index: int, step: dict) -> ControlStep:
+    where = f'step {index + 1} of {name}'
+    if not isinstance(step, dict):
+        raise ManeuverError(f'{where} should be an object with a duration and controls')
+    duration = step.get('duration')
+    if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration <= 0:
+        raise ManeuverError(f'{where} needs a duration in seconds greater than 0, not {duration!r}')
+    controls = SimpleControllerState()
+    for control, value in step.items():
+        if control == 'duration':
+            continue
+        if control in ANALOG_CONTROLS:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not -1 <= value <= 1:
+                raise ManeuverError(f'{where}: {control} should be a number from -1 to 1, not {value!r}')
+        elif control in BUTTON_CONTROLS:
+            if not isinstance(value, bool):
+                raise ManeuverError(f'{where}: {control} should be true or false, not {value!r}')
+        else:
+            raise ManeuverError(f'{where}: there is no control called {control!r}')
+        setattr(controls, control, value)
+    return ControlStep(duration, controls)
+
+
+def parse_maneuvers(document: dict) -> ManeuverLibrary:
+    """Checks and compiles an already loaded maneuvers document. See the top of this file for the layout."""
+    if not isinstance(document, dict):
+        raise ManeuverError('The maneuvers file should hold an object with "maneuvers" in it')
+    maneuvers = document.get('maneuvers')
+    if not isinstance(maneuvers, dict) or not maneuvers:
+        raise ManeuverError('There should be a "maneuvers" object with at least one maneuver in it')
+    timelines = {}
+    for name, steps in maneuvers.items():
+        if not isinstance(steps, list) or not steps:
+            raise ManeuverError(f'{name} should be a list of at least one step')
+        timelines[name] = Timeline([_step(name, i, step) for i, step in enumerate(steps)])
+
+    kickoff_specs = document.get('kickoffs', {})
+    if not isinstance(kickoff_specs, dict):
+        raise ManeuverError('"kickoffs" should be an object with a spawn and maneuver for each kickoff')
+    kickoffs = {}
+    for name, kickoff in kickoff_specs.items():
+        spawn = kickoff.get('spawn') if isinstance(kickoff, dict) else None
+        if not isinstance(spawn, list) or len(spawn) != 2 or \
+                not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in spawn):
+            raise ManeuverError(f'Kickoff {name} needs a spawn of [x, y]')
+        maneuver = kickoff.get('maneuver')
+        if maneuver not in timelines:
+            raise ManeuverError(f'Kickoff {name} uses {maneuver!r}, which isn\'t in maneuvers')
+        x, y = spawn
+        # Orange's spawns are blue's turned around the center of the field.
+        for key in (spawn_key(0, x, y), spawn_key(1, -x, -y)):
+            if key in kickoffs:
+                raise ManeuverError(f'Kickoff {name} has the same spawn as another kickoff')
+            kickoffs[key] = maneuver
+    return ManeuverLibrary(timelines, kickoffs)
+
+
+_loaded: Dict[str, ManeuverLibrary] = {}
+
+
+def load_maneuvers(path: str = DEFAULT_PATH) -> ManeuverLibrary:
+    """Reads, checks and compiles a maneuvers file. Each file is only read once, however many bots ask for it."""
+    library = _loaded.get(path)
+    if library is None:
+        try:
+            with open(path) as file:
+                document = json.load(file)
+        except json.JSONDecodeError as e:
+            raise ManeuverError(f'{path} is not valid json: {e}') from e
+        except OSError as e:
+            raise ManeuverError(f'Could not read {path}: {e}') from e
+        try:
+            library = _loaded[path] = parse_maneuvers(document)
+        except ManeuverError as e:
+            raise ManeuverError(f'{path}: {e}') from e
+    return library
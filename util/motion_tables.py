@@ -0,0 +1,265 @@
+"""
+Lookup tables for how a car actually gets around: its turning radius at each speed, and how long it takes to reach
+a spot relative to the car from a given speed, with and without boost. Straight line distance says a pad right
+beside us is closer than one 1500 uu ahead, when really we'd have to turn around to get it.
+
+The times come from driving every spot on a grid with the same simple ground physics as util/headless.py: full
+throttle, steering at the target, braking when we can't turn tightly enough to make it, and in the boost table
+boosting whenever we're pointed roughly the right way. That takes several seconds, so the times are made once and
+kept in the startup cache (see util/startup_cache.py), and after that loading them is a memory map. Looking a time
+up is a few array indexes and a blend.
+
+    tables = load_motion_tables()
+    local = relative_location(car_location, car_orientation, target)
+    seconds = tables.time_to_reach(local.x, local.y, car_speed, boost=my_car.boost > 0)
+
+Build them with `python -m util.motion_tables` before starting the bot, and again after changing anything here
+(bump TABLES_VERSION too, so old ones are ignored). A bot that starts without them builds them on a background
+thread, see saved_motion_tables.
+"""
+import argparse
+import math
+import os
+from bisect import bisect_right
+from time import perf_counter
+from typing import Dict, Optional
+
+import numpy as np
+
+from util.physics import (BOOST_ACCELERATION, BRAKE_DECELERATION, CURVATURE_SPEEDS, CURVATURES, MAX_CAR_SPEED,
+                          MAX_THROTTLE_SPEED, THROTTLE_ACCELERATION)
+from util.startup_cache import DEFAULT_DIRECTORY, cache_path, cached_array
+
+# Bump this whenever anything that changes the times does, so the old ones in the startup cache are ignored.
+TABLES_VERSION = 3
+
+# The time table covers x (ahead of the car) from -GRID_REACH to GRID_REACH and y (to the side) from 0 to
+# GRID_REACH, since turning left and right take the same time. Anything further away is clamped to the edge of
+# the grid, plus the rest of the way at top speed.
+GRID_REACH = 12800
+GRID_STEP = 256
+SPEED_STEP = 250
+# Close enough to count as there. The same sort of distance as the intercept uses to hit the ball.
+ARRIVAL_DISTANCE = 100
+# Anything we haven't reached by then is recorded as taking this long. Long enough for every point on the grid.
+MAX_TIME = 15.0
+SIMULATION_RATE = 60
+# Braking for a tight turn stops here. A target that needs an even tighter turn is driven away from until it doesn't.
+MIN_TURNING_SPEED = 300
+
+RADIUS_SPEEDS = np.arange(0, MAX_CAR_SPEED + 1, 10, dtype=np.float64)
+
+
+class MotionTables:
+    """
+    turn_radii[i] is the turning radius at RADIUS_SPEEDS[i]. times[boost][s, i, j] is the seconds to reach
+    (xs[i], ys[j]) in the car's frame (see relative_location) starting at speeds[s] straight ahead, with boost
+    (boost=1) or without (boost=0).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.turn_radii = arrays['turn_radii']
+        self.speeds = arrays['speeds']
+        self.xs = arrays['xs']
+        self.ys = arrays['ys']
+        # A plain ndarray view of the memory map, since slicing a np.memmap costs more than the lookup itself
+        self.times = np.asarray(arrays['times'])
+        self._speed_list = self.speeds.tolist()
+        self._x_min, self._x_max = float(self.xs[0]), float(self.xs[-1])
+        self._y_max = float(self.ys[-1])
+        self._x_scale = (len(self.xs) - 1) / (self._x_max - self._x_min)
+        self._y_scale = (len(self.ys) - 1) / (self._y_max - float(self.ys[0]))
+        # Flat index offsets from (i, j) to (i, j), (i + 1, j), (i, j + 1) and (i + 1, j + 1)
+        self._corner_offsets = np.array([[0], [len(self.ys)], [1], [len(self.ys) + 1]])
+
+    def turn_radius(self, speed: float) -> float:
+        """The radius of the tightest circle the car can drive at this speed, without powersliding."""
+        position = min(max(abs(speed), 0.0), RADIUS_SPEEDS[-1]) / (RADIUS_SPEEDS[1] - RADIUS_SPEEDS[0])
+        i = min(int(position), len(RADIUS_SPEEDS) - 2)
+        fraction = position - i
+        return float(self.turn_radii[i] * (1 - fraction) + self.turn_radii[i + 1] * fraction)
+
+    def time_to_reach(self, x: float, y: float, speed: float, boost: bool = True) -> float:
+        """
+        Seconds to get to (x, y) relative to the car, driving forwards at speed to start with. Blended between
+        the grid points and speeds either side.
+        """
+        # The same sums as times_to_reach, without numpy's overhead on one number at a time
+        table = self.times[1 if boost else 0]
+        s, speed_fraction = self._speed_position(speed)
+        y = abs(y)
+        clamped_x = min(max(x, self._x_min), self._x_max)
+        clamped_y = min(y, self._y_max)
+        beyond = math.hypot(x - clamped_x, y - clamped_y) / MAX_CAR_SPEED
+
+        x_position = (clamped_x - self._x_min) * self._x_scale
+        y_position = clamped_y * self._y_scale
+        i = min(int(x_position), len(self.xs) - 2)
+        j = min(int(y_position), len(self.ys) - 2)
+        x_fraction = x_position - i
+        y_fraction = y_position - j
+
+        total = beyond
+        for grid, weight in ((table[s], 1 - speed_fraction), (table[s + 1], speed_fraction)):
+            corners = grid[i:i + 2, j:j + 2].tolist()
+            total += weight * ((corners[0][0] * (1 - x_fraction) + corners[1][0] * x_fraction) * (1 - y_fraction) +
+                               (corners[0][1] * (1 - x_fraction) + corners[1][1] * x_fraction) * y_fraction)
+        return total
+
+    def times_to_reach(self, xs: np.ndarray, ys: np.ndarray, speed: float, boost: bool = True) -> np.ndarray:
+        """time_to_reach for many targets at once."""
+        table = self.times[1 if boost else 0]
+        s, speed_fraction = self._speed_position(speed)
+
+        ys = np.abs(ys)
+        clamped_x = np.minimum(np.maximum(xs, self._x_min), self._x_max)
+        clamped_y = np.minimum(ys, self._y_max)
+        # The rest of the way from the edge of the grid, for anything outside it
+        beyond = np.hypot(xs - clamped_x, ys - clamped_y) / MAX_CAR_SPEED
+
+        x_position = (clamped_x - self._x_min) * self._x_scale
+        y_position = clamped_y * self._y_scale
+        i = np.minimum(x_position.astype(np.intp), len(self.xs) - 2)
+        j = np.minimum(y_position.astype(np.intp), len(self.ys) - 2)
+        x_fraction = x_position - i
+        y_fraction = y_position - j
+
+        # All four corners at both speeds in one gather, then one weighted sum
+        columns = len(self.ys)
+        corners = i * columns + j + self._corner_offsets
+        grids = table[s:s + 2].reshape(2, -1)
+        x_weights = np.stack([1 - x_fraction, x_fraction, 1 - x_fraction, x_fraction])
+        y_weights = np.stack([1 - y_fraction, 1 - y_fraction, y_fraction, y_fraction])
+        blended = (grids[:, corners] * (x_weights * y_weights)).sum(axis=1)
+        return blended[0] * (1 - speed_fraction) + blended[1] * speed_fraction + beyond
+
+    def _speed_position(self, speed: float):
+        # The index of the table speed at or below speed, and how far it is towards the next one
+        speed = min(max(speed, 0.0), self._speed_list[-1])
+        s = min(bisect_right(self._speed_list, speed) - 1, len(self._speed_list) - 2)
+        return s, (speed - self._speed_list[s]) / (self._speed_list[s + 1] - self._speed_list[s])
+
+
+def _curvatures(speeds: np.ndarray) -> np.ndarray:
+    return np.interp(np.abs(speeds), CURVATURE_SPEEDS, CURVATURES)
+
+
+TURN_RADII = 1 / _curvatures(RADIUS_SPEEDS)
+MIN_TURNING_RADIUS = 1 / float(np.interp(MIN_TURNING_SPEED, CURVATURE_SPEEDS, CURVATURES))
+
+
+def _drive(targets_x: np.ndarray, targets_y: np.ndarray, speeds: np.ndarray, boost: bool) -> np.ndarray:
+    # Drives a car at every target at once, every car starting at the origin facing +x. Cars are dropped from the
+    # arrays once they get there, so the later steps only work on the targets that are still being driven to.
+    dt = 1 / SIMULATION_RATE
+    times = np.full(len(targets_x), MAX_TIME)
+    remaining = np.arange(len(targets_x))
+    tx, ty, speed = targets_x.astype(np.float64), targets_y.astype(np.float64), speeds.astype(np.float64)
+    x, y, heading = np.zeros(len(tx)), np.zeros(len(tx)), np.zeros(len(tx))
+    for step in range(int(MAX_TIME * SIMULATION_RATE)):
+        dx, dy = tx - x, ty - y
+        arrived = np.hypot(dx, dy) < ARRIVAL_DISTANCE
+        if arrived.any():
+            times[remaining[arrived]] = step * dt
+            keep = ~arrived
+            remaining, tx, ty, speed, x, y, heading = (
+                a[keep] for a in (remaining, tx, ty, speed, x, y, heading))
+            dx, dy = dx[keep], dy[keep]
+            if len(remaining) == 0:
+                break
+        cos, sin = np.cos(heading), np.sin(heading)
+        ahead, beside = dx * cos + dy * sin, dy * cos - dx * sin
+        angle = np.arctan2(beside, ahead)
+        curvature = _curvatures(speed)
+        # The radius of the circle that leaves here going straight ahead and passes through the target, and the
+        # fastest we can go and still turn that tightly. Faster than that, brake while turning. If it would take
+        # slower than MIN_TURNING_SPEED, drive straight on until the target has fallen far enough behind us to
+        # turn around to.
+        needed_radius = (ahead ** 2 + beside ** 2) / np.maximum(2 * np.abs(beside), 1e-9)
+        turning_speed = np.interp(needed_radius, TURN_RADII, RADIUS_SPEEDS)
+        too_tight = needed_radius < MIN_TURNING_RADIUS
+        too_fast = ~too_tight & (speed > turning_speed)
+        steer = np.where(too_tight, 0, np.clip(angle * 4, -1, 1))
+        throttle_acceleration = np.where(speed < MAX_THROTTLE_SPEED,
+                                         THROTTLE_ACCELERATION * (1 - speed / MAX_THROTTLE_SPEED), 0)
+        acceleration = np.where(too_fast, -BRAKE_DECELERATION, throttle_acceleration)
+        if boost:
+            acceleration = acceleration + np.where(~too_fast & ~too_tight & (np.abs(angle) < 0.3),
+                                                   BOOST_ACCELERATION, 0)
+        speed = np.clip(speed + acceleration * dt, 0, MAX_CAR_SPEED)
+        heading = heading + steer * speed * curvature * dt
+        x = x + speed * np.cos(heading) * dt
+        y = y + speed * np.sin(heading) * dt
+    return times
+
+
+def _grid():
+    xs = np.arange(-GRID_REACH, GRID_REACH + 1, GRID_STEP, dtype=np.float64)
+    ys = np.arange(0, GRID_REACH + 1, GRID_STEP, dtype=np.float64)
+    speeds = np.append(np.arange(0, MAX_CAR_SPEED, SPEED_STEP, dtype=np.float64), MAX_CAR_SPEED)
+    return speeds, xs, ys
+
+
+def generate_times() -> np.ndarray:
+    """Simulates every grid point at every speed, with and without boost. Takes a few seconds."""
+    speeds, xs, ys = _grid()
+    grid_s, grid_x, grid_y = np.meshgrid(speeds, xs, ys, indexing='ij')
+    return np.stack([_drive(grid_x.ravel(), grid_y.ravel(), grid_s.ravel(), boost).reshape(grid_x.shape)
+                     for boost in (False, True)]).astype(np.float32)
+
+
+def _tables(times: np.ndarray) -> MotionTables:
+    # Everything but the times is quick to work out from the constants above
+    speeds, xs, ys = _grid()
+    return MotionTables({'turn_radii': TURN_RADII, 'speeds': speeds, 'xs': xs, 'ys': ys,
+                         'times': times})
+
+
+def generate_motion_tables() -> MotionTables:
+    """Makes the tables from scratch, without looking in or saving to the startup cache."""
+    return _tables(generate_times())
+
+
+_loaded: Dict[str, MotionTables] = {}
+
+
+def load_motion_tables(directory: str = DEFAULT_DIRECTORY) -> MotionTables:
+    """
+    Loads the tables from the startup cache in directory, or makes them (and tries to save them there) if they
+    aren't there yet. Each directory is only loaded once, however many bots ask for it.
+    """
+    tables = _loaded.get(directory)
+    if tables is None:
+        tables = _loaded[directory] = _tables(cached_array('motion_times', TABLES_VERSION, generate_times,
+                                                           directory=directory))
+    return tables
+
+
+def saved_motion_tables(directory: str = DEFAULT_DIRECTORY) -> Optional[MotionTables]:
+    """
+    The tables if they've already been loaded or are in the startup cache, otherwise None. Unlike
+    load_motion_tables this never builds them, so it's quick enough for initialize_agent.
+    """
+    if directory in _loaded or os.path.exists(cache_path('motion_times', TABLES_VERSION, directory=directory)):
+        return load_motion_tables(directory)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Make the turning radius and time to reach tables.')
+    parser.add_argument('--directory', default=DEFAULT_DIRECTORY, help='The startup cache to save them in')
+    args = parser.parse_args()
+    path = cache_path('motion_times', TABLES_VERSION, directory=args.directory)
+    if os.path.exists(path):
+        os.remove(path)
+    start = perf_counter()
+    tables = load_motion_tables(args.directory)
+    print(f'{tables.times.size} times in {perf_counter() - start:.1f}s, saved to {path}')
+    for speed in (0, 1000, 2300):
+        print(f'From {speed} uu/s: turn radius {tables.turn_radius(speed):.0f}, 2000 ahead '
+              f'{tables.time_to_reach(2000, 0, speed):.2f}s, 2000 behind {tables.time_to_reach(-2000, 0, speed):.2f}s, '
+              f'500 beside {tables.time_to_reach(0, 500, speed):.2f}s')
+
+
+if __name__ == '__main__':
+    main()
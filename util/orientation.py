@@ -1,6 +1,9 @@
 import math
+from typing import Dict, Tuple, Union
 
-from util.vec import Vec3
+import numpy as np
+
+from util.vec import Vec3, Vec3Array
 
 
 # This is a helper class for calculating directions relative to your car. You can extend it or delete if you want.
@@ -26,6 +29,35 @@ class Orientation:
         self.forward = Vec3(cp * cy, cp * sy, sp)
         self.right = Vec3(cy*sp*sr-cr*sy, sy*sp*sr+cr*cy, -cp*sr)
         self.up = Vec3(-cr*cy*sp-sr*sy, -cr*sy*sp+sr*cy, cp*cr)
+        self._matrix: np.ndarray = None
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Rows are forward, right and up, so matrix @ offset gives the same x, y, z as relative_location."""
+        if self._matrix is None:
+            self._matrix = np.array([[v.x, v.y, v.z] for v in (self.forward, self.right, self.up)])
+            self._matrix.flags.writeable = False
+        return self._matrix
+
+
+# Orientations handed out by orientation_of, keyed by (pitch, yaw, roll). A car's rotation changes nearly every
+# frame, so this only has to hold the cars of the current frame or two.
+_cache: Dict[Tuple[float, float, float], Orientation] = {}
+_CACHE_SIZE = 16
+
+
+def orientation_of(rotation) -> Orientation:
+    """
+    Same as Orientation(rotation), but asking again for the same rotation (e.g. the same car in the same frame)
+    gives back the first Orientation instead of doing the trig again. Don't modify what it returns.
+    """
+    key = (rotation.pitch, rotation.yaw, rotation.roll)
+    ori = _cache.get(key)
+    if ori is None:
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.clear()
+        ori = _cache[key] = Orientation(rotation)
+    return ori
 
 
 # Sometimes things are easier, when everything is seen from your point of view.
@@ -41,7 +73,22 @@ def relative_location(center: Vec3, ori: Orientation, target: Vec3) -> Vec3:
     * y: how far right
     * z: how far above
     """
-    x = (target - center).dot(ori.forward)
-    y = (target - center).dot(ori.right)
-    z = (target - center).dot(ori.up)
+    offset = target - center
+    x = offset.dot(ori.forward)
+    y = offset.dot(ori.right)
+    z = offset.dot(ori.up)
     return Vec3(x, y, z)
+
+
+def relative_locations(center: Vec3, ori: Orientation, targets: Union[Vec3Array, np.ndarray]) -> np.ndarray:
+    """
+    relative_location for many targets at once. targets is a Vec3Array or an (N, 3) array, and the result is an
+    (N, 3) array with one x, y, z row per target. The sums are done in the same order as relative_location so the
+    results match it exactly, which a BLAS matrix multiply wouldn't promise.
+    """
+    if isinstance(targets, Vec3Array):
+        targets = targets.data
+    offsets = targets - np.array([center.x, center.y, center.z])
+    ox, oy, oz = offsets[:, 0:1], offsets[:, 1:2], offsets[:, 2:3]
+    matrix = ori.matrix
+    return ox * matrix[:, 0] + oy * matrix[:, 1] + oz * matrix[:, 2]
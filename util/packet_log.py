@@ -0,0 +1,263 @@
+import ctypes
+import gzip
+import struct
+from typing import Iterator
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice
+from rlbot.utils.structures.game_data_struct import GameTickPacket, FieldInfoPacket, PlayerInfo, BallInfo, \
+    BoostPadState, BoostPad, GoalInfo, TileInfo, TeamInfo, Physics
+
+# A packet log is a gzip stream of records. Each record is a one byte kind and a four byte length, followed by
+# that many bytes. The first record is always START, the second FIELD_INFO, and every record after that is a TICK.
+#
+# Names are stored as utf-8 because c_wchar is 2 bytes on Windows and 4 on Linux, which means the raw packet
+# can't be copied between the two. Everything else that gets copied raw (physics, boost pads, goals, slices)
+# is made of floats, ints and padded bools, and has the same layout on both.
+LOG_MAGIC = b'RLBLOG'
+LOG_VERSION = 1
+
+START = 0
+FIELD_INFO = 1
+TICK = 2
+
+NAME_BYTES = 32
+
+RECORD_HEADER = struct.Struct('<BI')
+START_FORMAT = struct.Struct(f'<6sHii{NAME_BYTES}s')
+COUNTS_FORMAT = struct.Struct('<iiiiB')
+GAME_INFO_FORMAT = struct.Struct('<ff5?ffi')
+# physics, score info, is_demolished .. double_jumped, team, boost, hitbox, hitbox_offset, spawn_id, name
+CAR_FORMAT = struct.Struct(f'<12f7i6?Bi6fi{NAME_BYTES}s')
+# physics, latest touch, drop shot info, collision shape
+BALL_FORMAT = struct.Struct(f'<12f{NAME_BYTES}s7f2ififi6f')
+COUNT_FORMAT = struct.Struct('<i')
+
+
+def _raw(array, count: int, item_type) -> bytes:
+    return ctypes.string_at(ctypes.addressof(array), count * ctypes.sizeof(item_type))
+
+
+def _fill(array, data: bytes):
+    ctypes.memmove(ctypes.addressof(array), data, len(data))
+
+
+def _encode_name(name: str) -> bytes:
+    return name.encode('utf-8')[:NAME_BYTES]
+
+
+def _decode_name(data: bytes) -> str:
+    return data.rstrip(b'\0').decode('utf-8', errors='ignore')
+
+
+def _physics_values(physics: Physics):
+    location, rotation, velocity, angular_velocity = \
+        physics.location, physics.rotation, physics.velocity, physics.angular_velocity
+    return (location.x, location.y, location.z, rotation.pitch, rotation.yaw, rotation.roll,
+            velocity.x, velocity.y, velocity.z, angular_velocity.x, angular_velocity.y, angular_velocity.z)
+
+
+def _set_physics(physics: Physics, values):
+    physics.location.x, physics.location.y, physics.location.z, \
+        physics.rotation.pitch, physics.rotation.yaw, physics.rotation.roll, \
+        physics.velocity.x, physics.velocity.y, physics.velocity.z, \
+        physics.angular_velocity.x, physics.angular_velocity.y, physics.angular_velocity.z = values
+
+
+def encode_car(car: PlayerInfo) -> bytes:
+    score = car.score_info
+    return CAR_FORMAT.pack(
+        *_physics_values(car.physics),
+        score.score, score.goals, score.own_goals, score.assists, score.saves, score.shots, score.demolitions,
+        car.is_demolished, car.has_wheel_contact, car.is_super_sonic, car.is_bot, car.jumped, car.double_jumped,
+        car.team, car.boost,
+        car.hitbox.length, car.hitbox.width, car.hitbox.height,
+        car.hitbox_offset.x, car.hitbox_offset.y, car.hitbox_offset.z,
+        car.spawn_id, _encode_name(car.name))
+
+
+def decode_car(car: PlayerInfo, data: bytes, offset: int = 0):
+    values = CAR_FORMAT.unpack_from(data, offset)
+    _set_physics(car.physics, values[0:12])
+    score = car.score_info
+    score.score, score.goals, score.own_goals, score.assists, score.saves, score.shots, score.demolitions = \
+        values[12:19]
+    car.is_demolished, car.has_wheel_contact, car.is_super_sonic, car.is_bot, car.jumped, car.double_jumped = \
+        values[19:25]
+    car.team, car.boost = values[25:27]
+    car.hitbox.length, car.hitbox.width, car.hitbox.height = values[27:30]
+    car.hitbox_offset.x, car.hitbox_offset.y, car.hitbox_offset.z = values[30:33]
+    car.spawn_id = values[33]
+    car.name = _decode_name(values[34])
+
+
+def encode_ball(ball: BallInfo) -> bytes:
+    touch = ball.latest_touch
+    drop_shot = ball.drop_shot_info
+    shape = ball.collision_shape
+    return BALL_FORMAT.pack(
+        *_physics_values(ball.physics),
+        _encode_name(touch.player_name), touch.time_seconds,
+        touch.hit_location.x, touch.hit_location.y, touch.hit_location.z,
+        touch.hit_normal.x, touch.hit_normal.y, touch.hit_normal.z,
+        touch.team, touch.player_index,
+        drop_shot.absorbed_force, drop_shot.damage_index, drop_shot.force_accum_recent,
+        shape.type, shape.box.length, shape.box.width, shape.box.height, shape.sphere.diameter,
+        shape.cylinder.diameter, shape.cylinder.height)
+
+
+def decode_ball(ball: BallInfo, data: bytes, offset: int = 0):
+    values = BALL_FORMAT.unpack_from(data, offset)
+    _set_physics(ball.physics, values[0:12])
+    touch = ball.latest_touch
+    touch.player_name = _decode_name(values[12])
+    touch.time_seconds = values[13]
+    touch.hit_location.x, touch.hit_location.y, touch.hit_location.z = values[14:17]
+    touch.hit_normal.x, touch.hit_normal.y, touch.hit_normal.z = values[17:20]
+    touch.team, touch.player_index = values[20:22]
+    drop_shot = ball.drop_shot_info
+    drop_shot.absorbed_force, drop_shot.damage_index, drop_shot.force_accum_recent = values[22:25]
+    shape = ball.collision_shape
+    shape.type = values[25]
+    shape.box.length, shape.box.width, shape.box.height = values[26:29]
+    shape.sphere.diameter = values[29]
+    shape.cylinder.diameter, shape.cylinder.height = values[30:32]
+
+
+class PacketRecorder:
+    """
+    Writes every GameTickPacket and BallPrediction the bot sees to a compact log, which PacketLogReader can
+    play back later without the game. The ball prediction is only written when it has changed since the
+    previous tick. Call close when the match is over so the end of the gzip stream gets written.
+    """
+
+    def __init__(self, path: str, index: int, team: int, name: str, field_info: FieldInfoPacket):
+        self.file = gzip.open(path, 'wb', compresslevel=1)
+        self.ticks = 0
+        self._prediction_key = None
+        self._write(START, START_FORMAT.pack(LOG_MAGIC, LOG_VERSION, index, team, _encode_name(name)))
+        self._write(FIELD_INFO, b''.join([
+            COUNT_FORMAT.pack(field_info.num_boosts),
+            _raw(field_info.boost_pads, field_info.num_boosts, BoostPad),
+            COUNT_FORMAT.pack(field_info.num_goals),
+            _raw(field_info.goals, field_info.num_goals, GoalInfo),
+        ]))
+
+    def record_tick(self, packet: GameTickPacket, ball_prediction: BallPrediction):
+        num_slices = ball_prediction.num_slices
+        prediction_key = (num_slices, ball_prediction.slices[0].game_seconds) if num_slices > 0 else (0, 0.0)
+        new_prediction = prediction_key != self._prediction_key
+        self._prediction_key = prediction_key
+
+        game_info = packet.game_info
+        parts = [
+            COUNTS_FORMAT.pack(packet.num_cars, packet.num_boost, packet.num_tiles, packet.num_teams,
+                               new_prediction),
+            GAME_INFO_FORMAT.pack(game_info.seconds_elapsed, game_info.game_time_remaining, game_info.is_overtime,
+                                  game_info.is_unlimited_time, game_info.is_round_active,
+                                  game_info.is_kickoff_pause, game_info.is_match_ended,
+                                  game_info.world_gravity_z, game_info.game_speed, game_info.frame_num),
+            encode_ball(packet.game_ball),
+        ]
+        for i in range(packet.num_cars):
+            parts.append(encode_car(packet.game_cars[i]))
+        parts.append(_raw(packet.game_boosts, packet.num_boost, BoostPadState))
+        parts.append(_raw(packet.dropshot_tiles, packet.num_tiles, TileInfo))
+        parts.append(_raw(packet.teams, packet.num_teams, TeamInfo))
+        if new_prediction:
+            parts.append(COUNT_FORMAT.pack(num_slices))
+            parts.append(_raw(ball_prediction.slices, num_slices, Slice))
+        self._write(TICK, b''.join(parts))
+        self.ticks += 1
+
+    def _write(self, kind: int, payload: bytes):
+        self.file.write(RECORD_HEADER.pack(kind, len(payload)))
+        self.file.write(payload)
+
+    def close(self):
+        self.file.close()
+
+
+class PacketLogReader:
+    """
+    Reads a log written by PacketRecorder. index, team, name and field_info are available as soon as the log
+    is opened. Iterating yields the same GameTickPacket object every tick, updated in place the way the framework
+    does it, and ball_prediction holds the prediction that went with it.
+    """
+
+    def __init__(self, path: str):
+        self.file = gzip.open(path, 'rb')
+        magic, version, self.index, self.team, name = START_FORMAT.unpack(self._read(START))
+        if magic != LOG_MAGIC:
+            raise ValueError(f'{path} is not a packet log')
+        if version != LOG_VERSION:
+            raise ValueError(f'{path} is version {version} but this reader only understands version {LOG_VERSION}')
+        self.name = _decode_name(name)
+
+        self.field_info = FieldInfoPacket()
+        data = self._read(FIELD_INFO)
+        offset = 0
+        for array, item_type, count_name in ((self.field_info.boost_pads, BoostPad, 'num_boosts'),
+                                             (self.field_info.goals, GoalInfo, 'num_goals')):
+            count, = COUNT_FORMAT.unpack_from(data, offset)
+            offset += COUNT_FORMAT.size
+            size = count * ctypes.sizeof(item_type)
+            _fill(array, data[offset:offset + size])
+            offset += size
+            setattr(self.field_info, count_name, count)
+
+        self.packet = GameTickPacket()
+        self.ball_prediction = BallPrediction()
+
+    def _read(self, expected_kind: int = None) -> bytes:
+        header = self.file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        kind, length = RECORD_HEADER.unpack(header)
+        if expected_kind is not None and kind != expected_kind:
+            raise ValueError(f'Expected a record of kind {expected_kind} but found {kind}')
+        payload = self.file.read(length)
+        if len(payload) < length:
+            # The bot probably crashed in the middle of writing this tick.
+            return None
+        return payload
+
+    def __iter__(self) -> Iterator[GameTickPacket]:
+        packet = self.packet
+        while True:
+            try:
+                data = self._read(TICK)
+            except EOFError:
+                # The gzip stream was cut off without being closed.
+                return
+            if data is None:
+                return
+            num_cars, num_boost, num_tiles, num_teams, new_prediction = COUNTS_FORMAT.unpack_from(data, 0)
+            offset = COUNTS_FORMAT.size
+            game_info = packet.game_info
+            game_info.seconds_elapsed, game_info.game_time_remaining, game_info.is_overtime, \
+                game_info.is_unlimited_time, game_info.is_round_active, game_info.is_kickoff_pause, \
+                game_info.is_match_ended, game_info.world_gravity_z, game_info.game_speed, game_info.frame_num = \
+                GAME_INFO_FORMAT.unpack_from(data, offset)
+            offset += GAME_INFO_FORMAT.size
+            decode_ball(packet.game_ball, data, offset)
+            offset += BALL_FORMAT.size
+            for i in range(num_cars):
+                decode_car(packet.game_cars[i], data, offset)
+                offset += CAR_FORMAT.size
+            for array, count, item_type in ((packet.game_boosts, num_boost, BoostPadState),
+                                            (packet.dropshot_tiles, num_tiles, TileInfo),
+                                            (packet.teams, num_teams, TeamInfo)):
+                size = count * ctypes.sizeof(item_type)
+                _fill(array, data[offset:offset + size])
+                offset += size
+            packet.num_cars, packet.num_boost, packet.num_tiles, packet.num_teams = \
+                num_cars, num_boost, num_tiles, num_teams
+            if new_prediction:
+                num_slices, = COUNT_FORMAT.unpack_from(data, offset)
+                offset += COUNT_FORMAT.size
+                _fill(self.ball_prediction.slices, data[offset:offset + num_slices * ctypes.sizeof(Slice)])
+                self.ball_prediction.num_slices = num_slices
+            yield packet
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,40 @@
+"""
+Rocket League's arena and car numbers, for anything that needs to work out how the car or ball will move. They come
+from https://github.com/RLBot/RLBot/wiki/Useful-Game-Values. util/headless.py drives its stand-in game with them, and
+util/motion_tables.py uses them to work out how long the car takes to get places.
+"""
+from bisect import bisect_right
+
+SIDE_WALL_X = 4096
+BACK_WALL_Y = 5120
+CEILING_Z = 2044
+GOAL_HALF_WIDTH = 892.755
+GOAL_HEIGHT = 642.775
+BALL_RADIUS = 92.75
+GRAVITY = 650
+BALL_RESTITUTION = 0.6
+CAR_HEIGHT = 17.01
+MAX_CAR_SPEED = 2300
+MAX_THROTTLE_SPEED = 1410
+THROTTLE_ACCELERATION = 1600
+BOOST_ACCELERATION = 991.666
+BOOST_CONSUMPTION = 33.3
+COAST_DECELERATION = 525
+BRAKE_DECELERATION = 3500
+JUMP_SPEED = 292
+DODGE_SPEED = 500
+PAD_PICKUP_DISTANCE = {True: 208, False: 144}
+PAD_RESPAWN_TIME = {True: 10, False: 4}
+PAD_BOOST_AMOUNT = {True: 100, False: 12}
+# Path curvature (1 / turning radius) at full steer, by forward speed.
+CURVATURE_SPEEDS = [0, 500, 1000, 1500, 1750, 2300]
+CURVATURES = [0.0069, 0.00398, 0.00235, 0.001375, 0.0011, 0.00088]
+
+
+def curvature(speed: float) -> float:
+    """Linear interpolation of CURVATURES, clamped at both ends."""
+    speed = min(max(speed, 0.0), CURVATURE_SPEEDS[-1])
+    i = min(bisect_right(CURVATURE_SPEEDS, speed), len(CURVATURE_SPEEDS) - 1)
+    low, high = CURVATURE_SPEEDS[i - 1], CURVATURE_SPEEDS[i]
+    fraction = (speed - low) / (high - low)
+    return CURVATURES[i - 1] + fraction * (CURVATURES[i] - CURVATURES[i - 1])
@@ -0,0 +1,114 @@
+"""
+Runs the slow parts of planning on a background thread, so they don't add to the time get_output takes.
+
+Every tick, get_output hands the worker the latest packet and ball prediction with submit(), then picks up the
+newest finished plan with latest(). Neither call waits for the other side: submit() just replaces whatever the
+worker hasn't started on yet, and latest() reads whichever of the two plan slots was written last. The worker
+fills in the other slot and then flips which one is current, so a plan is never read half written.
+
+Plans are made from a packet that's already a tick or two old by the time they're read, so each one says which
+game time it was made for. latest() only hands back plans younger than max_age, and get_output should work things
+out itself, the old way, when there isn't one.
+
+The worker is a thread rather than a process. Copying a packet and a prediction into another process every tick
+would cost more than the planning saves, and the bot spends most of each tick waiting for the next packet anyway,
+which is when the worker gets to run.
+"""
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Generic, List, Optional, TypeVar
+
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+T = TypeVar('T')
+
+# Plans older than this many seconds of game time are ignored.
+DEFAULT_MAX_AGE = 0.05
+
+
+@dataclass
+class Plan(Generic[T]):
+    time: float  # Game time of the packet the plan was made from
+    planning_seconds: float  # How long making it took
+    value: T
+
+
+class PlanningWorker(Generic[T]):
+    """
+    Calls plan(packet, ball_prediction, context) on a background thread with the latest snapshot handed to submit,
+    and keeps what it returns as a Plan. The packet and prediction are the worker's own copies, but plan must not
+    touch anything else that get_output changes. Anything like that should be copied into context by the caller.
+    """
+
+    def __init__(self, plan: Callable[[GameTickPacket, BallPrediction, object], T], max_age: float = DEFAULT_MAX_AGE):
+        self.plan = plan
+        self.max_age = max_age
+        self.plans_made = 0
+        self.fresh_reads = 0
+        self.stale_reads = 0
+        self.errors = 0
+        self.last_error: Exception = None
+        self._condition = threading.Condition()
+        self._inbox = None
+        self._buffers: List[Optional[Plan[T]]] = [None, None]
+        self._front = 0
+        self._stopped = False
+        self._thread: threading.Thread = None
+
+    def start(self):
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='PlanningWorker', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, packet: GameTickPacket, ball_prediction: BallPrediction, context: object = None):
+        """Hands the worker a copy of this tick. If it hasn't got to the previous one yet, that one is dropped."""
+        snapshot = (type(packet).from_buffer_copy(packet), type(ball_prediction).from_buffer_copy(ball_prediction),
+                    context)
+        with self._condition:
+            self._inbox = snapshot
+            self._condition.notify()
+
+    def latest(self, now: float) -> Optional[Plan[T]]:
+        """The newest plan, or None if there isn't one yet or it was made more than max_age seconds before now."""
+        plan = self._buffers[self._front]
+        if plan is None or not 0 <= now - plan.time <= self.max_age:
+            self.stale_reads += 1
+            return None
+        self.fresh_reads += 1
+        return plan
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._inbox is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                snapshot, self._inbox = self._inbox, None
+            packet, ball_prediction, context = snapshot
+            start = perf_counter()
+            try:
+                value = self.plan(packet, ball_prediction, context)
+            except Exception as e:
+                # The plans just go stale and get_output works things out itself, so keep going.
+                self.errors += 1
+                self.last_error = e
+                continue
+            back = 1 - self._front
+            self._buffers[back] = Plan(packet.game_info.seconds_elapsed, perf_counter() - start, value)
+            self._front = back
+            self.plans_made += 1
+
+    def report(self) -> str:
+        return (f'{self.plans_made} plans made, {self.fresh_reads} ticks used one and {self.stale_reads} worked it '
+                f'out themselves, {self.errors} errors' + (f' (last: {self.last_error!r})' if self.errors else ''))
@@ -0,0 +1,85 @@
+import ctypes
+from typing import Any, Dict, Optional
+
+import numpy as np
+from rlbot.utils.structures.ball_prediction_struct import BallPrediction, Slice, MAX_SLICES
+from rlbot.utils.structures.game_data_struct import Physics
+
+# A Slice is nothing but floats, so the whole slices array can be read as a 2d float32 array with one row per
+# slice. These are the columns of that array.
+_FLOAT = ctypes.sizeof(ctypes.c_float)
+SLICE_FLOATS = ctypes.sizeof(Slice) // _FLOAT
+LOCATION_COLUMN = (Slice.physics.offset + Physics.location.offset) // _FLOAT
+ROTATION_COLUMN = (Slice.physics.offset + Physics.rotation.offset) // _FLOAT
+VELOCITY_COLUMN = (Slice.physics.offset + Physics.velocity.offset) // _FLOAT
+ANGULAR_VELOCITY_COLUMN = (Slice.physics.offset + Physics.angular_velocity.offset) // _FLOAT
+TIME_COLUMN = Slice.game_seconds.offset // _FLOAT
+
+# The ball prediction has 60 slices per second.
+SLICES_PER_SECOND = 60
+
+
+class BallPredictionArrays:
+    """
+    The ball prediction as numpy arrays, looking straight at the BallPrediction's memory instead of copying
+    each slice into Python objects. times has one entry per slice, and positions, velocities, rotations and
+    angular_velocities have one row of three per slice. The arrays are read-only.
+
+    memo is for anything worked out from this prediction (the first goal slice, etc.), so it only gets
+    worked out once even if the same prediction is handed to us several ticks in a row. See PredictionCache.
+    """
+
+    def __init__(self, ball_prediction: BallPrediction):
+        self.ball_prediction = ball_prediction
+        self.num_slices = ball_prediction.num_slices
+        table = np.frombuffer(ball_prediction.slices, dtype=np.float32).reshape(MAX_SLICES, SLICE_FLOATS)
+        table = table[:self.num_slices]
+        table.flags.writeable = False
+        self.table = table
+        self.times = table[:, TIME_COLUMN]
+        self.positions = table[:, LOCATION_COLUMN:LOCATION_COLUMN + 3]
+        self.rotations = table[:, ROTATION_COLUMN:ROTATION_COLUMN + 3]
+        self.velocities = table[:, VELOCITY_COLUMN:VELOCITY_COLUMN + 3]
+        self.angular_velocities = table[:, ANGULAR_VELOCITY_COLUMN:ANGULAR_VELOCITY_COLUMN + 3]
+        self.start_time = float(self.times[0]) if self.num_slices > 0 else 0.0
+        self.memo: Dict[str, Any] = {}
+
+    def __len__(self):
+        return self.num_slices
+
+    def slice(self, index: int) -> Slice:
+        """Returns the original ctypes Slice at index."""
+        return self.ball_prediction.slices[index]
+
+    def index_at_time(self, game_time: float) -> Optional[int]:
+        """Returns the index of the slice at the given game time, or None if it's outside the prediction."""
+        approx_index = int((game_time - self.start_time) * SLICES_PER_SECOND)
+        if 0 <= approx_index < self.num_slices:
+            return approx_index
+        return None
+
+
+class PredictionCache:
+    """
+    Hands out a BallPredictionArrays for the latest ball prediction. If the prediction hasn't changed since
+    the last call (same struct, same number of slices, same first slice time), the same object comes back,
+    along with everything in its memo.
+    """
+
+    def __init__(self):
+        self.arrays: BallPredictionArrays = None
+        self._key = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, ball_prediction: BallPrediction) -> BallPredictionArrays:
+        num_slices = ball_prediction.num_slices
+        key = (ctypes.addressof(ball_prediction), num_slices,
+               ball_prediction.slices[0].game_seconds if num_slices > 0 else None)
+        if key == self._key:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.arrays = BallPredictionArrays(ball_prediction)
+            self._key = key
+        return self.arrays
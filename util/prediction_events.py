@@ -0,0 +1,123 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from util.ball_prediction_analysis import GOAL_THRESHOLD, height_below, matching_windows
+from util.physics import BACK_WALL_Y, BALL_RADIUS, CEILING_Z, SIDE_WALL_X
+from util.prediction_arrays import BallPredictionArrays
+
+# How close the ball's surface has to be to a surface when its velocity flips for us to call it a contact.
+CONTACT_MARGIN = 40
+
+# A car that stays on the ground can hit the ball while the ball's center is below this. Same as ball_grounded.
+GROUND_REACH_HEIGHT = 150
+
+
+@dataclass
+class Contact:
+    index: int  # The first slice after the contact
+    time: float
+    x: float
+    y: float
+    z: float
+
+
+@dataclass
+class GoalCrossing:
+    index: int  # The first slice past the goal line
+    time: float  # When the ball reaches the goal line, interpolated between slices
+    x: float  # Where along the goal line, also interpolated
+    z: float
+    team: int  # Whose goal it is. Blue (0) defends negative y.
+
+
+@dataclass
+class PredictionEvents:
+    """
+    Everything interesting that happens in one ball prediction. Each list is in time order. Build it with
+    prediction_events, which only does the work once per prediction.
+    """
+    bounces: List[Contact] = field(default_factory=list)
+    wall_hits: List[Contact] = field(default_factory=list)
+    ceiling_hits: List[Contact] = field(default_factory=list)
+    goal_crossings: List[GoalCrossing] = field(default_factory=list)
+    # Runs of slices (first index, index after the last) where a grounded car could reach the ball.
+    reachable_windows: List[Tuple[int, int]] = field(default_factory=list)
+    _goals_by_team: List[Optional[GoalCrossing]] = field(default_factory=lambda: [None, None])
+    _bounce_times: List[float] = field(default_factory=list)
+
+    @property
+    def first_goal(self) -> Optional[GoalCrossing]:
+        return self.goal_crossings[0] if self.goal_crossings else None
+
+    def goal_into(self, team: int) -> Optional[GoalCrossing]:
+        """The first time the ball goes into the given team's goal, or None."""
+        return self._goals_by_team[team]
+
+    def next_bounce(self, game_time: float) -> Optional[Contact]:
+        """The first floor bounce after the given game time, or None."""
+        i = bisect_right(self._bounce_times, game_time)
+        return self.bounces[i] if i < len(self.bounces) else None
+
+
+def _contacts(prediction: BallPredictionArrays, flips: np.ndarray) -> List[Contact]:
+    # flips[i] is about the change between slice i and slice i + 1
+    contacts = []
+    for i in np.flatnonzero(flips).tolist():
+        x, y, z = prediction.positions[i + 1].tolist()
+        contacts.append(Contact(i + 1, float(prediction.times[i + 1]), x, y, z))
+    return contacts
+
+
+def find_events(prediction: BallPredictionArrays) -> PredictionEvents:
+    events = PredictionEvents()
+    if len(prediction) == 0:
+        return events
+    positions = prediction.positions
+    velocities = prediction.velocities
+    times = prediction.times
+
+    before, after = velocities[:-1], velocities[1:]
+    where = positions[1:]
+    near = BALL_RADIUS + CONTACT_MARGIN
+    events.bounces = _contacts(prediction, (before[:, 2] < 0) & (after[:, 2] >= 0) & (where[:, 2] < near))
+    events.ceiling_hits = _contacts(prediction, (before[:, 2] > 0) & (after[:, 2] <= 0) &
+                                    (where[:, 2] > CEILING_Z - near))
+    side_wall = (np.sign(before[:, 0]) != np.sign(after[:, 0])) & (np.abs(where[:, 0]) > SIDE_WALL_X - near)
+    back_wall = (np.sign(before[:, 1]) != np.sign(after[:, 1])) & (np.abs(where[:, 1]) > BACK_WALL_Y - near) & \
+                (np.abs(where[:, 1]) < GOAL_THRESHOLD)
+    events.wall_hits = _contacts(prediction, side_wall | back_wall)
+    events._bounce_times = [bounce.time for bounce in events.bounces]
+
+    depth = np.abs(positions[:, 1])
+    past_line = depth >= GOAL_THRESHOLD
+    # Slices where the ball goes from in front of the goal line to past it, plus the first slice if it's already in.
+    crossing_indices = np.flatnonzero(past_line[1:] & ~past_line[:-1]) + 1
+    if past_line[0]:
+        crossing_indices = np.concatenate(([0], crossing_indices))
+    for i in crossing_indices.tolist():
+        x, y, z = positions[i].tolist()
+        time = float(times[i])
+        if i > 0:
+            last_x, last_y, last_z = positions[i - 1].tolist()
+            fraction = (GOAL_THRESHOLD - abs(last_y)) / (abs(y) - abs(last_y))
+            time = float(times[i - 1]) + fraction * (time - float(times[i - 1]))
+            x = last_x + fraction * (x - last_x)
+            z = last_z + fraction * (z - last_z)
+        crossing = GoalCrossing(i, time, x, z, 0 if y < 0 else 1)
+        events.goal_crossings.append(crossing)
+        if events._goals_by_team[crossing.team] is None:
+            events._goals_by_team[crossing.team] = crossing
+
+    events.reachable_windows = matching_windows(prediction, height_below(GROUND_REACH_HEIGHT))
+    return events
+
+
+def prediction_events(prediction: BallPredictionArrays) -> PredictionEvents:
+    """Returns the events in this prediction, working them out only the first time it's asked."""
+    events = prediction.memo.get('events')
+    if events is None:
+        events = prediction.memo['events'] = find_events(prediction)
+    return events
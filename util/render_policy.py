@@ -0,0 +1,68 @@
+from typing import Callable, Tuple, Union
+
+# Render every tick, like the bot always used to.
+RENDER_ALWAYS = 'always'
+# Never render. Use this for real matches, where nobody is looking at the debug drawing anyway.
+RENDER_OFF = 'off'
+# Render once every `interval` ticks.
+RENDER_DECIMATE = 'decimate'
+# Render only when a label changes, or a number moves by more than `threshold` since the last time we rendered.
+RENDER_CHANGES = 'changes'
+
+RENDER_MODES = [RENDER_ALWAYS, RENDER_OFF, RENDER_DECIMATE, RENDER_CHANGES]
+
+
+class RenderPolicy:
+    """
+    Decides which ticks the debug drawing gets sent on. Everything the bot draws is serialized and sent to the
+    framework, so skipping ticks where nothing interesting changed keeps that cost down. The bot draws into its
+    own render group, which stays on screen until it is drawn again, so a skipped tick still shows the last drawing.
+    """
+
+    def __init__(self, mode: str = RENDER_ALWAYS, interval: int = 1, threshold: float = 50.0):
+        if mode not in RENDER_MODES:
+            raise ValueError(f'Unknown render mode {mode}, expected one of {RENDER_MODES}')
+        self.mode = mode
+        self.interval = max(1, interval)
+        self.threshold = threshold
+        self._ticks_since_render = self.interval
+        self._last_labels: Tuple = None
+        self._last_values: Tuple = ()
+
+    @property
+    def enabled(self) -> bool:
+        """False when nothing will ever be drawn, so the caller can skip building the arguments to should_render."""
+        return self.mode != RENDER_OFF
+
+    def should_render(self, labels: Union[Tuple, Callable[[], Tuple]] = (),
+                      values: Union[Tuple, Callable[[], Tuple]] = ()) -> bool:
+        """
+        Call this once per tick. labels are compared exactly and values (locations, speeds, ...) are compared
+        against the threshold, but only in the 'changes' mode. Either can be a function that returns the tuple
+        instead, so anything expensive in it is only worked out when it will actually be compared.
+        """
+        if self.mode == RENDER_ALWAYS:
+            return True
+        if self.mode == RENDER_OFF:
+            return False
+        if self.mode == RENDER_DECIMATE:
+            self._ticks_since_render += 1
+            if self._ticks_since_render < self.interval:
+                return False
+            self._ticks_since_render = 0
+            return True
+
+        if callable(labels):
+            labels = labels()
+        if callable(values):
+            values = values()
+        if labels == self._last_labels and len(values) == len(self._last_values):
+            threshold = self.threshold
+            for value, last_value in zip(values, self._last_values):
+                if abs(value - last_value) > threshold:
+                    break
+            else:
+                return False
+        self._last_labels = labels
+        self._last_values = values
+        return True
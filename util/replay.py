@@ -0,0 +1,132 @@
+"""
+Plays a packet log recorded by the bot (see record_packets in bot.cfg) back through MyBot with no game running.
+Run it from the bot's folder:
+
+    python -m util.replay recordings/Bot1000-0-20260101-120000.rlblog --controls controls.csv
+
+It prints how many ticks per second get_output managed, counting only the time spent inside get_output.
+"""
+import argparse
+import csv
+from dataclasses import dataclass
+from time import perf_counter
+from typing import List, Tuple
+
+from rlbot.agents.base_agent import SimpleControllerState
+from rlbot.utils.rendering.rendering_manager import RenderingManager, DEFAULT_GROUP_ID
+
+from util.packet_log import PacketLogReader
+
+CONTROL_FIELDS = ['throttle', 'steer', 'pitch', 'yaw', 'roll', 'jump', 'boost', 'handbrake', 'use_item']
+
+
+class NullRenderer(RenderingManager):
+    """
+    Takes every draw call and throws it away, so the bot can render as usual without the RLBot dll.
+    It counts the calls so you can see how much drawing the bot would have sent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.draw_calls = 0
+
+    def begin_rendering(self, group_id: str = DEFAULT_GROUP_ID):
+        self.touched_group_ids.add(group_id)
+        self.group_id = group_id
+        self.render_state = True
+
+    def end_rendering(self):
+        self.render_state = False
+
+    def draw_line_3d(self, vec1, vec2, color):
+        self.draw_calls += 1
+        return self
+
+    def draw_polyline_3d(self, vectors, color):
+        self.draw_calls += 1
+        return self
+
+    def draw_rect_2d(self, x, y, width, height, filled, color):
+        self.draw_calls += 1
+        return self
+
+    def draw_rect_3d(self, vec, width, height, filled, color, centered=False):
+        self.draw_calls += 1
+        return self
+
+    def draw_string_2d(self, x, y, scale_x, scale_y, text, color):
+        self.draw_calls += 1
+        return self
+
+    def draw_string_3d(self, vec, scale_x, scale_y, text, color):
+        self.draw_calls += 1
+        return self
+
+
+@dataclass
+class ReplayResult:
+    ticks: int
+    seconds_in_get_output: float
+    draw_calls: int
+    controls: List[Tuple]
+
+    @property
+    def ticks_per_second(self) -> float:
+        return self.ticks / self.seconds_in_get_output if self.seconds_in_get_output > 0 else 0.0
+
+
+def control_values(controls: SimpleControllerState) -> Tuple:
+    return tuple(getattr(controls, field) for field in CONTROL_FIELDS)
+
+
+def replay(path: str, bot_class=None) -> ReplayResult:
+    """Feeds every tick in the log to a fresh bot and collects the controls it returns."""
+    if bot_class is None:
+        from bot import MyBot
+        bot_class = MyBot
+
+    reader = PacketLogReader(path)
+    bot = bot_class(reader.name, reader.team, reader.index)
+    renderer = NullRenderer()
+    bot._register_field_info(lambda: reader.field_info)
+    bot._register_ball_prediction_struct(lambda: reader.ball_prediction)
+    bot._set_renderer(renderer)
+    bot.initialize_agent()
+
+    controls = []
+    elapsed = 0.0
+    for packet in reader:
+        renderer.begin_rendering()
+        start = perf_counter()
+        output = bot.get_output(packet)
+        elapsed += perf_counter() - start
+        renderer.end_rendering()
+        controls.append(control_values(output))
+    reader.close()
+    if hasattr(bot, 'retire'):
+        bot.retire()
+    return ReplayResult(len(controls), elapsed, renderer.draw_calls, controls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a packet log through MyBot with no game running.')
+    parser.add_argument('log', help='A .rlblog file written with record_packets turned on')
+    parser.add_argument('--repeat', type=int, default=1, help='Replay the log this many times')
+    parser.add_argument('--controls', help='Write the controls from the last run to this csv file')
+    args = parser.parse_args()
+
+    result = None
+    for run in range(args.repeat):
+        result = replay(args.log)
+        print(f'run {run + 1}: {result.ticks} ticks in {result.seconds_in_get_output:.3f} s '
+              f'= {result.ticks_per_second:.0f} ticks/s, {result.draw_calls} draw calls')
+
+    if args.controls and result is not None:
+        with open(args.controls, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(CONTROL_FIELDS)
+            writer.writerows(result.controls)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Starting positions for util/headless.py to run the bot from. Everything is written from blue's point of view
+(our goal at negative y) and gets mirrored when the bot plays orange, so a scenario means the same thing for
+either team.
+"""
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.headless import STANDARD_BOOST_PADS
+from util.physics import BALL_RADIUS, CAR_HEIGHT
+from util.vec import Vec3
+
+# Where blue spawns for a kickoff, and which way it faces. These are the spots op_kickoffs in bot.py looks for.
+KICKOFF_SPAWNS = {
+    'back center': (Vec3(0, -4608, CAR_HEIGHT), math.pi / 2),
+    'back right': (Vec3(-256, -3840, CAR_HEIGHT), math.pi / 2),
+    'back left': (Vec3(256, -3840, CAR_HEIGHT), math.pi / 2),
+    'diagonal right': (Vec3(-2048, -2560, CAR_HEIGHT), math.pi / 4),
+    'diagonal left': (Vec3(2048, -2560, CAR_HEIGHT), 3 * math.pi / 4),
+}
+
+
+@dataclass
+class CarStart:
+    location: Vec3
+    yaw: float
+    velocity: Vec3 = field(default_factory=Vec3)
+    boost: int = 33
+
+
+@dataclass
+class Scenario:
+    """
+    Where our car (index 0), one opponent (index 1) and the ball start. empty_pads maps boost pad index to how
+    many seconds it's already been empty; every other pad starts active.
+    """
+    name: str
+    car: CarStart
+    opponent: CarStart
+    ball_location: Vec3
+    ball_velocity: Vec3 = field(default_factory=Vec3)
+    kickoff: bool = False
+    empty_pads: Dict[int, float] = field(default_factory=dict)
+
+    def apply(self, packet: GameTickPacket, team: int):
+        """Sets up the packet for this scenario, with the bot on the given team. Game time is left alone."""
+        flip = -1 if team == 1 else 1
+        packet.num_cars = 2
+        for index, (start, car_team) in enumerate(((self.car, team), (self.opponent, 1 - team))):
+            car = packet.game_cars[index]
+            car.team = car_team
+            car.boost = start.boost
+            car.has_wheel_contact = start.location.z <= CAR_HEIGHT + 1
+            car.jumped = car.double_jumped = car.is_demolished = False
+            _set_vector(car.physics.location, start.location, flip)
+            _set_vector(car.physics.velocity, start.velocity, flip)
+            yaw = start.yaw if flip == 1 else start.yaw + math.pi
+            car.physics.rotation.yaw = (yaw + math.pi) % (2 * math.pi) - math.pi
+            car.physics.rotation.pitch = car.physics.rotation.roll = 0
+            car.physics.angular_velocity.x = car.physics.angular_velocity.y = car.physics.angular_velocity.z = 0
+        ball = packet.game_ball
+        _set_vector(ball.physics.location, self.ball_location, flip)
+        _set_vector(ball.physics.velocity, self.ball_velocity, flip)
+        ball.latest_touch.player_index = -1
+        packet.num_boost = len(STANDARD_BOOST_PADS)
+        for i in range(packet.num_boost):
+            # Mirroring the field swaps each pad with its opposite, and the pads are listed so that's index 33 - i.
+            empty_for = self.empty_pads.get(i if flip == 1 else packet.num_boost - 1 - i)
+            packet.game_boosts[i].is_active = empty_for is None
+            packet.game_boosts[i].timer = empty_for or 0
+        packet.game_info.is_kickoff_pause = self.kickoff
+        packet.game_info.is_match_ended = False
+
+
+def _set_vector(target, source: Vec3, flip: int):
+    target.x, target.y, target.z = source.x * flip, source.y * flip, source.z
+
+
+def _mirror(start: CarStart) -> CarStart:
+    # The same spot on the other half of the field, facing the other way.
+    return CarStart(Vec3(-start.location.x, -start.location.y, start.location.z), start.yaw + math.pi,
+                    Vec3(-start.velocity.x, -start.velocity.y, start.velocity.z), start.boost)
+
+
+def _facing(location: Vec3, target: Vec3) -> float:
+    return math.atan2(target.y - location.y, target.x - location.x)
+
+
+def _car_near(rng: random.Random, ball: Vec3, behind_y: float, spread: float = 1500, boost: int = None) -> CarStart:
+    # A car somewhere on the given side of the ball (behind_y < 0 is between the ball and our goal), facing it.
+    x = max(min(ball.x + rng.uniform(-spread, spread), 3800), -3800)
+    y = max(min(ball.y + behind_y * rng.uniform(500, spread), 4900), -4900)
+    location = Vec3(x, y, CAR_HEIGHT)
+    boost = rng.randint(0, 100) if boost is None else boost
+    return CarStart(location, _facing(location, ball), boost=boost)
+
+
+def kickoff_scenarios() -> List[Scenario]:
+    """One kickoff from each spawn, against an opponent on the mirrored spawn."""
+    scenarios = []
+    for name, (location, yaw) in KICKOFF_SPAWNS.items():
+        car = CarStart(location, yaw)
+        scenarios.append(Scenario(f'kickoff {name}', car, _mirror(car), Vec3(0, 0, BALL_RADIUS), kickoff=True))
+    return scenarios
+
+
+def shot_scenario(rng: random.Random, on_own_goal: bool) -> Scenario:
+    """The ball heading for a goal at 1500 to 2500 uu/s, with us and the opponent trailing it."""
+    direction = -1 if on_own_goal else 1
+    ball = Vec3(rng.uniform(-2000, 2000), direction * rng.uniform(500, 2500), rng.uniform(BALL_RADIUS, 400))
+    aim = Vec3(rng.uniform(-700, 700), direction * 5200, BALL_RADIUS)
+    velocity = (aim - ball).rescale(rng.uniform(1500, 2500))
+    velocity.z = rng.uniform(0, 300)
+    # Whoever is attacking is behind the ball, the defender is further from their goal than they'd like.
+    car = _car_near(rng, ball, -direction)
+    opponent = _car_near(rng, ball, -direction)
+    name = 'shot on own goal' if on_own_goal else 'shot on opponent goal'
+    return Scenario(name, car, opponent, ball, velocity)
+
+
+def corner_scenario(rng: random.Random, own_corner: bool) -> Scenario:
+    """The ball rolling slowly in a corner, with both cars coming from mid-field."""
+    side = rng.choice((-1, 1))
+    direction = -1 if own_corner else 1
+    ball = Vec3(side * rng.uniform(3300, 3800), direction * rng.uniform(4200, 4800), BALL_RADIUS)
+    velocity = Vec3(rng.uniform(-300, 300), rng.uniform(-300, 300), 0)
+    car = _car_near(rng, ball, -direction, spread=3000)
+    opponent = _car_near(rng, ball, -direction, spread=3000)
+    name = 'corner own half' if own_corner else 'corner opponent half'
+    return Scenario(name, car, opponent, ball, velocity)
+
+
+def boost_starved_scenario(rng: random.Random) -> Scenario:
+    """We have no boost, every big pad and most of the small ones have just been taken."""
+    ball = Vec3(rng.uniform(-3000, 3000), rng.uniform(-3000, 3000), BALL_RADIUS)
+    car = _car_near(rng, ball, -1, spread=3000, boost=0)
+    opponent = _car_near(rng, ball, 1, spread=3000)
+    empty_pads = {i: rng.uniform(0, 3) for i, (_, _, _, is_full) in enumerate(STANDARD_BOOST_PADS)
+                  if is_full or rng.random() < 0.7}
+    return Scenario('boost starved', car, opponent, ball, Vec3(rng.uniform(-500, 500), rng.uniform(-500, 500), 0),
+                    empty_pads=empty_pads)
+
+
+def all_scenarios(rng: random.Random) -> List[Scenario]:
+    """Every kickoff, plus one of each of the randomly placed scenarios."""
+    return kickoff_scenarios() + [
+        shot_scenario(rng, on_own_goal=True),
+        shot_scenario(rng, on_own_goal=False),
+        corner_scenario(rng, own_corner=True),
+        corner_scenario(rng, own_corner=False),
+        boost_starved_scenario(rng),
+    ]
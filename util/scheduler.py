@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Dict, Hashable, TypeVar
+
+from util.tick_profiler import DEFAULT_TICK_BUDGET
+
+T = TypeVar('T')
+
+# The fraction of the tick budget the smoothed tick time has to pass before tasks are slowed down, and drop below
+# before they are sped back up. The gap between the two keeps the rates from flapping back and forth.
+HIGH_LOAD = 0.75
+LOW_LOAD = 0.4
+# How much each new tick counts towards the smoothed tick time.
+SMOOTHING = 0.1
+# Ticks to wait after changing the rates before changing them again, so the smoothed time can catch up.
+SLOW_DOWN_DELAY = 30
+SPEED_UP_DELAY = 240
+# Each level halves the rate of every task, down to that task's min_rate.
+MAX_LEVEL = 3
+
+
+@dataclass
+class Task:
+    name: str
+    rate: float  # Runs per second when there's time to spare
+    min_rate: float  # The slowest it's allowed to go when ticks run long
+    last_run: float = None
+    last_key: Hashable = None
+    result: object = None
+    runs: int = 0
+
+
+class TaskScheduler:
+    """
+    Runs parts of get_output less often than every tick. Each task is added with the rate it needs, and run()
+    only calls its function when the task is due, handing back the last result in between. Anything that isn't
+    added as a task (steering, sequences) still runs every tick.
+
+    Call begin_tick and end_tick around get_output so the scheduler knows how long ticks are taking. When they
+    get close to the budget every task is slowed down a level, and when there's plenty of time left they are sped
+    back up. When enabled is False every task runs every tick, the same as without a scheduler.
+    """
+
+    def __init__(self, enabled: bool = False, tick_budget: float = DEFAULT_TICK_BUDGET):
+        self.enabled = enabled
+        self.tick_budget = tick_budget
+        self.tasks: Dict[str, Task] = {}
+        self.level = 0
+        self.tick_time = 0.0  # Smoothed seconds per tick
+        self.level_changes = 0
+        self._ticks_since_change = 0
+        self._tick_start = 0.0
+
+    def add(self, name: str, rate: float, min_rate: float = None):
+        self.tasks[name] = Task(name, rate, rate if min_rate is None else min(min_rate, rate))
+
+    def rate(self, name: str) -> float:
+        """The rate the task runs at right now, after any slowing down."""
+        task = self.tasks[name]
+        return max(task.rate / 2 ** self.level, task.min_rate)
+
+    def due(self, name: str, now: float, key: Hashable = None) -> bool:
+        """
+        Returns whether the task should run this tick, and if so counts it as run. It's always due the first time,
+        when key is different from last time, and when the game clock goes backwards (a new match or a replay).
+        """
+        task = self.tasks[name]
+        if self.enabled and task.last_run is not None and key == task.last_key:
+            # Half a tick of slack, so a 30 Hz task runs every 4th tick even though the game clock is a float32.
+            since = now - task.last_run
+            if 0 <= since < 1 / self.rate(name) - 1 / 240:
+                return False
+        task.last_run = now
+        task.last_key = key
+        task.runs += 1
+        return True
+
+    def run(self, name: str, now: float, compute: Callable[[], T], key: Hashable = None) -> T:
+        """Returns compute() if the task is due (see due), otherwise whatever it returned the last time it ran."""
+        task = self.tasks[name]
+        if self.due(name, now, key):
+            task.result = compute()
+        return task.result
+
+    def begin_tick(self):
+        if self.enabled:
+            self._tick_start = perf_counter()
+
+    def end_tick(self):
+        if not self.enabled:
+            return
+        elapsed = perf_counter() - self._tick_start
+        self.tick_time += (elapsed - self.tick_time) * SMOOTHING
+        self._ticks_since_change += 1
+        load = self.tick_time / self.tick_budget
+        if load > HIGH_LOAD and self.level < MAX_LEVEL and self._ticks_since_change >= SLOW_DOWN_DELAY:
+            self._change_level(1)
+        elif load < LOW_LOAD and self.level > 0 and self._ticks_since_change >= SPEED_UP_DELAY:
+            self._change_level(-1)
+
+    def _change_level(self, change: int):
+        self.level += change
+        self.level_changes += 1
+        self._ticks_since_change = 0
+
+    def report(self) -> str:
+        lines = [f'Task rates at level {self.level} of {MAX_LEVEL}, changed {self.level_changes} times, '
+                 f'{self.tick_time * 1000:.3f} ms per tick lately']
+        for task in self.tasks.values():
+            lines.append(f'{task.name:<22}{self.rate(task.name):>6.0f} Hz (max {task.rate:.0f}){task.runs:>9} runs')
+        return '\n'.join(lines)
+
+    def reset(self):
+        for task in self.tasks.values():
+            task.last_run = task.last_key = task.result = None
+            task.runs = 0
+        self.level = 0
+        self.tick_time = 0.0
+        self.level_changes = 0
+        self._ticks_since_change = 0
@@ -1,5 +1,6 @@
+import math
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
 
 from rlbot.agents.base_agent import SimpleControllerState
 from rlbot.utils.structures.game_data_struct import GameTickPacket
@@ -31,12 +32,15 @@ class ControlStep(Step):
         self.duration = duration
         self.controls = controls
         self.start_time: float = None
+        # The only two results this step can give, made once instead of every frame.
+        self._running = StepResult(controls=controls, done=False)
+        self._finished = StepResult(controls=controls, done=True)
 
     def tick(self, packet: GameTickPacket) -> StepResult:
         if self.start_time is None:
             self.start_time = packet.game_info.seconds_elapsed
         elapsed_time = packet.game_info.seconds_elapsed - self.start_time
-        return StepResult(controls=self.controls, done=elapsed_time > self.duration)
+        return self._finished if elapsed_time > self.duration else self._running
 
 
 class Sequence:
@@ -61,3 +65,99 @@ class Sequence:
         # If we reach here, we ran out of steps to attempt.
         self.done = True
         return None
+
+
+# The rate the framework calls get_output at, which is maximum_tick_rate_preference in bot.cfg. Timelines are built
+# before the bot is running, so this can't be read from the game. Playback goes by the game clock, not by counting
+# calls, so if ticks come in slower than this every step still lasts as long as it should.
+TICK_RATE = 120
+
+
+class Timeline:
+    """
+    A list of ControlSteps compiled ahead of time, for maneuvers that are just controls held for fixed durations
+    (flips, kickoffs). Build it once, e.g. as a module level constant, and start it with play() each time it's
+    needed. Nothing in it changes after it's built, so one Timeline can be played any number of times.
+
+    Every tick of the maneuver gets an entry in a table of which step it belongs to, so looking up the controls
+    is one index no matter how many steps there are. Durations are rounded up to whole ticks, plus one: a
+    ControlStep holds its controls through the tick where it notices its duration has passed, so the table is
+    laid out the same way and maneuvers tuned with Sequence play back the same. That also means even a 0.01 second
+    step always gets its ticks. (Sequence was a coin toss when a duration was an exact number of ticks, because
+    the game clock is a float32. Here it's always the shorter of the two.)
+    """
+    __slots__ = [
+        'controls',
+        'step_starts',
+        'tick_steps',
+        'tick_rate'
+    ]
+
+    def __init__(self, steps: List[ControlStep], tick_rate: int = TICK_RATE):
+        self.tick_rate = tick_rate
+        self.controls: Tuple[SimpleControllerState, ...] = tuple(step.controls for step in steps)
+        starts = []
+        tick_steps = []
+        for index, step in enumerate(steps):
+            starts.append(len(tick_steps))
+            # The small epsilon keeps durations like 0.05 s (exactly 6 ticks) from rounding up to 7.
+            tick_steps.extend([index] * (math.ceil(step.duration * tick_rate - 1e-6) + 1))
+        self.step_starts: Tuple[int, ...] = tuple(starts)
+        self.tick_steps: Tuple[int, ...] = tuple(tick_steps)
+
+    def __len__(self):
+        """The number of ticks the timeline lasts."""
+        return len(self.tick_steps)
+
+    def step_at(self, elapsed_time: float) -> Optional[int]:
+        """The index of the step that's playing elapsed_time seconds in, or None once the timeline is over."""
+        tick = int(elapsed_time * self.tick_rate + 0.5)
+        if tick < len(self.tick_steps):
+            return self.tick_steps[max(tick, 0)]
+        return None
+
+    def play(self) -> 'TimelinePlayback':
+        return TimelinePlayback(self)
+
+
+class TimelinePlayback:
+    """
+    One run through a Timeline. It can be used anywhere a Sequence is (it has tick and done), and starts the
+    first time it's ticked.
+
+    Like Sequence, it moves on at most one step per tick. If frames are dropped and the clock jumps past the
+    whole of the next step (a 0.01 second jump release, say), that step starts now and gets all of its ticks,
+    and everything after it moves back to match.
+    """
+    __slots__ = [
+        'timeline',
+        'start_time',
+        'step',
+        'done'
+    ]
+
+    def __init__(self, timeline: Timeline):
+        self.timeline = timeline
+        self.start_time: float = None
+        self.step = 0
+        self.done = False
+
+    def tick(self, packet: GameTickPacket) -> Optional[SimpleControllerState]:
+        now = packet.game_info.seconds_elapsed
+        if self.start_time is None:
+            self.start_time = now
+        timeline = self.timeline
+        tick = int((now - self.start_time) * timeline.tick_rate + 0.5)
+        next_step = self.step + 1
+        if next_step < len(timeline.step_starts) and (tick >= len(timeline.tick_steps) or
+                                                      timeline.tick_steps[tick] > next_step):
+            tick = timeline.step_starts[next_step]
+            self.start_time = now - tick / timeline.tick_rate
+        if tick < len(timeline.tick_steps):
+            self.step = timeline.tick_steps[tick]
+        if tick >= len(timeline.tick_steps) - 1:
+            # Like Sequence, the last tick still gets controls, but the bot knows not to come back next frame.
+            self.done = True
+            if tick >= len(timeline.tick_steps):
+                return None
+        return timeline.controls[timeline.tick_steps[tick]]
@@ -1,5 +1,6 @@
 from rlbot.utils.structures.game_data_struct import PlayerInfo, GameTickPacket
 
+from util.car_table import CarTable
 from util.vec import Vec3
 
 # When the ball is attached to a car's spikes, the distance will vary a bit depending on whether the ball is
@@ -13,24 +14,20 @@ MAX_DISTANCE_WHEN_SPIKED = 200
 class SpikeWatcher:
     def __init__(self):
         self.carrying_car: PlayerInfo = None
+        self.carrying_index: int = None
         self.spike_moment = 0
         self.carry_duration = 0
 
-    def read_packet(self, packet: GameTickPacket):
-        ball_location = Vec3(packet.game_ball.physics.location)
-        closest_candidate: PlayerInfo = None
-        closest_distance = 999999
-        for i in range(packet.num_cars):
-            car = packet.game_cars[i]
-            car_location = Vec3(car.physics.location)
-            distance = car_location.dist(ball_location)
-            if distance < MAX_DISTANCE_WHEN_SPIKED:
-                if distance < closest_distance:
-                    closest_candidate = car
-                    closest_distance = distance
-        if closest_candidate != self.carrying_car and closest_candidate is not None:
+    def read_packet(self, packet: GameTickPacket, cars: CarTable = None):
+        """Pass in this tick's CarTable if there already is one (e.g. TickState.cars), so it isn't built twice."""
+        if cars is None:
+            cars = CarTable(packet)
+        index = cars.nearest_within(Vec3(packet.game_ball.physics.location), MAX_DISTANCE_WHEN_SPIKED)
+        # Compared by index, since packet.game_cars hands out a new PlayerInfo object every time it's read.
+        if index != self.carrying_index and index is not None:
             self.spike_moment = packet.game_info.seconds_elapsed
 
-        self.carrying_car = closest_candidate
+        self.carrying_index = index
+        self.carrying_car = packet.game_cars[index] if index is not None else None
         if self.carrying_car is not None:
             self.carry_duration = packet.game_info.seconds_elapsed - self.spike_moment
@@ -0,0 +1,49 @@
+"""
+Arrays that only depend on the arena and on constants in the code, like the motion tables, worked out once and
+kept on disk, so starting a bot doesn't mean working them out again every match.
+
+    times = cached_array('motion_times', TABLES_VERSION, generate_times)
+
+Each array is saved as a plain .npy file and loaded with mmap_mode='r', so loading one costs about the same however
+big it is, and only the parts that actually get read are paged in. The arrays are read-only.
+
+The file name includes the version, so bump it whenever the code that builds an array changes and the old file
+will be ignored. key is for anything else the array depends on, e.g. Arena.key for an array that depends on the
+field layout. Files are written to a
+temporary name and then renamed, so a bot that crashes part way through, or two bots starting at once, never
+leave a half written file for the next one to load.
+"""
+import os
+from typing import Callable
+
+import numpy as np
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+def cache_path(name: str, version: int, key: str = '', directory: str = DEFAULT_DIRECTORY) -> str:
+    return os.path.join(directory, f'{name}-v{version}' + (f'-{key}' if key else '') + '.npy')
+
+
+def cached_array(name: str, version: int, build: Callable[[], np.ndarray], key: str = '',
+                 directory: str = DEFAULT_DIRECTORY) -> np.ndarray:
+    """
+    Returns the array saved for this name, version and key, memory mapped. If there isn't one, calls build() and
+    tries to save what it returns for next time. If it can't be saved, the built array is returned as it is.
+    """
+    path = cache_path(name, version, key, directory)
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        pass
+    array = np.ascontiguousarray(build())
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'wb') as file:
+            np.save(file, array)
+        os.replace(temporary_path, path)
+    except OSError:
+        # Somewhere we can't write to. Everything still works, it'll just be built again next time.
+        return array
+    return np.load(path, mmap_mode='r')
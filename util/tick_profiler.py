@@ -0,0 +1,115 @@
+from bisect import bisect_right
+from time import perf_counter
+from typing import Dict, List
+
+# Upper edges of the histogram buckets, in seconds. Each bucket is 25% wider than the one before it, starting at
+# one microsecond, so 64 buckets reach past a full second and a percentile is never off by more than 25%.
+BUCKET_EDGES = [1e-6 * 1.25 ** i for i in range(64)]
+
+# At maximum_tick_rate_preference = 120 this is all the time we have before the next packet shows up.
+DEFAULT_TICK_BUDGET = 1 / 120
+
+
+class StageHistogram:
+    """
+    A fixed-bucket histogram of how long something took. Recording a sample is a bisect and an increment,
+    so it is cheap enough to do several times per tick.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect_right(BUCKET_EDGES, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the time in seconds that the given fraction (0.5 for p50) of the samples were at or below.
+        This is the upper edge of the bucket the percentile falls in, capped at the slowest sample seen.
+        """
+        if self.count == 0:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= wanted:
+                return min(BUCKET_EDGES[i], self.max) if i < len(BUCKET_EDGES) else self.max
+        return self.max
+
+    def reset(self):
+        self.__init__()
+
+
+class TickProfiler:
+    """
+    Times each stage of get_output. Call begin_tick when the packet arrives, stage('name') at the start of each
+    stage, and end_tick when the controls are ready. The time between two marks is charged to the stage that was
+    started first. Nothing is recorded unless enabled is True, so the calls can stay in the bot permanently.
+    """
+
+    def __init__(self, enabled: bool = False, tick_budget: float = DEFAULT_TICK_BUDGET):
+        self.enabled = enabled
+        self.tick_budget = tick_budget
+        self.stages: Dict[str, StageHistogram] = {}
+        self.ticks = StageHistogram()
+        self.over_budget = 0
+        self._tick_start = 0.0
+        self._stage_name: str = None
+        self._stage_start = 0.0
+
+    def begin_tick(self):
+        if not self.enabled:
+            return
+        self._tick_start = self._stage_start = perf_counter()
+        self._stage_name = None
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self._finish_stage(now)
+        self._stage_name = name
+        self._stage_start = now
+
+    def end_tick(self):
+        if not self.enabled:
+            return
+        now = perf_counter()
+        self._finish_stage(now)
+        self._stage_name = None
+        elapsed = now - self._tick_start
+        self.ticks.record(elapsed)
+        if elapsed > self.tick_budget:
+            self.over_budget += 1
+
+    def _finish_stage(self, now: float):
+        if self._stage_name is None:
+            return
+        histogram = self.stages.get(self._stage_name)
+        if histogram is None:
+            histogram = self.stages[self._stage_name] = StageHistogram()
+        histogram.record(now - self._stage_start)
+
+    def report(self) -> str:
+        """Returns a table of count, p50, p99 and max (in milliseconds) for every stage and for the whole tick."""
+        lines = [f"{'stage':<22}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        rows = list(self.stages.items()) + [('total', self.ticks)]
+        for name, histogram in rows:
+            lines.append(f"{name:<22}{histogram.count:>8}{histogram.percentile(0.5) * 1000:>10.3f}"
+                         f"{histogram.percentile(0.99) * 1000:>10.3f}{histogram.max * 1000:>10.3f}")
+        lines.append(f"{self.over_budget} of {self.ticks.count} ticks went over the "
+                     f"{self.tick_budget * 1000:.2f} ms budget")
+        return '\n'.join(lines)
+
+    def reset(self):
+        self.stages = {}
+        self.ticks.reset()
+        self.over_budget = 0
@@ -0,0 +1,93 @@
+import math
+from typing import Dict, Tuple
+
+from rlbot.utils.structures.game_data_struct import GameTickPacket
+
+from util.car_table import CarTable
+from util.orientation import orientation_of, relative_location
+from util.vec import Vec3
+
+
+class TickState:
+    """
+    This class is a snapshot of one GameTickPacket from the point of view of our car. The packet fields are
+    converted to Vec3 once, and every distance, relative location and angle is worked out the first time it
+    is asked for and then reused for the rest of the tick. Make a new one at the start of every get_output.
+
+    Locations are looked up by name, e.g. state.dist('car', 'ball'). 'car' and 'ball' are always there,
+    anything else (ball_path, target, ...) has to be added with set_point first.
+    """
+
+    def __init__(self, packet: GameTickPacket, index: int):
+        self.packet = packet
+        self.my_car = packet.game_cars[index]
+        self.car_location = Vec3(self.my_car.physics.location)
+        self.car_velocity = Vec3(self.my_car.physics.velocity)
+        self.car_rotation = self.my_car.physics.rotation
+        self.car_orientation = orientation_of(self.car_rotation)
+        self.ball_location = Vec3(packet.game_ball.physics.location)
+        self.ball_velocity = Vec3(packet.game_ball.physics.velocity)
+
+        self.points: Dict[str, Vec3] = {'car': self.car_location, 'ball': self.ball_location}
+        self._distances: Dict[Tuple[str, str], float] = {}
+        self._relative: Dict[str, Vec3] = {}
+        self._angles: Dict[str, float] = {}
+        self._car_speed: float = None
+        self._ball_speed: float = None
+        self._cars: CarTable = None
+
+    @property
+    def car_speed(self) -> float:
+        if self._car_speed is None:
+            self._car_speed = self.car_velocity.length()
+        return self._car_speed
+
+    @property
+    def ball_speed(self) -> float:
+        if self._ball_speed is None:
+            self._ball_speed = self.ball_velocity.length()
+        return self._ball_speed
+
+    @property
+    def cars(self) -> CarTable:
+        """Every car in the packet as arrays, for questions about more than just our own car."""
+        if self._cars is None:
+            self._cars = CarTable(self.packet)
+        return self._cars
+
+    def set_point(self, name: str, location: Vec3):
+        """Gives a location a name. Setting a name again forgets anything that was cached for the old location."""
+        if name in self.points:
+            self._distances = {key: value for key, value in self._distances.items() if name not in key}
+            self._relative.pop(name, None)
+            self._angles.pop(name, None)
+        self.points[name] = location
+
+    def dist(self, a: str, b: str) -> float:
+        """Returns the distance between two named points."""
+        key = (a, b) if a <= b else (b, a)
+        distance = self._distances.get(key)
+        if distance is None:
+            distance = self.points[a].dist(self.points[b])
+            self._distances[key] = distance
+        return distance
+
+    def relative(self, name: str) -> Vec3:
+        """
+        Returns the named point relative to our car. See relative_location for what x, y and z mean. The same Vec3
+        is handed to every caller this tick, so copy it before changing it.
+        """
+        location = self._relative.get(name)
+        if location is None:
+            location = relative_location(self.car_location, self.car_orientation, self.points[name])
+            self._relative[name] = location
+        return location
+
+    def angle(self, name: str) -> float:
+        """Returns the horizontal angle in degrees from the nose of our car to the named point. Right is positive."""
+        angle = self._angles.get(name)
+        if angle is None:
+            location = self.relative(name)
+            angle = math.atan2(location.y, location.x) * 180 / math.pi
+            self._angles[name] = angle
+        return angle